@@ -0,0 +1,128 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+benchmarks.bench_headers
+~~~~~~~~~~~~~~~~~
+
+Micro-benchmark of the response header serialization.
+
+The former ``Response.build_response_header`` (reproduced below: a dict of
+~14 headers, several of them echoes of request headers, and ``utcnow()``
+formatted on every call) against :func:`daemon.headers.build_header`, for a
+small JSON reply and a cached static file reply. The size of the header
+block, which every response puts on the wire, is reported too.
+
+Usage::
+
+    python benchmarks/bench_headers.py --calls 200000
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from daemon.headers import build_header, date_line
+from benchmarks.common import print_table
+
+REQUEST_HEADERS = {
+    "host": "127.0.0.1:8000",
+    "user-agent": "Mozilla/5.0 (X11; Linux x86_64) Chrome/123.0.0.0",
+    "accept": "*/*",
+    "accept-language": "en-US,en;q=0.9",
+    "cookie": "auth=true",
+}
+
+REPLIES = {
+    "json": (200, "OK", {
+        "Content-Type": "application/json",
+        "ETag": '"f3e537db94739ab4c5ee29249cc0d255"',
+        "Connection": "keep-alive",
+        "Keep-Alive": "timeout=5, max=100",
+    }, 25),
+    "static": (200, "OK", {
+        "Content-Type": "text/javascript",
+        "ETag": '"c933408c9f8f94ff8efa774e6246f60b-gzip"',
+        "Last-Modified": "Mon, 17 Nov 2025 14:52:04 GMT",
+        "Vary": "Accept-Encoding",
+        "Content-Encoding": "gzip",
+        "Accept-Ranges": "bytes",
+        "Connection": "keep-alive",
+        "Keep-Alive": "timeout=5, max=100",
+    }, 6021),
+}
+
+
+def legacy_header(status_code, reason, rsphdr, length, reqhdr=REQUEST_HEADERS):
+    """
+    The former header builder, kept for comparison.
+    """
+    headers = {
+        "Accept": "{}".format(reqhdr.get("Accept", "application/json")),
+        "Accept-Language": "{}".format(reqhdr.get("Accept-Language", "en-US,en;q=0.9")),
+        "Authorization": "{}".format(reqhdr.get("Authorization", "Basic <credentials>")),
+        "Cache-Control": "no-cache",
+        "Content-Type": "{}".format(rsphdr['Content-Type']),
+        "Content-Length": "{}".format(length),
+        "Date": "{}".format(datetime.datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")),
+        "Max-Forward": "10",
+        "Pragma": "no-cache",
+        "Proxy-Authorization": "Basic dXNlcjpwYXNz",
+        "Warning": "199 Miscellaneous warning",
+        "User-Agent": "{}".format(reqhdr.get("User-Agent", "Chrome/123.0.0.0")),
+    }
+    headers.update(rsphdr)
+    lines = ["HTTP/1.1 {} {}".format(status_code, reason)]
+    lines.extend("{}: {}".format(key, value) for key, value in headers.items())
+    lines.append("\r\n")
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def bench(calls):
+    """
+    Time both builders on each reply.
+
+    :param calls (int): Headers built per measurement.
+
+    :rtype list: one result row per builder and reply.
+    """
+    rows = []
+    for name, (status, reason, headers, length) in REPLIES.items():
+        for builder, func in (("legacy dict + utcnow", legacy_header),
+                              ("build_header", build_header)):
+            def run():
+                func(status, reason, headers, length)
+            seconds = min(timeit.repeat(run, number=calls, repeat=3))
+            rows.append({"reply": name, "builder": builder,
+                         "ns_per_header": round(seconds * 1e9 / calls),
+                         "header_bytes": len(func(status, reason, headers, length))})
+    seconds = min(timeit.repeat(date_line, number=calls, repeat=3))
+    rows.append({"reply": "-", "builder": "Date line (cached)",
+                 "ns_per_header": round(seconds * 1e9 / calls), "header_bytes": len(date_line())})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response header builder benchmark")
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    print("Response headers, best of 3 x {} calls".format(args.calls))
+    print_table(bench(args.calls), ["reply", "builder", "ns_per_header", "header_bytes"])
+
+
+if __name__ == "__main__":
+    main()
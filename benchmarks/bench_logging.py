@@ -0,0 +1,144 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+benchmarks.bench_logging
+~~~~~~~~~~~~~~~~~
+
+Measures what logging costs the backend.
+
+1. Per call, from several threads: ``print`` of a formatted line (the former
+   behaviour) against :mod:`daemon.log` enabled and disabled.
+2. End to end: request latency of the sample app with every per-request
+   debug line logged (``--log-level debug --log-sample 1``), with sampled
+   debug lines, at the default ``info`` level and with logging ``off``.
+
+Usage::
+
+    python benchmarks/bench_logging.py --engine pool --clients 8 --requests 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from daemon import log as daemon_log
+from benchmarks.common import (free_port, start_server, stop_server, run_load,
+                               print_table)
+
+
+def per_call(threads, calls, sink):
+    """
+    Time one logging style from several threads.
+
+    :param threads (int): Concurrent callers.
+    :param calls (int): Calls per thread.
+    :param sink (callable): Called with (thread index, call index).
+
+    :rtype float: nanoseconds per call.
+    """
+    def run(t):
+        for i in range(calls):
+            sink(t, i)
+
+    workers = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return (time.perf_counter() - start) * 1e9 / (threads * calls)
+
+
+def bench_calls(threads, calls):
+    """
+    Compare ``print`` with the logger; both write to a temporary file.
+
+    :rtype list: one result row per style.
+    """
+    rows = []
+    with tempfile.TemporaryFile("w") as out:
+        def with_print(t, i):
+            print("[HttpAdapter] Processing request: {} {}".format("GET", "/channels"), file=out)
+
+        logger = daemon_log.get_logger("Bench")
+        daemon_log.configure(level="debug", sample_every=100, stream=out)
+        rows.append({"style": "print", "ns_per_call": round(per_call(threads, calls, with_print))})
+
+        def logged(t, i):
+            logger.debug("Processing request: {} {}", "GET", "/channels")
+        rows.append({"style": "log.debug (enabled)", "ns_per_call": round(per_call(threads, calls, logged))})
+        daemon_log.shutdown(timeout=30)
+
+        def sampled(t, i):
+            logger.debug("Processing request: {} {}", "GET", "/channels", sample=True)
+        rows.append({"style": "log.debug (sampled 1/100)", "ns_per_call": round(per_call(threads, calls, sampled))})
+        daemon_log.shutdown(timeout=30)
+
+        daemon_log.configure(level="info")
+        rows.append({"style": "log.debug (disabled)", "ns_per_call": round(per_call(threads, calls, logged))})
+    return rows
+
+
+def bench_requests(engine, clients, requests):
+    """
+    Measure request latency of the sample app at several log settings.
+
+    :rtype list: one result row per setting.
+    """
+    settings = [
+        ("debug, every line", ["--log-level", "debug", "--log-sample", "1"]),
+        ("debug, sampled 1/100", ["--log-level", "debug", "--log-sample", "100"]),
+        ("info (default)", ["--log-level", "info"]),
+        ("off", ["--log-level", "off"]),
+    ]
+    rows = []
+    for name, args in settings:
+        port = free_port()
+        with tempfile.TemporaryFile("w") as out:
+            proc = start_server(["--engine", engine] + args, port, stdout=out)
+            try:
+                # Warm up the connections and the handler code paths.
+                run_load(port, "/channels", clients, 20, {"Cookie": "auth=true"})
+                result = run_load(port, "/channels", clients, requests, {"Cookie": "auth=true"})
+            finally:
+                stop_server(proc)
+        result["logging"] = name
+        rows.append(result)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging overhead benchmark")
+    parser.add_argument("--engine", default="pool")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    print("Per call, {} threads x {} calls".format(args.threads, args.calls))
+    print_table(bench_calls(args.threads, args.calls), ["style", "ns_per_call"])
+    print()
+    print("Sample app, {} engine, {} clients x {} requests on GET /channels".format(
+        args.engine, args.clients, args.requests))
+    print_table(bench_requests(args.engine, args.clients, args.requests),
+                ["logging", "requests", "rps", "p50_ms", "p90_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
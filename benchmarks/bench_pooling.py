@@ -0,0 +1,193 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+benchmarks.bench_pooling
+~~~~~~~~~~~~~~~~~
+
+Memory benchmark of the per-connection object pools of :mod:`daemon.pools`.
+
+A chat client polling ``/messages`` is replayed over socket pairs and
+served in process by :func:`daemon.backend.handle_client`, the connection
+handler of the ``thread`` and ``pool`` engines, in two modes:
+
+- ``fresh``: the former behaviour, a new adapter, receive buffer, request
+  and response for every connection (and request and response for every
+  request of a persistent connection);
+- ``pooled``: the adapters and the receive buffers come from the pools and
+  are reset between requests.
+
+With :mod:`tracemalloc` running, the peak of memory allocated while a
+connection is served, above what was allocated before it, measures the
+transient garbage of the connection; the memory still allocated once the
+run is over shows what the pools keep. Timings come from a second run
+without tracing.
+
+Usage::
+
+    python benchmarks/bench_pooling.py --connections 2000 --polls 1 5
+"""
+
+import argparse
+import array
+import gc
+import os
+import socket
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from daemon import log as daemon_log
+from daemon.backend import handle_client
+from daemon.httpadapter import HttpAdapter
+from daemon.parser import RECV_BUFFERS
+from daemon.pools import MAX_POOLED
+from daemon.request import Request
+from daemon.response import Response
+from daemon.weaprous import WeApRous
+from benchmarks.common import print_table
+
+POLL = (b"GET /messages?channel=general HTTP/1.1\r\n"
+        b"Host: 127.0.0.1:8000\r\n"
+        b"User-Agent: Mozilla/5.0 (X11; Linux x86_64) Chrome/123.0.0.0\r\n"
+        b"Accept: */*\r\n"
+        b"Accept-Language: en-US,en;q=0.9\r\n"
+        b"Cookie: auth=true\r\n"
+        b"\r\n")
+
+MESSAGES = [{"user": "admin", "text": "message {}".format(i), "ts": 1763391124 + i}
+            for i in range(5)]
+
+
+def make_routes():
+    """
+    :rtype RouteTable: the polled route of the sample app.
+    """
+    app = WeApRous()
+
+    @app.route("/messages", methods=["GET"])
+    def get_messages(ctx):
+        return {"channel": ctx.arg("channel", "general"), "messages": MESSAGES}
+
+    return app.compile_routes()
+
+
+class FreshAdapter(HttpAdapter):
+    """
+    The former adapter: new request and response objects for every request.
+    """
+
+    def recycle(self):
+        self.request = Request()
+        self.response = Response()
+        self.keep_alive = False
+
+
+def serve_fresh(conn, addr, routes):
+    FreshAdapter("127.0.0.1", 8000, conn, addr, routes).handle_client(conn, addr, routes)
+
+
+def serve_pooled(conn, addr, routes):
+    handle_client("127.0.0.1", 8000, conn, addr, routes)
+
+
+MODES = {"fresh": serve_fresh, "pooled": serve_pooled}
+
+
+def connection(serve, routes, polls, traced):
+    """
+    Serve one polling connection: ``polls`` pipelined requests, then EOF.
+
+    :rtype int: bytes allocated at the peak of the connection, above the
+                memory allocated before it (0 when not traced).
+    """
+    client, server = socket.socketpair()
+    client.sendall(POLL * polls)
+    client.shutdown(socket.SHUT_WR)
+    if traced:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    serve(server, ("127.0.0.1", 50000), routes)
+    peak = tracemalloc.get_traced_memory()[1] - before if traced else 0
+    while client.recv(65536):
+        pass
+    client.close()
+    return peak
+
+
+def run(mode, routes, connections, polls, traced):
+    """
+    Replay the polling connections in one mode.
+
+    :rtype dict: result row.
+    """
+    serve = MODES[mode]
+    pooled = mode == "pooled"
+    RECV_BUFFERS.max_size = MAX_POOLED if pooled else 0
+    RECV_BUFFERS.clear()
+    HttpAdapter.pool.clear()
+    # Warm up the code paths (and the pools).
+    for _ in range(20):
+        connection(serve, routes, polls, False)
+
+    gc.collect()
+    if not traced:
+        start = time.perf_counter()
+        for _ in range(connections):
+            connection(serve, routes, polls, False)
+        seconds = time.perf_counter() - start
+        return {"us_per_request": round(seconds * 1e6 / (connections * polls), 1)}
+
+    # Preallocated, so that recording the peaks allocates nothing.
+    peaks = array.array("q", bytes(8 * connections))
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(connections):
+        peaks[i] = connection(serve, routes, polls, True)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    peaks = sorted(peaks)
+    return {
+        "kb_peak_per_conn": round(sum(peaks) / len(peaks) / 1024, 2),
+        "kb_peak_p99": round(peaks[int(len(peaks) * 0.99)] / 1024, 2),
+        "kb_retained": round(retained / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Object pooling memory benchmark")
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--polls", type=int, nargs="+", default=[1, 5],
+                        help="requests per connection, one run each")
+    args = parser.parse_args()
+
+    daemon_log.configure(level="warning")
+    routes = make_routes()
+    rows = []
+    for polls in args.polls:
+        for mode in MODES:
+            row = {"mode": mode, "polls_per_conn": polls}
+            row.update(run(mode, routes, args.connections, polls, traced=True))
+            row.update(run(mode, routes, args.connections, polls, traced=False))
+            rows.append(row)
+
+    print("Polling /messages, {} connections per run".format(args.connections))
+    print_table(rows, ["mode", "polls_per_conn", "kb_peak_per_conn", "kb_peak_p99",
+                       "kb_retained", "us_per_request"])
+    print("adapter pool: {}".format(HttpAdapter.pool.snapshot()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+benchmarks.bench_streaming
+~~~~~~~~~~~~~~~~~
+
+Time to first byte of a large channel export, materialized or streamed.
+
+The script serves two routes itself when started with ``--serve``:
+
+- ``/export``: the former way, the whole history returned as one dict,
+  serialized to JSON before the header is sent;
+- ``/export-stream``: the same JSON document yielded by a generator, one
+  batch of messages serialized per chunk, sent with ``Transfer-Encoding:
+  chunked``.
+
+For each engine, sequential requests measure the time until the response
+header is received (``http.client`` returns from ``getresponse`` then; a
+streamed header leaves with the first chunk) and until the body is read.
+
+Usage::
+
+    python benchmarks/bench_streaming.py --messages 200000 --requests 20
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import free_port, start_server, stop_server, print_table
+
+ENGINES = ["thread", "pool", "asyncio", "reactor"]
+ROUTES = ["/export", "/export-stream"]
+#: Messages serialized per chunk of the streamed export.
+BATCH = 1024
+
+
+def serve(argv):
+    """
+    Run an app exporting a large channel history, in full or streamed.
+    """
+    from daemon.weaprous import WeApRous
+    from daemon.backend import add_backend_arguments, backend_options
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--server-ip", default="127.0.0.1")
+    parser.add_argument("--server-port", type=int, required=True)
+    parser.add_argument("--messages", type=int, default=200000)
+    add_backend_arguments(parser)
+    args = parser.parse_args(argv)
+
+    history = [{"sender": "user{}".format(i % 50), "text": "message number {}".format(i),
+                "timestamp": 1763391124 + i} for i in range(args.messages)]
+
+    app = WeApRous()
+
+    @app.route("/export", methods=["GET"])
+    def export(ctx):
+        return {"messages": history}
+
+    @app.route("/export-stream", methods=["GET"])
+    def export_stream(ctx):
+        def document():
+            yield '{"messages": ['
+            for start in range(0, len(history), BATCH):
+                batch = json.dumps(history[start:start + BATCH])[1:-1]
+                yield ", " + batch if start else batch
+            yield "]}"
+        return {"_content": document(), "_mime": "application/json"}
+
+    app.prepare_address(args.server_ip, args.server_port)
+    app.run(**backend_options(args))
+
+
+def measure(port, route, requests):
+    """
+    Fetch a route sequentially on one keep-alive connection.
+
+    :rtype dict: time to first byte and total time percentiles in ms, body size.
+    """
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    ttfb, total = [], []
+    size = 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        conn.request("GET", route)
+        resp = conn.getresponse()
+        first = time.perf_counter()
+        size = len(resp.read())
+        end = time.perf_counter()
+        ttfb.append((first - start) * 1000)
+        total.append((end - start) * 1000)
+    conn.close()
+    ttfb.sort()
+    total.sort()
+    return {
+        "ttfb_p50_ms": round(ttfb[len(ttfb) // 2], 2),
+        "ttfb_max_ms": round(ttfb[-1], 2),
+        "total_p50_ms": round(total[len(total) // 2], 2),
+        "body_mb": round(size / 1e6, 1),
+    }
+
+
+def main():
+    if "--serve" in sys.argv:
+        sys.argv.remove("--serve")
+        serve(sys.argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(description="Streamed response benchmark")
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    args = parser.parse_args()
+
+    rows = []
+    for engine in args.engines.split(","):
+        port = free_port()
+        proc = start_server(["--serve", "--engine", engine, "--messages", str(args.messages),
+                             "--log-level", "warning"],
+                            port, timeout=30.0,
+                            script=os.path.join("benchmarks", "bench_streaming.py"))
+        try:
+            for route in ROUTES:
+                measure(port, route, 2)
+                row = {"engine": engine, "route": route}
+                row.update(measure(port, route, args.requests))
+                rows.append(row)
+        finally:
+            stop_server(proc)
+
+    print("Channel export of {} messages, {} sequential requests".format(
+        args.messages, args.requests))
+    print_table(rows, ["engine", "route", "body_mb", "ttfb_p50_ms", "ttfb_max_ms",
+                       "total_p50_ms"])
+
+
+if __name__ == "__main__":
+    main()
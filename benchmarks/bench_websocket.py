@@ -0,0 +1,243 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+benchmarks.bench_websocket
+~~~~~~~~~~~~~~~~~
+
+Chat messages of the sample app sent with ``POST /send`` or over its ``/ws``
+WebSocket.
+
+A receiver follows the ``general`` channel, over ``/events`` in ``post``
+mode (what chat.js did before) and over ``/ws`` in ``websocket`` mode,
+while a sender sends messages:
+
+- one at a time, each once the previous one was delivered: the delivery
+  latency, from the sender to the receiver;
+- all at once: how many messages per second get delivered.
+
+Usage::
+
+    python benchmarks/bench_websocket.py --messages 2000
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from daemon.websocket import unmask
+from benchmarks.common import free_port, start_server, stop_server, print_table
+
+ENGINES = ["thread", "pool", "asyncio", "reactor"]
+MODES = ["post", "websocket"]
+CHANNEL = "general"
+COOKIE = "auth=true"
+
+
+def ws_connect(port, path):
+    """
+    Open a WebSocket of the sample app.
+
+    :rtype tuple: (socket, bytes received after the ``101``).
+    """
+    sock = socket.create_connection(("127.0.0.1", port))
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    sock.sendall(("GET {} HTTP/1.1\r\nHost: 127.0.0.1:{}\r\nUpgrade: websocket\r\n"
+                  "Connection: Upgrade\r\nSec-WebSocket-Key: {}\r\n"
+                  "Sec-WebSocket-Version: 13\r\nCookie: {}\r\n\r\n").format(
+                      path, port, key, COOKIE).encode("ascii"))
+    head = b""
+    while b"\r\n\r\n" not in head:
+        data = sock.recv(4096)
+        if not data:
+            raise ConnectionError("closed during the handshake")
+        head += data
+    head, _, rest = head.partition(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.1 101"):
+        raise ConnectionError(head.split(b"\r\n")[0].decode("latin-1"))
+    return sock, rest
+
+
+def ws_frame(obj):
+    """
+    :rtype bytes: a masked text frame carrying ``obj`` as JSON.
+    """
+    payload = json.dumps(obj).encode("utf-8")
+    n = len(payload)
+    header = bytes((0x81, 0x80 | n)) if n < 126 else struct.pack("!BBH", 0x81, 0xFE, n)
+    key = os.urandom(4)
+    return header + key + unmask(payload, key)
+
+
+def ws_messages(sock, buf):
+    """
+    Yield the payloads of the frames the server sends, until it closes.
+    """
+    buf = bytearray(buf)
+    while True:
+        while len(buf) >= 2:
+            n, head = buf[1] & 0x7F, 2
+            if n == 126:
+                n, head = struct.unpack_from("!H", buf, 2)[0] if len(buf) >= 4 else -1, 4
+            elif n == 127:
+                n, head = struct.unpack_from("!Q", buf, 2)[0] if len(buf) >= 10 else -1, 10
+            if n < 0 or len(buf) < head + n:
+                break
+            payload = bytes(buf[head:head + n])
+            del buf[:head + n]
+            yield payload
+        data = sock.recv(65536)
+        if not data:
+            return
+        buf += data
+
+
+class Receiver(threading.Thread):
+    """
+    Follows the channel and records when each message arrives.
+    """
+
+    def __init__(self, port, mode):
+        super().__init__(daemon=True)
+        self.port = port
+        self.mode = mode
+        self.arrivals = []
+        self.cond = threading.Condition()
+        self.ready = threading.Event()
+
+    def arrived(self, count=1):
+        now = time.perf_counter()
+        with self.cond:
+            self.arrivals.extend([now] * count)
+            self.cond.notify_all()
+
+    def wait_for(self, count, timeout=60.0):
+        """
+        :rtype float: arrival time of message number ``count``.
+        """
+        with self.cond:
+            if not self.cond.wait_for(lambda: len(self.arrivals) >= count, timeout):
+                raise TimeoutError("{} of {} messages delivered".format(len(self.arrivals), count))
+            return self.arrivals[count - 1]
+
+    def run(self):
+        if self.mode == "websocket":
+            sock, rest = ws_connect(self.port, "/ws")
+            sock.sendall(ws_frame({"type": "join", "channel": CHANNEL}))
+            self.ready.set()
+            for payload in ws_messages(sock, rest):
+                if payload.startswith(b'{"type": "message"'):
+                    self.arrived()
+            return
+        sock = socket.create_connection(("127.0.0.1", self.port))
+        sock.sendall("GET /events?channel={} HTTP/1.1\r\nHost: 127.0.0.1\r\nCookie: {}\r\n\r\n"
+                     .format(CHANNEL, COOKIE).encode("ascii"))
+        marker = b"event: message\n"
+        tail = b""
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                return
+            self.ready.set()
+            data = tail + data
+            count = data.count(marker)
+            if count:
+                self.arrived(count)
+            tail = data[-len(marker) + 1:]
+
+
+class Sender:
+    """
+    Sends chat messages with ``POST /send`` or over a WebSocket.
+    """
+
+    def __init__(self, port, mode):
+        self.mode = mode
+        if mode == "websocket":
+            self.sock, _ = ws_connect(port, "/ws")
+        else:
+            self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+
+    def send(self, i):
+        msg = {"channel": CHANNEL, "sender": "bench", "text": "message {}".format(i)}
+        if self.mode == "websocket":
+            msg["type"] = "send"
+            self.sock.sendall(ws_frame(msg))
+            return
+        self.conn.request("POST", "/send", body=json.dumps(msg),
+                          headers={"Content-Type": "application/json", "Cookie": COOKIE})
+        self.conn.getresponse().read()
+
+
+def measure(port, mode, messages):
+    """
+    :rtype dict: delivery latency percentiles and burst throughput.
+    """
+    receiver = Receiver(port, mode)
+    receiver.start()
+    receiver.ready.wait(10)
+    time.sleep(0.2)
+    sender = Sender(port, mode)
+
+    latencies = []
+    for i in range(messages):
+        start = time.perf_counter()
+        sender.send(i)
+        latencies.append((receiver.wait_for(i + 1) - start) * 1000)
+    latencies.sort()
+
+    start = time.perf_counter()
+    for i in range(messages):
+        sender.send(i)
+    seconds = receiver.wait_for(2 * messages) - start
+    return {
+        "latency_p50_ms": round(latencies[len(latencies) // 2], 3),
+        "latency_p99_ms": round(latencies[int(len(latencies) * 0.99)], 3),
+        "burst_msgs_per_s": round(messages / seconds),
+        "http_requests": 2 * messages if mode == "post" else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket chat benchmark")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    args = parser.parse_args()
+
+    rows = []
+    for engine in args.engines.split(","):
+        for mode in MODES:
+            port = free_port()
+            proc = start_server(["--engine", engine, "--log-level", "warning"], port)
+            try:
+                row = {"engine": engine, "mode": mode}
+                row.update(measure(port, mode, args.messages))
+                rows.append(row)
+            finally:
+                stop_server(proc)
+
+    print("{} messages sent one at a time, then {} at once".format(args.messages, args.messages))
+    print_table(rows, ["engine", "mode", "latency_p50_ms", "latency_p99_ms",
+                       "burst_msgs_per_s", "http_requests"])
+
+
+if __name__ == "__main__":
+    main()
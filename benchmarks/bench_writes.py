@@ -0,0 +1,185 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+benchmarks.bench_writes
+~~~~~~~~~~~~~~~~~
+
+Measures the vectored response writes of :mod:`daemon.writer`.
+
+1. Raw socket writes over a socket pair: ``sendall(header + body)``, the
+   former way, against ``sendmsg([header, body])``, for several body sizes.
+2. End to end: throughput and latency of large JSON, bytes and file
+   responses on every engine. The script serves those routes itself when
+   started with ``--serve``.
+
+Usage::
+
+    python benchmarks/bench_writes.py --size 1048576 --clients 4 --requests 100
+"""
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from daemon.writer import send_buffers
+from benchmarks.common import (free_port, start_server, stop_server, run_load,
+                               print_table)
+
+HEADER = (b"HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\n"
+          b"Content-Length: 0000000\r\nConnection: keep-alive\r\n\r\n")
+ENGINES = ["thread", "pool", "asyncio", "reactor"]
+
+
+def serve(argv):
+    """
+    Run an app answering large responses: ``/json``, ``/bytes`` and ``/file``.
+    """
+    from daemon.weaprous import WeApRous
+    from daemon.backend import add_backend_arguments, backend_options
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--server-ip", default="127.0.0.1")
+    parser.add_argument("--server-port", type=int, required=True)
+    parser.add_argument("--size", type=int, default=1024 * 1024)
+    add_backend_arguments(parser)
+    args = parser.parse_args(argv)
+
+    blob = os.urandom(args.size)
+    # Roughly ``size`` bytes once serialized.
+    records = [{"id": i, "name": "user{}".format(i), "online": i % 2 == 0}
+               for i in range(max(1, args.size // 48))]
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    with os.fdopen(fd, "wb") as f:
+        f.write(blob)
+
+    app = WeApRous()
+
+    @app.route("/json", methods=["GET"])
+    def large_json(headers, body):
+        return {"records": records}
+
+    @app.route("/bytes", methods=["GET"])
+    def large_bytes(headers, body):
+        return blob
+
+    @app.route("/file", methods=["GET"])
+    def large_file(headers, body):
+        return path
+
+    app.prepare_address(args.server_ip, args.server_port)
+    try:
+        app.run(**backend_options(args))
+    finally:
+        os.unlink(path)
+
+
+def bench_socket(size, rounds):
+    """
+    Compare a concatenating write with a vectored one over a socket pair.
+
+    :param size (int): Body size in bytes.
+    :param rounds (int): Responses written per style.
+
+    :rtype list: one result row per style.
+    """
+    body = os.urandom(size)
+    rows = []
+    for style in ("sendall(header + body)", "sendmsg([header, body])"):
+        a, b = socket.socketpair()
+        total = rounds * (len(HEADER) + size)
+
+        def drain():
+            left = total
+            buf = bytearray(256 * 1024)
+            while left > 0:
+                n = b.recv_into(buf)
+                if not n:
+                    break
+                left -= n
+
+        reader = threading.Thread(target=drain)
+        reader.start()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            if style.startswith("sendall"):
+                a.sendall(HEADER + body)
+            else:
+                send_buffers(a, [HEADER, body])
+        reader.join()
+        seconds = time.perf_counter() - start
+        a.close()
+        b.close()
+        rows.append({"write": style, "body_bytes": size,
+                     "us_per_response": round(seconds * 1e6 / rounds, 1),
+                     "MB_per_s": round(total / seconds / 1e6, 1)})
+    return rows
+
+
+def bench_engines(engines, size, clients, requests):
+    """
+    Measure large responses on each engine.
+
+    :rtype list: one result row per engine and route.
+    """
+    rows = []
+    for engine in engines:
+        port = free_port()
+        proc = start_server(["--serve", "--engine", engine, "--size", str(size),
+                             "--log-level", "warning"],
+                            port, script=os.path.join("benchmarks", "bench_writes.py"))
+        try:
+            for route in ("/json", "/bytes", "/file"):
+                run_load(port, route, clients, 5)
+                result = run_load(port, route, clients, requests)
+                result.update(engine=engine, route=route,
+                              MB_per_s=round(result["rps"] * size / 1e6, 1))
+                rows.append(result)
+        finally:
+            stop_server(proc)
+    return rows
+
+
+def main():
+    if "--serve" in sys.argv:
+        sys.argv.remove("--serve")
+        serve(sys.argv[1:])
+        return
+
+    parser = argparse.ArgumentParser(description="Vectored write benchmark")
+    parser.add_argument("--size", type=int, default=1024 * 1024)
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    args = parser.parse_args()
+
+    print("Socket pair writes, {} responses per style".format(args.rounds))
+    rows = []
+    for size in (16 * 1024, 256 * 1024, args.size):
+        rows.extend(bench_socket(size, args.rounds))
+    print_table(rows, ["write", "body_bytes", "us_per_response", "MB_per_s"])
+    print()
+    print("Large responses (~{} bytes), {} clients x {} requests".format(
+        args.size, args.clients, args.requests))
+    print_table(bench_engines(args.engines.split(","), args.size, args.clients, args.requests),
+                ["engine", "route", "rps", "MB_per_s", "p50_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
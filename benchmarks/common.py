@@ -0,0 +1,160 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+benchmarks.common
+~~~~~~~~~~~~~~~~~
+
+Helpers shared by the benchmarks: start the sample app in a subprocess and
+drive it with keep-alive clients while recording request latencies.
+"""
+
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+#: Repository root, where the start scripts live.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    """
+    Pick a free TCP port on the loopback interface.
+
+    :rtype int
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(args, port, stdout=subprocess.DEVNULL, timeout=10.0,
+                 script="start_sampleapp.py"):
+    """
+    Start an app script and wait until it accepts connections.
+
+    :param args (list): Extra command-line arguments (engine, logging, ...).
+    :param port (int): Port to listen on.
+    :param stdout (file): Destination of the server output.
+    :param timeout (float): Seconds to wait for the port.
+    :param script (str): Script taking ``--server-ip``/``--server-port``,
+                         relative to the repository root.
+
+    :rtype subprocess.Popen: the running server.
+    """
+    cmd = [sys.executable, script, "--server-ip", "127.0.0.1",
+           "--server-port", str(port)] + list(args)
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=stdout, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("server did not start: {}".format(" ".join(cmd)))
+
+
+def stop_server(proc):
+    """
+    Terminate a server started by :func:`start_server`.
+    """
+    proc.terminate()
+    try:
+        proc.wait(5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def run_load(port, path, clients=8, requests=500, headers=None):
+    """
+    Send requests from concurrent keep-alive clients.
+
+    :param port (int): Server port.
+    :param path (str): Request target.
+    :param clients (int): Concurrent connections.
+    :param requests (int): Requests per connection.
+    :param headers (dict): Extra request headers.
+
+    :rtype dict: ``requests``, ``seconds``, ``rps`` and latency percentiles in ms.
+    """
+    latencies = []
+    lock = threading.Lock()
+    headers = dict(headers or {})
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        mine = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            mine.append(time.perf_counter() - start)
+            if resp.getheader("Connection", "").lower() == "close":
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - start
+    return summarize(latencies, seconds)
+
+
+def summarize(latencies, seconds):
+    """
+    Summarize request latencies.
+
+    :param latencies (list): Latencies in seconds.
+    :param seconds (float): Wall time of the run.
+
+    :rtype dict
+    """
+    latencies = sorted(latencies)
+    n = len(latencies)
+
+    def pct(p):
+        return latencies[min(n - 1, int(n * p))] * 1000 if n else 0.0
+
+    return {
+        "requests": n,
+        "seconds": round(seconds, 3),
+        "rps": round(n / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(pct(0.50), 3),
+        "p90_ms": round(pct(0.90), 3),
+        "p99_ms": round(pct(0.99), 3),
+    }
+
+
+def print_table(rows, columns):
+    """
+    Print benchmark results as an aligned table.
+
+    :param rows (list): One dict per result.
+    :param columns (list): Keys to show, in order.
+    """
+    widths = [max(len(str(c)), *(len(str(r.get(c, ""))) for r in rows)) for c in columns]
+    print("  ".join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(w) for c, w in zip(columns, widths)))
@@ -15,6 +15,15 @@ from .proxy import create_proxy
 from .weaprous import WeApRous
 from .response import Response
 from .request import Request
-from .backend import create_backend
 from .httpadapter import HttpAdapter
+from .workerpool import WorkerPool
+from .parser import HttpParser, ParseError
+from .routing import RouteTable
+from .context import RequestContext
+from .body import RequestBody
+from .events import EventHub
+from .websocket import WebSocket
+from .writer import FileBody, ChunkedBody
+from .staticcache import StaticCache
+from .assets import AssetManifest
 from .dictionary import CaseInsensitiveDict
\ No newline at end of file
@@ -0,0 +1,235 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.assets
+~~~~~~~~~~~~~~~~~
+
+This module provides the fingerprinted URLs of the static assets.
+
+When the backend starts, :meth:`AssetManifest.build` hashes every file of
+``static/`` and records its fingerprinted URL, ``/static/<hash>/<file>``.
+Those URLs are added to the route table as exact paths, served with
+``Cache-Control: public, max-age=31536000, immutable``: the URL changes
+whenever the content does, so browsers never need to revalidate them.
+
+The pages of ``www/`` are rewritten from the manifest when the static cache
+reads them: ``src``/``href`` references to ``/static/...`` point to the
+fingerprinted URLs. Plain ``/static/...`` URLs keep working as before.
+
+Usage Example:
+--------------
+>>> manifest = AssetManifest()
+>>> manifest.build()
+6
+>>> manifest.url("js/chat.js")
+'/static/3f2a9c41d07b/js/chat.js'
+>>> manifest.rewrite(b'<script src="/static/js/chat.js"></script>')
+b'<script src="/static/3f2a9c41d07b/js/chat.js"></script>'
+"""
+
+import hashlib
+import mimetypes
+import os
+import re
+
+from .log import get_logger
+from .writer import FileBody
+
+log = get_logger("Assets")
+
+#: Directory of the fingerprinted files.
+ASSET_DIR = "static"
+#: URL prefix of that directory.
+URL_PREFIX = "/static/"
+#: Directories of the pages whose references are rewritten.
+PAGE_DIRS = ("www",)
+#: Hex digits of the fingerprint.
+HASH_LENGTH = 12
+#: Bytes read at a time while hashing a file.
+HASH_CHUNK_SIZE = 64 * 1024
+#: ``Cache-Control`` of the fingerprinted URLs.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+REFERENCE = re.compile(rb"""(\b(?:src|href)\s*=\s*)(["'])([^"'?#]+)\2""")
+
+
+def file_hash(path):
+    """
+    Fingerprint of a file, from its content.
+
+    :param path (str): Path of the file.
+
+    :rtype str
+    """
+    digest = hashlib.blake2b(digest_size=HASH_LENGTH // 2)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Asset:
+    """
+    A fingerprinted file.
+
+    Attributes:
+        path (str): Path of the file.
+        url (str): Fingerprinted URL.
+        mime (str): Content type.
+        size (int): File size when hashed.
+        mtime_ns (int): Modification time when hashed.
+    """
+
+    __slots__ = ("path", "url", "mime", "size", "mtime_ns")
+
+    def __init__(self, path, url, stat):
+        self.path = path
+        self.url = url
+        self.mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+
+    def current(self):
+        """
+        Tell whether the file still has the content it was hashed from.
+
+        :rtype bool
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def __call__(self, headers, body):
+        """
+        Route handler of the fingerprinted URL.
+
+        A file changed since startup no longer matches its fingerprint: it is
+        still served, but must be revalidated like any other response.
+        """
+        reply = {"_content": FileBody(self.path), "_mime": self.mime}
+        if self.current():
+            reply["_headers"] = {"Cache-Control": IMMUTABLE}
+        else:
+            log.warning("{} changed since its fingerprint was computed", self.path)
+        return reply
+
+
+class AssetManifest:
+    """
+    Fingerprinted URLs of the files of a static directory.
+
+    Attributes:
+        directory (str): Directory of the files.
+        url_prefix (str): URL prefix of the directory.
+        page_dirs (tuple): Directories of the pages to rewrite.
+        assets (dict): file name relative to ``directory`` -> :class:`Asset`.
+    """
+
+    __attrs__ = [
+        "directory",
+        "url_prefix",
+        "page_dirs",
+        "assets",
+    ]
+
+    def __init__(self, directory=ASSET_DIR, url_prefix=URL_PREFIX, page_dirs=PAGE_DIRS):
+        """
+        Initialize a new, empty AssetManifest instance.
+
+        :param directory (str): Directory of the files.
+        :param url_prefix (str): URL prefix of the directory.
+        :param page_dirs (tuple): Directories of the pages to rewrite.
+        """
+        self.directory = directory
+        self.url_prefix = url_prefix
+        self.page_dirs = tuple(os.path.abspath(d) + os.sep for d in page_dirs)
+        self.assets = {}
+
+    def build(self):
+        """
+        Hash the files of the directory. Unreadable files are skipped.
+
+        :rtype int: number of fingerprinted files.
+        """
+        assets = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                try:
+                    stat = os.stat(path)
+                    url = "{}{}/{}".format(self.url_prefix, file_hash(path), rel)
+                except OSError:
+                    continue
+                assets[rel] = Asset(os.path.abspath(path), url, stat)
+        self.assets = assets
+        return len(assets)
+
+    def url(self, name):
+        """
+        Fingerprinted URL of a file.
+
+        :param name (str): File name relative to the directory, e.g. ``js/chat.js``.
+
+        :rtype str: the URL, or the plain one when the file is unknown.
+        """
+        asset = self.assets.get(name)
+        return asset.url if asset is not None else self.url_prefix + name
+
+    def routes(self):
+        """
+        :rtype list: ``((METHOD, path), handler)`` pairs of the fingerprinted URLs.
+        """
+        return [(("GET", asset.url), asset) for asset in self.assets.values()]
+
+    def rewrite(self, content):
+        """
+        Point the ``src``/``href`` references of a page to the fingerprinted URLs.
+
+        :param content (bytes): The page.
+
+        :rtype bytes
+        """
+        prefix = self.url_prefix.encode()
+
+        def replace(match):
+            target = match.group(3)
+            if not target.startswith(prefix):
+                return match.group(0)
+            asset = self.assets.get(target[len(prefix):].decode("utf-8", "replace"))
+            if asset is None:
+                return match.group(0)
+            return match.group(1) + match.group(2) + asset.url.encode() + match.group(2)
+
+        return REFERENCE.sub(replace, content)
+
+    def transform(self, path, content):
+        """
+        Content hook of the static cache: rewrite the HTML pages.
+
+        :param path (str): Path of the file read.
+        :param content (bytes): Its bytes.
+
+        :rtype bytes
+        """
+        if not self.assets or not path.endswith((".html", ".htm")):
+            return content
+        if not os.path.abspath(path).startswith(self.page_dirs):
+            return content
+        return self.rewrite(content)
+
+
+#: Manifest built by the backend at startup.
+ASSET_MANIFEST = AssetManifest()
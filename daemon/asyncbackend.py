@@ -0,0 +1,342 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.asyncbackend
+~~~~~~~~~~~~~~~~~
+
+This module provides the ``asyncio`` serving engine of the backend. All
+connections are multiplexed on a single event loop, so an idle connection
+costs a coroutine instead of a thread.
+
+Requests are parsed and routed with the same :class:`HttpAdapter <HttpAdapter>`
+used by the threaded engines. Route handlers declared with ``async def`` are
+awaited on the loop; regular handlers are offloaded to a bounded thread pool
+executor so a slow handler never blocks the loop. Persistent connections are
+served in a loop until the client closes them, asks to close, or stays idle
+longer than :attr:`HttpAdapter.keepalive_timeout`. Pipelined requests found in
+the receive buffer are served in order and their responses written together.
+
+Usage Example:
+--------------
+>>> run_async_backend("127.0.0.1", 9000, routes={})
+"""
+
+import asyncio
+import inspect
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+from .httpadapter import HttpAdapter, PIPELINE_FLUSH_BYTES
+from .writer import ChunkedBody, StreamAborted, buffers_size, leading_bytes, release
+from .parser import HttpParser, ParseError
+from .routing import compile_routes
+from .websocket import WebSocketRoute
+from .log import get_logger
+
+log = get_logger("AsyncBackend")
+
+#: Seconds a client may take to send its request.
+READ_TIMEOUT = 30.0
+#: Largest chunk read from a stream at once.
+RECV_SIZE = 64 * 1024
+
+
+async def handle_connection(reader, writer, ip, port, routes, executor):
+    """
+    Serve one client connection on the event loop.
+
+    :param reader (asyncio.StreamReader): Incoming stream of the client.
+    :param writer (asyncio.StreamWriter): Outgoing stream of the client.
+    :param ip (str): IP address of the server.
+    :param port (int): Port number the server is listening on.
+    :param routes (dict): Dictionary of route handlers.
+    :param executor (Executor): Executor running the synchronous handlers.
+    """
+    addr = writer.get_extra_info("peername")
+    loop = asyncio.get_running_loop()
+    stats = HttpAdapter.connection_stats
+    stats.opened()
+    served = 0
+    parser = HttpParser()
+    daemon = HttpAdapter.acquire(ip, port, None, addr, routes)
+    # Buffers of the pipelined responses, written in order in one batch.
+    pending = []
+    pending_bytes = 0
+
+    try:
+        while True:
+            try:
+                parsed = parser.next_request()
+            except ParseError as e:
+                log.warning("rejecting request from {}: {}", addr, e)
+                pending.append(e.response())
+                break
+            if parsed is None:
+                # Nothing complete is buffered: flush before waiting for the client.
+                if pending:
+                    await write_buffers(writer, pending, executor)
+                    pending, pending_bytes = [], 0
+                interim = parser.interim()
+                if interim is not None:
+                    # Expect: 100-continue, the client waits before sending the body.
+                    writer.write(interim)
+                idle = served and not parser.pending()
+                timeout = HttpAdapter.keepalive_timeout if idle else READ_TIMEOUT
+                try:
+                    chunk = await asyncio.wait_for(reader.read(RECV_SIZE), timeout)
+                except asyncio.TimeoutError:
+                    if parser.pending():
+                        # The client stopped partway through a request.
+                        e = ParseError(408)
+                        log.warning("rejecting request from {}: {}", addr, e)
+                        pending.append(e.response())
+                    # Otherwise an idle persistent connection.
+                    break
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                continue
+
+            if served:
+                daemon.recycle()
+            served += 1
+            stats.served(reused=served > 1)
+            req = daemon.prepare_request(parsed, routes)
+            if req is None:
+                full = daemon.build_bad_request()
+            else:
+                daemon.decide_keep_alive(req, served < HttpAdapter.keepalive_max_requests)
+                full = await dispatch(daemon, req, routes, loop, executor)
+                if daemon.upgrade is not None:
+                    # The frames sent after the 101 are for the WebSocket
+                    # thread: leave them in the socket.
+                    writer.transport.pause_reading()
+
+            pending.extend(full)
+            pending_bytes += buffers_size(full)
+            if not daemon.keep_alive:
+                break
+            # A streamed body goes out as it is produced.
+            if pending_bytes >= PIPELINE_FLUSH_BYTES or isinstance(full[-1], ChunkedBody):
+                await write_buffers(writer, pending, executor)
+                pending, pending_bytes = [], 0
+
+        if pending:
+            await write_buffers(writer, pending, executor)
+        if daemon.upgrade is not None:
+            daemon.start_upgrade(detach_socket(writer), parser.detach())
+            daemon = None
+    except StreamAborted as e:
+        log.error("{}", e)
+    except (asyncio.TimeoutError, OSError) as e:
+        log.debug("connection {} dropped: {}", addr, e)
+    finally:
+        release(pending)
+        parser.close()
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+    # Not reached when the task is cancelled: the executor may still be
+    # running a handler with the adapter. An upgraded connection gives it
+    # back once the WebSocket is closed.
+    if daemon is not None:
+        daemon.release()
+
+
+def detach_socket(writer):
+    """
+    Take the socket of a connection out of the event loop: a duplicate of
+    its descriptor keeps the connection open once the transport is closed.
+
+    :param writer (asyncio.StreamWriter): Outgoing stream of the client.
+
+    :rtype socket.socket
+    """
+    sock = writer.get_extra_info("socket")
+    return socket.socket(fileno=os.dup(sock.fileno()))
+
+
+async def write_buffers(writer, buffers, executor=None):
+    """
+    Write response buffers in order; file bodies go through ``loop.sendfile``
+    (``os.sendfile`` on the transport socket, chunked reads as a fallback).
+
+    The pieces of a streamed body are pulled from its generator in the
+    executor, which may block, and written one frame at a time: the next
+    piece is only pulled once :meth:`drain <asyncio.StreamWriter.drain>`
+    returns, i.e. when the client keeps up. An event stream with nothing
+    queued is awaited on the loop until its publisher wakes it up.
+
+    :param writer (asyncio.StreamWriter): Outgoing stream of the client.
+    :param buffers (list): bytes-like objects and bodies; a streamed body is
+                           closed once written.
+    :param executor (Executor): Executor producing the streamed pieces.
+    """
+    loop = asyncio.get_running_loop()
+    while buffers:
+        n = leading_bytes(buffers)
+        if n:
+            writer.writelines(buffers[:n])
+            await writer.drain()
+            buffers = buffers[n:]
+            continue
+        body = buffers[0]
+        if isinstance(body, ChunkedBody):
+            ready = loop.create_future()
+            if not body.when_ready(lambda: loop.call_soon_threadsafe(wake, ready)):
+                # An event stream with nothing queued: no executor thread waits.
+                await ready
+            frame = await loop.run_in_executor(executor, body.next_frame)
+            if body.done:
+                body.close()
+                buffers = buffers[1:]
+            if frame:
+                buffers = [frame] + buffers
+            continue
+        buffers = buffers[1:]
+        with open(body.path, "rb") as f:
+            sent = await loop.sendfile(writer.transport, f, body.offset, body.count)
+        if sent < body.count:
+            raise ConnectionError("{} is shorter than announced".format(body.path))
+
+
+def wake(future):
+    """
+    Resolve a future the loop awaits, unless it was cancelled meanwhile.
+    """
+    if not future.done():
+        future.set_result(None)
+
+
+async def dispatch(daemon, req, routes, loop, executor):
+    """
+    Route a prepared request and produce its response buffers.
+
+    ``async def`` handlers are awaited natively; other handlers run, together
+    with the response rendering (which may read files), in the executor.
+
+    :param daemon (HttpAdapter): Adapter holding the request and response.
+    :param req (Request): The prepared request.
+    :param routes (dict): Dictionary of route handlers.
+    :param loop (asyncio.AbstractEventLoop): The running loop.
+    :param executor (Executor): Executor running the synchronous handlers.
+
+    :rtype list: buffers of the complete HTTP response.
+    """
+    hook = daemon.route_request(req, routes)
+    if hook is None:
+        return render_reply(daemon, req, None)
+    if isinstance(hook, WebSocketRoute):
+        return daemon.upgrade_websocket(req, hook)
+
+    if inspect.iscoroutinefunction(hook):
+        try:
+            app_response_data = await daemon.invoke_hook(hook, req)
+        except Exception as e:
+            app_response_data = None
+            daemon.hook_failed(e)
+        return render_reply(daemon, req, app_response_data)
+
+    return await loop.run_in_executor(executor, run_hook, daemon, hook, req)
+
+
+def run_hook(daemon, hook, req):
+    """
+    Call a synchronous handler and render its result; runs in the executor.
+
+    :param daemon (HttpAdapter): Adapter holding the request and response.
+    :param hook (callable): The route handler.
+    :param req (Request): The prepared request.
+
+    :rtype list: buffers of the complete HTTP response.
+    """
+    app_response_data = None
+    try:
+        app_response_data = daemon.invoke_hook(hook, req)
+        if inspect.isawaitable(app_response_data):
+            # A sync callable returning a coroutine (e.g. a wrapped async handler).
+            app_response_data = asyncio.run(app_response_data)
+    except Exception as e:
+        app_response_data = None
+        daemon.hook_failed(e)
+    return render_reply(daemon, req, app_response_data)
+
+
+def render_reply(daemon, req, app_response_data):
+    """
+    :meth:`HttpAdapter.build_reply`, answering ``500`` and closing the
+    connection when the result cannot be rendered, e.g. the path of a
+    missing file.
+
+    :param daemon (HttpAdapter): Adapter holding the request and response.
+    :param req (Request): The prepared request.
+    :param app_response_data: The handler result.
+
+    :rtype list: buffers of the complete HTTP response.
+    """
+    try:
+        return daemon.build_reply(req, app_response_data)
+    except Exception as e:
+        daemon.keep_alive = False
+        daemon.hook_failed(e)
+        return daemon.build_reply(req, None)
+
+
+async def serve(ip, port, routes, executor, sock=None):
+    """
+    Start the asyncio server and serve forever.
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers.
+    :param executor (Executor): Executor running the synchronous handlers.
+    :param sock (socket.socket): Already listening socket to serve instead of binding.
+    """
+    async def on_client(reader, writer):
+        await handle_connection(reader, writer, ip, port, routes, executor)
+
+    if sock is not None:
+        server = await asyncio.start_server(on_client, sock=sock, limit=RECV_SIZE)
+    else:
+        server = await asyncio.start_server(on_client, ip, port,
+                                            limit=RECV_SIZE, backlog=1024)
+    log.info("Listening on port {} (asyncio engine)", port)
+    if routes != {}:
+        log.debug("route settings {}", routes)
+    async with server:
+        await server.serve_forever()
+
+
+def run_async_backend(ip, port, routes, threads=16, server=None):
+    """
+    Entry point of the ``asyncio`` engine.
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers.
+    :param threads (int): Size of the executor running synchronous handlers.
+    :param server (socket.socket): Already listening socket (pre-fork workers).
+    """
+    routes = compile_routes(routes)
+    executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="backend-handler")
+    try:
+        asyncio.run(serve(ip, port, routes, executor, sock=server))
+    except OSError as e:
+        log.error("Socket error: {}", e)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown(wait=False)
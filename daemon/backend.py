@@ -141,32 +141,81 @@ Requirements:
 - threading: Enables concurrent client handling via threads.
 - response: response utilities.
 - httpadapter: the class for handling HTTP requests.
+- workerpool: bounded thread pool used by the ``pool`` engine.
+- asyncbackend: single event loop engine used by the ``asyncio`` engine.
+- reactor: selectors based non-blocking engine used by the ``reactor`` engine.
+- prefork: multi-process supervisor used when ``workers`` is greater than one.
+- staticcache: in-memory cache of the served files, sized by ``static_cache_size``.
+- assets: fingerprinted ``/static/<hash>/<file>`` URLs, enabled by ``fingerprint_assets``.
 - CaseInsensitiveDict: provides dictionary for managing headers or routes.
 
 
 Notes:
 ------
 - The server create daemon threads for client handling.
+- Serving engines (``ENGINES``), picked with ``engine``:
+    * ``thread``: one daemon thread per accepted connection (default).
+    * ``pool``: a fixed number of worker threads fed by a bounded accept
+      queue, with an explicit overflow policy (``block``, ``reject``, ``drop``);
+      WebSockets and event streams go on on threads of their own.
+    * ``asyncio``: every connection on one event loop; synchronous handlers
+      run in an executor of ``threads`` workers, ``async def`` handlers are awaited.
+    * ``reactor``: one thread multiplexes accept/read/write of every connection
+      with :mod:`selectors`; complete requests run on a pool of ``threads`` workers.
+- HTTP/1.1 persistent connections are served by every engine; the idle timeout
+  and the requests-per-connection cap are ``keepalive_timeout`` and ``keepalive_max``.
+- With ``workers`` > 1 a supervisor pre-forks that many processes, each running
+  the selected engine on the same port (inherited socket or ``SO_REUSEPORT``).
 - The current implementation error handling is minimal, socket errors are printed to the console.
 - The actual request processing is delegated to the HttpAdapter class.
 
 Usage Example:
 --------------
 >>> create_backend("127.0.0.1", 9000, routes={})
+>>> create_backend("127.0.0.1", 9000, routes={}, engine="pool", threads=16, queue_size=128)
+>>> create_backend("127.0.0.1", 9000, routes={}, engine="asyncio")
+>>> create_backend("127.0.0.1", 9000, routes={}, engine="reactor")
+>>> create_backend("127.0.0.1", 9000, routes={}, engine="pool", workers=4)
 
 """
 
 import socket
 import threading
 import argparse
+import time
 
 from .response import *
-from .httpadapter import HttpAdapter
+from .httpadapter import HttpAdapter, KEEPALIVE_TIMEOUT, KEEPALIVE_MAX_REQUESTS
+from .parser import (RECV_BUFFERS, MAX_BODY_SIZE,
+                     configure as configure_parser)
 from .dictionary import CaseInsensitiveDict
+from .workerpool import WorkerPool, OVERFLOW_REJECT, OVERFLOW_POLICIES
+from .asyncbackend import run_async_backend
+from .reactor import run_reactor_backend
+from .prefork import run_prefork, REPORT_INTERVAL
+from .routing import compile_routes
+from .staticcache import (STATIC_CACHE, MAX_BYTES as STATIC_CACHE_BYTES,
+                          REVALIDATE_INTERVAL as STATIC_REVALIDATE)
+from .compression import MIN_SIZE as COMPRESS_MIN_SIZE
+from .writer import STREAM_STATS
+from .websocket import WS_STATS
+from .assets import ASSET_MANIFEST
+from .log import (get_logger, configure as configure_logging,
+                  LEVELS as LOG_LEVELS, SAMPLE_EVERY as LOG_SAMPLE_EVERY)
+
+log = get_logger("Backend")
+
+ENGINES = ("thread", "pool", "asyncio", "reactor")
+
+#: Default sizing of the ``pool`` engine.
+POOL_THREADS = 16
+POOL_QUEUE_SIZE = 128
+
 
 def handle_client(ip, port, conn, addr, routes):
     """
-    Initializes an HttpAdapter instance and delegates the client handling logic to it.
+    Takes an HttpAdapter instance from the adapter pool and delegates the client
+    handling logic to it; the adapter is given back once the connection is closed.
 
     :param ip (str): IP address of the server.
     :param port (int): Port number the server is listening on.
@@ -174,52 +223,292 @@ def handle_client(ip, port, conn, addr, routes):
     :param addr (tuple): client address (IP, port).
     :param routes (dict): Dictionary of route handlers.
     """
-    daemon = HttpAdapter(ip, port, conn, addr, routes)
+    daemon = HttpAdapter.acquire(ip, port, conn, addr, routes)
 
     # Handle client
-    daemon.handle_client(conn, addr, routes)
+    handed_over = False
+    try:
+        handed_over = daemon.handle_client(conn, addr, routes)
+    finally:
+        # Otherwise released by the thread the connection went on with.
+        if not handed_over:
+            daemon.release()
+
+
+def reject_client(ip, port, conn, addr, routes):
+    """
+    Answers a connection refused by the worker pool with ``503 Service Unavailable``
+    and closes it, so the client sees an explicit overload instead of a hang.
+
+    :param conn (socket.socket): Client connection socket.
+    :param addr (tuple): client address (IP, port).
+    """
+    try:
+        conn.sendall(b"HTTP/1.1 503 Service Unavailable\r\n"
+                     b"Content-Type: text/plain\r\n"
+                     b"Content-Length: 19\r\n"
+                     b"Retry-After: 1\r\n"
+                     b"Connection: close\r\n"
+                     b"\r\n"
+                     b"Service Unavailable")
+    except OSError:
+        pass
+    finally:
+        conn.close()
+
+
+def report_stats(pool, interval):
+    """
+    Periodically prints the connection reuse, static cache, object pool,
+    streamed response (time to first byte) and WebSocket statistics and, for
+    the ``pool`` engine, the worker pool statistics (queue depth, wait
+    time, rejections) so the backend can be sized for the observed load.
 
-def run_backend(ip, port, routes):
+    :param pool (WorkerPool): The pool to report on, or None.
+    :param interval (float): Seconds between two reports.
+    """
+    while True:
+        time.sleep(interval)
+        log.info("connection stats {}", HttpAdapter.connection_stats.snapshot())
+        log.info("static cache stats {}", HttpAdapter.static_cache.stats())
+        log.info("adapter pool stats {}, receive buffer pool stats {}",
+                 HttpAdapter.pool.snapshot(), RECV_BUFFERS.snapshot())
+        log.info("stream stats {}", STREAM_STATS.snapshot())
+        log.info("websocket stats {}", WS_STATS.snapshot())
+        if pool is not None:
+            log.info("pool stats {}", pool.stats())
+
+
+def create_pool(threads=POOL_THREADS, queue_size=POOL_QUEUE_SIZE,
+                overflow=OVERFLOW_REJECT):
+    """
+    Builds the :class:`WorkerPool <WorkerPool>` used by the ``pool`` engine.
+
+    :param threads (int): Number of worker threads.
+    :param queue_size (int): Capacity of the accept queue.
+    :param overflow (str): Overflow policy (``block``, ``reject`` or ``drop``).
+
+    :rtype WorkerPool: a started worker pool.
+    """
+    pool = WorkerPool(workers=threads, queue_size=queue_size, overflow=overflow,
+                      on_reject=reject_client, name="backend-worker")
+    pool.start()
+    return pool
+
+
+def run_backend(ip, port, routes, engine="thread", threads=POOL_THREADS,
+                queue_size=POOL_QUEUE_SIZE, overflow=OVERFLOW_REJECT,
+                stats_interval=0, server=None, keepalive_timeout=KEEPALIVE_TIMEOUT,
+                keepalive_max=KEEPALIVE_MAX_REQUESTS, compress_min_size=COMPRESS_MIN_SIZE):
     """
     Starts the backend server, binds to the specified IP and port, and listens for incoming
-    connections. Each connection is handled in a separate thread. The backend accepts incoming
-    connections and spawns a thread for each client.
+    connections. With the ``thread`` engine each connection is handled in a separate thread.
+    With the ``pool`` engine accepted connections are queued to a fixed set of workers.
+    The ``asyncio`` engine is delegated to :func:`run_async_backend <run_async_backend>`
+    and the ``reactor`` engine to :func:`run_reactor_backend <run_reactor_backend>`.
 
 
     :param ip (str): IP address to bind the server.
     :param port (int): Port number to listen on.
     :param routes (dict): Dictionary of route handlers.
+    :param engine (str): Serving engine, one of ``thread``, ``pool``, ``asyncio`` or ``reactor``.
+    :param threads (int): Worker threads of the ``pool`` and ``reactor`` engines, handler
+                          executor size of the ``asyncio`` engine.
+    :param queue_size (int): Accept queue capacity of the ``pool`` engine, handler
+                             queue capacity of the ``reactor`` engine.
+    :param overflow (str): Overflow policy of the ``pool`` engine.
+    :param stats_interval (float): If positive, print connection and pool statistics
+                                   every N seconds.
+    :param keepalive_timeout (float): Idle seconds before a persistent connection is closed.
+    :param keepalive_max (int): Requests served on one connection before it is closed.
+    :param compress_min_size (int): Smallest handler body compressed on the fly
+                                    (gzip/deflate), 0 disables it.
+    :param server (socket.socket): Already listening socket to serve instead of binding
+                                   (used by the pre-fork workers).
+
+    :raise ValueError: If the engine is unknown.
     """
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if engine not in ENGINES:
+        raise ValueError("Unknown backend engine {!r}, expected one of {}".format(
+            engine, ", ".join(ENGINES)))
+    routes = compile_routes(routes)
+
+    HttpAdapter.keepalive_timeout = keepalive_timeout
+    HttpAdapter.keepalive_max_requests = keepalive_max
+    HttpAdapter.compress_min_size = compress_min_size
+    # WebSockets and event streams must not hold the few workers of the pool.
+    HttpAdapter.hand_over_long_lived = engine == "pool"
+
+    pool = None
+    if engine == "pool":
+        pool = create_pool(threads, queue_size, overflow)
+    if stats_interval and stats_interval > 0:
+        threading.Thread(target=report_stats, args=(pool, stats_interval),
+                         daemon=True).start()
+
+    if engine == "asyncio":
+        run_async_backend(ip, port, routes, threads=threads, server=server)
+        return
+    if engine == "reactor":
+        run_reactor_backend(ip, port, routes, threads=threads, queue_size=queue_size,
+                            server=server)
+        return
 
     try:
-        server.bind((ip, port))
-        server.listen(50)
-        print("[Backend] Listening on port {}".format(port))
+        if server is None:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind((ip, port))
+            server.listen(50)
+        log.info("Listening on port {} ({} engine)", port, engine)
         if routes != {}:
-            print("[Backend] route settings {}".format(routes))
+            log.debug("route settings {}", routes)
 
         while True:
             conn, addr = server.accept()
-            #
-            #  TODO: implement the step of the client incomping connection
-            #        using multi-thread programming with the
-            #        provided handle_client routine
-            #
+            if pool is not None:
+                queued = pool.submit(handle_client, ip, port, conn, addr, routes)
+                if not queued and pool.overflow != OVERFLOW_REJECT:
+                    # Dropped: reject_client only answers the reject policy.
+                    conn.close()
+                continue
             client_thread = threading.Thread(target=handle_client, args=(ip, port, conn, addr, routes), daemon=True)
             client_thread.start()
-            #client_thread.join()  # Optional: Wait for the thread to finish (not usually needed for daemon threads)
 
     except socket.error as e:
-      print("Socket error: {}".format(e))
+      log.error("Socket error: {}", e)
 
-def create_backend(ip, port, routes={}):
+
+def create_backend(ip, port, routes={}, workers=1, reuse_port=False,
+                   report_interval=REPORT_INTERVAL, log_level=None,
+                   log_sample=None, static_cache_size=None,
+                   static_revalidate=None, fingerprint_assets=True,
+                   max_body_size=None, **options):
     """
     Entry point for creating and running the backend server.
 
     :param ip (str): IP address to bind the server.
     :param port (int): Port number to listen on.
     :param routes (dict, optional): Dictionary of route handlers. Defaults to empty dict.
+    :param workers (int): Number of pre-forked processes; 1 serves in this process.
+    :param reuse_port (bool): Pre-forked workers bind their own ``SO_REUSEPORT`` socket
+                              instead of sharing the supervisor's one.
+    :param report_interval (float): Seconds between per-worker request count reports.
+    :param log_level (str): Minimum log level (``debug``, ``info``, ``warning``,
+                            ``error`` or ``off``); unchanged when None.
+    :param log_sample (int): Keep one out of N sampled per-request debug lines.
+    :param static_cache_size (int): Byte budget of the static file cache, 0
+                                    disables it; unchanged when None.
+    :param static_revalidate (float): Seconds a cached file is served before
+                                      being checked on disk again.
+    :param fingerprint_assets (bool): Serve ``static/`` at immutable
+                                      fingerprinted URLs too, and point the
+                                      ``www/`` pages to them.
+    :param max_body_size (int): Largest accepted request body; bodies over
+                                :data:`SPOOL_SIZE <daemon.body.SPOOL_SIZE>`
+                                are spooled to disk. Unchanged when None.
+    :param options: Engine selection and sizing forwarded to :func:`run_backend`
+                    (``engine``, ``threads``, ``queue_size``, ``overflow``, ``stats_interval``,
+                    ``keepalive_timeout``, ``keepalive_max``, ``compress_min_size``).
+    """
+    # Configured before forking so that every worker inherits the settings.
+    configure_logging(level=log_level, sample_every=log_sample)
+    configure_parser(max_body_size=max_body_size)
+    STATIC_CACHE.configure(max_bytes=static_cache_size,
+                           revalidate_interval=static_revalidate)
+    if fingerprint_assets:
+        # Hashed before the pages are read, which are rewritten from it.
+        fingerprinted = ASSET_MANIFEST.build()
+        if fingerprinted:
+            STATIC_CACHE.transform = ASSET_MANIFEST.transform
+            log.info("fingerprinted {} static files", fingerprinted)
+    # Read and compress the static files once, shared by the forked workers.
+    preloaded = STATIC_CACHE.preload()
+    if preloaded:
+        log.info("static cache preloaded {} files", preloaded)
+
+    # Start scripts may hand over the raw route mapping of an app.
+    routes = compile_routes(routes)
+    if fingerprint_assets:
+        for key, handler in ASSET_MANIFEST.routes():
+            routes[key] = handler
+
+    if workers and workers > 1:
+        def serve(server):
+            run_backend(ip, port, routes, server=server, **options)
+        run_prefork(serve, ip, port, workers, reuse_port=reuse_port,
+                    report_interval=report_interval)
+        return
+
+    run_backend(ip, port, routes, **options)
+
+
+def add_backend_arguments(parser):
     """
+    Register the engine and process options shared by the start scripts.
 
-    run_backend(ip, port, routes)
\ No newline at end of file
+    :param parser (argparse.ArgumentParser): The parser to extend.
+    """
+    parser.add_argument('--engine', choices=ENGINES, default='thread',
+                        help='Serving engine: thread per connection, bounded worker pool, asyncio or selectors reactor')
+    parser.add_argument('--threads', type=int, default=POOL_THREADS,
+                        help='Handler threads of the pool, reactor and asyncio engines')
+    parser.add_argument('--queue-size', type=int, default=POOL_QUEUE_SIZE,
+                        help='Pending connection/request queue capacity of the pool and reactor engines')
+    parser.add_argument('--overflow', choices=OVERFLOW_POLICIES, default='reject',
+                        help='What the pool engine does when its queue is full')
+    parser.add_argument('--stats-interval', type=float, default=0,
+                        help='Print connection and pool statistics every N seconds (0 disables)')
+    parser.add_argument('--keepalive-timeout', type=float, default=KEEPALIVE_TIMEOUT,
+                        help='Idle seconds before a persistent connection is closed')
+    parser.add_argument('--keepalive-max', type=int, default=KEEPALIVE_MAX_REQUESTS,
+                        help='Requests served on one connection before it is closed')
+    parser.add_argument('--compress-min-size', type=int, default=COMPRESS_MIN_SIZE,
+                        help='Smallest JSON/text handler body compressed on the fly (0 disables)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of pre-forked worker processes sharing the port')
+    parser.add_argument('--reuse-port', action='store_true',
+                        help='Let each worker bind its own SO_REUSEPORT socket')
+    parser.add_argument('--report-interval', type=float, default=REPORT_INTERVAL,
+                        help='Seconds between per-worker request count reports')
+    parser.add_argument('--log-level', choices=tuple(LOG_LEVELS), default='info',
+                        help='Minimum level of the log records written to stdout')
+    parser.add_argument('--log-sample', type=int, default=LOG_SAMPLE_EVERY,
+                        help='Keep one out of N per-request debug log lines')
+    parser.add_argument('--static-cache-size', type=int, default=STATIC_CACHE_BYTES,
+                        help='Bytes of static files kept in memory (0 disables the cache)')
+    parser.add_argument('--static-revalidate', type=float, default=STATIC_REVALIDATE,
+                        help='Seconds a cached static file is served before being checked on disk')
+    parser.add_argument('--no-fingerprint', dest='fingerprint_assets', action='store_false',
+                        help='Do not serve static files at immutable fingerprinted URLs')
+    parser.add_argument('--max-body-size', type=int, default=MAX_BODY_SIZE,
+                        help='Largest request body in bytes; large bodies are spooled to disk')
+
+
+def backend_options(args):
+    """
+    Collect the options registered by :func:`add_backend_arguments`.
+
+    :param args (argparse.Namespace): Parsed command-line arguments.
+
+    :rtype dict: keyword arguments for :func:`create_backend` / ``WeApRous.run``.
+    """
+    return {
+        "engine": args.engine,
+        "threads": args.threads,
+        "queue_size": args.queue_size,
+        "overflow": args.overflow,
+        "stats_interval": args.stats_interval,
+        "keepalive_timeout": args.keepalive_timeout,
+        "keepalive_max": args.keepalive_max,
+        "compress_min_size": args.compress_min_size,
+        "workers": args.workers,
+        "reuse_port": args.reuse_port,
+        "report_interval": args.report_interval,
+        "log_level": args.log_level,
+        "log_sample": args.log_sample,
+        "static_cache_size": args.static_cache_size,
+        "static_revalidate": args.static_revalidate,
+        "fingerprint_assets": args.fingerprint_assets,
+        "max_body_size": args.max_body_size,
+    }
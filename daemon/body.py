@@ -0,0 +1,224 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.body
+~~~~~~~~~~~~~~~~~
+
+This module provides the request bodies too large to be kept in memory.
+
+While a request is received, the :class:`HttpParser <HttpParser>` moves the
+body of a large or ``Transfer-Encoding: chunked`` request out of its receive
+buffer into a :class:`BodySpool`: bytes are collected in memory up to
+:data:`SPOOL_SIZE`, and written to an anonymous temporary file beyond. A body
+that stayed small comes out as ``bytes``, like any other; a spooled one as a
+:class:`RequestBody`, the file-like reader handlers get as ``ctx.stream``.
+
+Usage Example:
+--------------
+>>> @app.route('/upload', methods=['POST'])
+>>> def upload(ctx):
+>>>     with open("upload.bin", "wb") as f:
+>>>         for chunk in ctx.stream:
+>>>             f.write(chunk)
+>>>     return {"size": len(ctx.stream)}
+"""
+
+import io
+import tempfile
+
+#: Bodies larger than this are written to a temporary file.
+SPOOL_SIZE = 1024 * 1024
+#: Size of the chunks yielded when iterating a body.
+CHUNK_SIZE = 64 * 1024
+
+
+class RequestBody:
+    """
+    Read-only, file-like reader of a request body, held in memory or in a
+    temporary file. Iterating it yields chunks of at most :data:`CHUNK_SIZE`
+    bytes.
+
+    Attributes:
+        file (file): Binary file holding the body, positioned at its start.
+        size (int): Body length.
+    """
+
+    __attrs__ = [
+        "file",
+        "size",
+    ]
+
+    __slots__ = ("file", "size")
+
+    def __init__(self, file, size):
+        """
+        :param file (file): Binary file holding the body.
+        :param size (int): Body length.
+        """
+        self.file = file
+        self.size = size
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        :param data (bytes): A body received in memory.
+
+        :rtype RequestBody
+        """
+        return cls(io.BytesIO(data), len(data))
+
+    @property
+    def spooled(self):
+        """:rtype bool: the body is in a temporary file."""
+        return not isinstance(self.file, io.BytesIO)
+
+    def read(self, size=-1):
+        """
+        Read up to ``size`` bytes, or the rest of the body.
+
+        :rtype bytes: b"" at the end of the body.
+        """
+        return self.file.read(size)
+
+    def readinto(self, buffer):
+        """
+        Read into a writable buffer.
+
+        :rtype int: bytes read.
+        """
+        return self.file.readinto(buffer)
+
+    def readline(self, size=-1):
+        """
+        Read up to the next ``\\n``, e.g. of a line-oriented upload.
+
+        :rtype bytes
+        """
+        return self.file.readline(size)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """
+        Move the read position, e.g. back to 0 to read the body again.
+
+        :rtype int: the new position.
+        """
+        return self.file.seek(offset, whence)
+
+    def tell(self):
+        """:rtype int: the read position."""
+        return self.file.tell()
+
+    def getvalue(self):
+        """
+        Read the whole body, from its start, into memory.
+
+        :rtype bytes
+        """
+        self.file.seek(0)
+        data = self.file.read()
+        self.file.seek(0)
+        return data
+
+    def __iter__(self):
+        read = self.file.read
+        while True:
+            chunk = read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def __len__(self):
+        return self.size
+
+    def close(self):
+        """
+        Release the memory or remove the temporary file.
+        """
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return "<RequestBody {} bytes{}>".format(self.size, ", spooled" if self.spooled else "")
+
+
+class BodySpool:
+    """
+    Sink collecting a body as it is received: in memory while it stays
+    under ``spool_size``, in an anonymous temporary file beyond.
+
+    Attributes:
+        spool_size (int): Largest body kept in memory.
+        size (int): Bytes written so far.
+    """
+
+    __slots__ = ("spool_size", "size", "_data", "_file")
+
+    def __init__(self, spool_size=SPOOL_SIZE, expected=0):
+        """
+        :param spool_size (int): Largest body kept in memory.
+        :param expected (int): Announced body length; a body known to be
+                               larger than ``spool_size`` goes to the file
+                               from its first byte.
+        """
+        self.spool_size = spool_size
+        self.size = 0
+        self._data = bytearray()
+        self._file = None
+        if expected > spool_size:
+            self._rollover()
+
+    def _rollover(self):
+        self._file = tempfile.TemporaryFile()
+        if self._data:
+            self._file.write(self._data)
+        self._data = None
+
+    def write(self, data):
+        """
+        Append received bytes.
+
+        :param data (bytes-like): The bytes; a memoryview is copied, not kept.
+        """
+        self.size += len(data)
+        if self._file is None:
+            self._data += data
+            if self.size > self.spool_size:
+                self._rollover()
+        else:
+            self._file.write(data)
+
+    def finish(self):
+        """
+        End the body.
+
+        :rtype bytes|RequestBody: the bytes of a body kept in memory, or a
+                                  reader of the temporary file.
+        """
+        if self._file is None:
+            return bytes(self._data)
+        self._file.flush()
+        self._file.seek(0)
+        return RequestBody(self._file, self.size)
+
+    def close(self):
+        """
+        Drop an unfinished body.
+        """
+        if self._file is not None:
+            self._file.close()
+        self._data = None
@@ -0,0 +1,142 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.compression
+~~~~~~~~~~~~~~~~~
+
+This module provides the ``Accept-Encoding`` negotiation and the ``gzip`` /
+``deflate`` content codings of the responses.
+
+Static files are compressed once, when the static cache reads them, and the
+compressed variants are kept next to the original bytes. Handler results
+(JSON, text) larger than a threshold are compressed on the fly. A compressed
+variant gets its own strong ``ETag`` (the original tag plus the coding), and
+every response whose body could be compressed carries
+``Vary: Accept-Encoding`` so shared caches keep the variants apart.
+
+Usage Example:
+--------------
+>>> choose_encoding("gzip;q=0.5, deflate")
+'deflate'
+>>> body = compress(b"{}" * 1000, "gzip")
+"""
+
+import gzip
+import zlib
+
+#: Codings offered, in order of preference when the client has none.
+ENCODINGS = ("gzip", "deflate")
+#: Compression level of both codings (speed/size trade-off).
+LEVEL = 6
+#: Smallest body worth compressing.
+MIN_SIZE = 1024
+#: Content types compressed; other ``text/*`` types are compressed too.
+COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+    "text/javascript",
+}
+
+
+def is_compressible(mime):
+    """
+    Tell whether a content type benefits from compression.
+
+    :param mime (str): Content type, parameters allowed.
+
+    :rtype bool
+    """
+    if not mime:
+        return False
+    mime = mime.split(";", 1)[0].strip().lower()
+    return mime.startswith("text/") or mime in COMPRESSIBLE_TYPES
+
+
+def parse_accept_encoding(header):
+    """
+    Parse an ``Accept-Encoding`` header.
+
+    :param header (str): Header value, e.g. ``gzip, deflate;q=0.5``.
+
+    :rtype dict: coding -> quality.
+    """
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def choose_encoding(header, available=ENCODINGS):
+    """
+    Pick the content coding of a response.
+
+    :param header (str): The request ``Accept-Encoding`` header, or None.
+    :param available (tuple): Codings the response can be sent with.
+
+    :rtype str: the coding, or None to send the body as is.
+    """
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(content, encoding, level=LEVEL):
+    """
+    Compress a body.
+
+    :param content (bytes): The body.
+    :param encoding (str): ``gzip`` or ``deflate`` (zlib format, RFC 9110).
+    :param level (int): Compression level.
+
+    :rtype bytes
+    """
+    if encoding == "gzip":
+        # mtime=0 keeps the output, hence the ETag, stable across restarts.
+        return gzip.compress(content, compresslevel=level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(content, level)
+    raise ValueError("Unsupported content coding {!r}".format(encoding))
+
+
+def variant_etag(etag, encoding):
+    """
+    Entity tag of a compressed variant.
+
+    :param etag (str): Quoted tag of the original body.
+    :param encoding (str): The content coding.
+
+    :rtype str
+    """
+    if not etag or not encoding:
+        return etag
+    return '{}-{}"'.format(etag[:-1], encoding)
@@ -0,0 +1,193 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.context
+~~~~~~~~~~~~~~~~~
+
+This module provides the request context handed to the route handlers, and
+the calling convention choosing between it and the original WeApRous
+``(headers, body)`` signature.
+
+A handler declaring a ``headers`` or ``body`` parameter, or only ``*args``
+and ``**kwargs`` (e.g. the wrapper of a decorator), is called as before,
+``handler(headers=..., body=..., **params)``. Any other handler receives a
+:class:`RequestContext` as its first argument, ``handler(ctx, **params)``,
+whose query string, form fields and JSON body are decoded once, on first
+access, and cached on the :class:`Request <Request>`. Large uploads are best
+read from ``ctx.stream``, which does not load a spooled body into memory.
+
+Usage Example:
+--------------
+>>> @app.route('/send', methods=['POST'])
+>>> def send_message(ctx):
+>>>     data = ctx.json or {}
+>>>     return {"channel": data.get("channel", ctx.arg("channel", "general"))}
+"""
+
+import inspect
+
+#: Parameter names selecting the ``(headers, body)`` calling convention.
+LEGACY_PARAMETERS = ("headers", "body")
+#: Kinds of ``*args`` and ``**kwargs``, which cannot name the context.
+VARIADIC = (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+
+# handler -> True when it takes a RequestContext; filled on first call.
+_conventions = {}
+
+
+class RequestContext:
+    """
+    What a route handler sees of a request.
+
+    Attributes:
+        request (Request): The prepared request.
+    """
+
+    __slots__ = ("request",)
+
+    def __init__(self, request):
+        """
+        :param request (Request): The prepared request.
+        """
+        self.request = request
+
+    @property
+    def method(self):
+        """:rtype str: the HTTP verb."""
+        return self.request.method
+
+    @property
+    def path(self):
+        """:rtype str: the request path, query string excluded."""
+        return (self.request.path or "").partition("?")[0]
+
+    @property
+    def headers(self):
+        """:rtype Mapping: request headers, case-insensitive names."""
+        return self.request.headers
+
+    @property
+    def body(self):
+        """:rtype str: the body decoded as UTF-8, or None."""
+        return self.request.body
+
+    @property
+    def raw_body(self):
+        """:rtype bytes: the body as received."""
+        return self.request.raw_body
+
+    @property
+    def stream(self):
+        """:rtype RequestBody: file-like reader of the body, iterable by chunks."""
+        return self.request.stream
+
+    @property
+    def params(self):
+        """:rtype dict: parameters captured by the route path."""
+        return self.request.params
+
+    @property
+    def cookies(self):
+        """:rtype dict: cookie name -> value."""
+        return self.request.cookies
+
+    @property
+    def query(self):
+        """:rtype dict: query parameter -> list of values."""
+        return self.request.query
+
+    @property
+    def form(self):
+        """:rtype dict: form field -> list of values."""
+        return self.request.form
+
+    @property
+    def json(self):
+        """:rtype: the decoded JSON body, or None."""
+        return self.request.json
+
+    def arg(self, name, default=None):
+        """
+        First value of a query parameter.
+
+        :param name (str): Parameter name.
+        :param default: Returned when the parameter is absent.
+        """
+        values = self.request.query.get(name)
+        return values[0] if values else default
+
+    def field(self, name, default=None):
+        """
+        First value of a form field.
+
+        :param name (str): Field name.
+        :param default: Returned when the field is absent.
+        """
+        values = self.request.form.get(name)
+        return values[0] if values else default
+
+    def cookie(self, name, default=None):
+        """
+        Value of a cookie.
+
+        :param name (str): Cookie name.
+        :param default: Returned when the cookie is absent.
+        """
+        return self.request.cookies.get(name, default)
+
+    def __repr__(self):
+        return "<RequestContext {} {}>".format(self.method, self.path)
+
+
+def takes_context(handler):
+    """
+    Tell which calling convention a handler uses.
+
+    :param handler (callable): A route handler.
+
+    :rtype bool: True for ``handler(ctx, **params)``, False for the
+                 ``(headers, body)`` signature and for ``(*args, **kwargs)``
+                 wrappers, which were called that way.
+    """
+    try:
+        return _conventions[handler]
+    except (KeyError, TypeError):
+        pass
+    try:
+        parameters = inspect.signature(handler).parameters
+    except (TypeError, ValueError):
+        # Builtins without signature: keep the original convention.
+        parameters = dict.fromkeys(LEGACY_PARAMETERS)
+    first = next(iter(parameters.values()), None)
+    wants = not (any(name in parameters for name in LEGACY_PARAMETERS)
+                 or (first is not None and first.kind in VARIADIC))
+    try:
+        _conventions[handler] = wants
+    except TypeError:
+        pass
+    return wants
+
+
+def call_handler(handler, request):
+    """
+    Call a route handler with the convention it declares, plus the
+    parameters captured by its route path as keyword arguments.
+
+    :param handler (callable): The route handler.
+    :param request (Request): The prepared request.
+
+    :rtype: the handler result (a coroutine for ``async def`` handlers).
+    """
+    if takes_context(handler):
+        return handler(RequestContext(request), **request.params)
+    return handler(headers=request.headers, body=request.body, **request.params)
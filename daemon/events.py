@@ -0,0 +1,327 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.events
+~~~~~~~~~~~~~~~~~
+
+This module provides an in-process publish/subscribe hub and the framing of
+Server-Sent Events (``text/event-stream``).
+
+:meth:`EventHub.publish` formats an event once and appends the same bytes to
+the queue of every :class:`Subscription` of its topic. A subscription is the
+iterator of a streamed response (see :class:`ChunkedBody <ChunkedBody>`): it
+yields what is queued, joined in one piece, and blocks while nothing is.
+Engines that must not block ask it first with :meth:`Subscription.when_ready`
+and are called back by the publisher, so an idle subscriber holds no thread.
+
+Idle subscriptions get a comment line every :data:`HEARTBEAT_INTERVAL`
+seconds, which keeps proxies from timing the stream out and lets the server
+notice clients that went away. A subscriber falling more than
+:data:`MAX_QUEUED` events behind is ended; ``EventSource`` clients reconnect
+with the ``Last-Event-ID`` of the last event they received.
+
+Events are only shared by the threads of one process.
+
+Usage Example:
+--------------
+>>> hub = EventHub()
+>>> @app.route('/events', methods=['GET'])
+>>> def events(ctx):
+>>>     stream = hub.subscribe(ctx.arg('channel'), prelude=[format_event(retry=3000)])
+>>>     return {"_content": stream, "_mime": "text/event-stream"}
+>>> hub.publish('general', {"text": "hi"}, event="message", id=1)
+"""
+
+import collections
+import json
+import threading
+import time
+
+from .log import get_logger
+
+log = get_logger("Events")
+
+#: Seconds of silence after which a subscriber gets a heartbeat comment.
+HEARTBEAT_INTERVAL = 15.0
+#: Events queued for a subscriber before it is ended as too slow.
+MAX_QUEUED = 1024
+#: Comment line sent to idle subscribers, ignored by ``EventSource``.
+HEARTBEAT = b": keep-alive\n\n"
+
+
+def format_event(data=None, event=None, id=None, retry=None):
+    """
+    Serialize one Server-Sent Event.
+
+    :param data: Payload; str is sent as is (one ``data:`` line per line),
+                 anything else as JSON.
+    :param event (str): Event type, ``message`` on the client when omitted.
+    :param id: Event id, sent back by the client as ``Last-Event-ID``.
+    :param retry (int): Reconnection delay for the client, in milliseconds.
+
+    :rtype bytes
+    """
+    lines = []
+    if retry is not None:
+        lines.append("retry: {}".format(int(retry)))
+    if event is not None:
+        lines.append("event: {}".format(event))
+    if id is not None:
+        lines.append("id: {}".format(id))
+    if data is not None:
+        if not isinstance(data, str):
+            data = json.dumps(data)
+        lines.extend("data: " + line for line in data.split("\n"))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+class Subscription:
+    """
+    The queue of events of one subscriber, iterated as the pieces of a
+    streamed response.
+
+    Attributes:
+        hub (EventHub): The hub delivering the events.
+        topic (str): The topic subscribed to.
+        closed (bool): No more events will be queued.
+        last_push (float): ``time.monotonic()`` of the last event queued.
+    """
+
+    __slots__ = ("hub", "topic", "closed", "last_push", "_queue", "_cond", "_waiter")
+
+    def __init__(self, hub, topic, prelude=()):
+        """
+        :param hub (EventHub): The hub delivering the events.
+        :param topic (str): The topic subscribed to.
+        :param prelude (list): Frames yielded before any event, e.g. the
+                               ``retry`` field and missed events.
+        """
+        self.hub = hub
+        self.topic = topic
+        self.closed = False
+        self.last_push = time.monotonic()
+        self._queue = collections.deque(prelude)
+        self._cond = threading.Condition(threading.Lock())
+        self._waiter = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """
+        Wait for queued frames.
+
+        :rtype bytes: every frame queued so far, joined.
+        :raise StopIteration: Once the subscription is closed and drained.
+        """
+        with self._cond:
+            while not self._queue:
+                if self.closed:
+                    raise StopIteration
+                self._cond.wait()
+            frames = b"".join(self._queue)
+            self._queue.clear()
+        return frames
+
+    def when_ready(self, callback):
+        """
+        Arrange for ``callback()`` once a frame is queued or the subscription
+        is ended by the hub. The callback runs on the publishing thread and
+        must not block.
+
+        :rtype bool: True when :meth:`__next__` would not wait; the callback
+                     is then not kept.
+        """
+        with self._cond:
+            if self._queue or self.closed:
+                return True
+            self._waiter = callback
+        return False
+
+    def push(self, frame):
+        """
+        Queue a frame and wake the consumer.
+
+        :param frame (bytes): A formatted event.
+
+        :rtype bool: False if the subscription is closed, or has just been
+                     ended because its consumer is too far behind.
+        """
+        with self._cond:
+            if self.closed:
+                return False
+            if len(self._queue) >= MAX_QUEUED:
+                self.closed = True
+            else:
+                self._queue.append(frame)
+                self.last_push = time.monotonic()
+            waiter, self._waiter = self._waiter, None
+            self._cond.notify()
+        self._wake(waiter)
+        return not self.closed
+
+    def end(self):
+        """
+        End the stream from the producer side: the consumer gets what is
+        queued, then the end of the iteration.
+        """
+        with self._cond:
+            self.closed = True
+            waiter, self._waiter = self._waiter, None
+            self._cond.notify()
+        self._wake(waiter)
+        self.hub.unsubscribe(self)
+
+    def _wake(self, waiter):
+        if waiter is None:
+            return
+        try:
+            waiter()
+        except Exception as e:
+            # e.g. the event loop of the consumer is shutting down
+            log.debug("subscriber of {} not woken: {}", self.topic, e)
+
+    def close(self):
+        """
+        Unsubscribe, from the consumer side (the streamed response is done).
+        """
+        with self._cond:
+            self.closed = True
+            self._waiter = None
+            self._queue.clear()
+        self.hub.unsubscribe(self)
+
+    def __repr__(self):
+        return "<Subscription {} {} queued{}>".format(
+            self.topic, len(self._queue), ", closed" if self.closed else "")
+
+
+class EventHub:
+    """
+    Process-wide fan-out of events to the subscribers of a topic.
+
+    Attributes:
+        heartbeat (float): Seconds of silence before a heartbeat comment.
+    """
+
+    __attrs__ = [
+        "heartbeat",
+    ]
+
+    def __init__(self, heartbeat=HEARTBEAT_INTERVAL):
+        """
+        Initialize a new EventHub instance, without subscribers.
+
+        :param heartbeat (float): Seconds of silence before a heartbeat comment.
+        """
+        self.heartbeat = heartbeat
+        self._topics = {}
+        self._lock = threading.Lock()
+        self._ticker = None
+        # Counters, guarded by _lock.
+        self._published = 0
+        self._delivered = 0
+        self._ended = 0
+
+    def subscribe(self, topic, prelude=()):
+        """
+        Start receiving the events of a topic.
+
+        :param topic (str): The topic, e.g. a channel name.
+        :param prelude (list): Frames yielded before any event.
+
+        :rtype Subscription: the iterator to stream; closing it unsubscribes.
+        """
+        sub = Subscription(self, topic, prelude)
+        with self._lock:
+            self._topics.setdefault(topic, set()).add(sub)
+            if self._ticker is None:
+                self._ticker = threading.Thread(target=self._beat, name="event-heartbeat",
+                                                daemon=True)
+                self._ticker.start()
+        return sub
+
+    def unsubscribe(self, sub):
+        """
+        :param sub (Subscription): A subscription of this hub; ignored if gone.
+        """
+        with self._lock:
+            subs = self._topics.get(sub.topic)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._topics[sub.topic]
+
+    def publish(self, topic, data=None, event=None, id=None):
+        """
+        Send an event to the current subscribers of a topic.
+
+        :param topic (str): The topic.
+        :param data: Payload, see :func:`format_event`.
+        :param event (str): Event type.
+        :param id: Event id.
+
+        :rtype int: subscribers reached.
+        """
+        with self._lock:
+            subs = list(self._topics.get(topic, ()))
+            self._published += 1
+        if not subs:
+            return 0
+        frame = format_event(data, event, id)
+        reached = 0
+        for sub in subs:
+            if sub.push(frame):
+                reached += 1
+            else:
+                # Too slow: it reconnects and catches up with Last-Event-ID.
+                sub.end()
+        with self._lock:
+            self._delivered += reached
+            self._ended += len(subs) - reached
+        return reached
+
+    def subscribers(self, topic=None):
+        """
+        :param topic (str): A topic, or None for all of them.
+
+        :rtype int: number of subscriptions.
+        """
+        with self._lock:
+            if topic is not None:
+                return len(self._topics.get(topic, ()))
+            return sum(len(subs) for subs in self._topics.values())
+
+    def snapshot(self):
+        """
+        :rtype dict: topic and subscriber counts, published/delivered events
+                     and subscribers ended as too slow.
+        """
+        with self._lock:
+            return {
+                "topics": len(self._topics),
+                "subscribers": sum(len(subs) for subs in self._topics.values()),
+                "published": self._published,
+                "delivered": self._delivered,
+                "ended": self._ended,
+            }
+
+    def _beat(self):
+        while True:
+            time.sleep(self.heartbeat / 2)
+            idle_since = time.monotonic() - self.heartbeat
+            with self._lock:
+                subs = [sub for subs in self._topics.values() for sub in subs]
+            for sub in subs:
+                if sub.last_push <= idle_since and not sub.push(HEARTBEAT):
+                    sub.end()
@@ -0,0 +1,103 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.headers
+~~~~~~~~~~~~~~~~~
+
+This module provides the serialization of the response headers.
+
+Only headers meaningful in a response are written: the status line, ``Date``,
+``Content-Length`` and ``Cache-Control`` defaults, and the headers set on the
+response. The status line of every standard code is precomputed as bytes, and
+the ``Date`` line is formatted at most once per second and shared by every
+response sent within that second.
+
+Usage Example:
+--------------
+>>> build_header(200, "OK", {"Content-Type": "text/plain"}, 2)
+b'HTTP/1.1 200 OK\\r\\nDate: Sun, 18 Oct 2026 08:00:00 GMT\\r\\nContent-Length: 2\\r\\n...'
+"""
+
+import time
+from email.utils import formatdate
+from http import HTTPStatus
+
+#: Statuses sent without a body, hence without ``Content-Length``.
+NO_BODY_STATUSES = frozenset((204, 304))
+#: ``Cache-Control`` of the responses that set none: dynamic data must be
+#: revalidated.
+DEFAULT_CACHE_CONTROL = b"Cache-Control: no-cache\r\n"
+
+#: status code -> precomputed status line.
+STATUS_LINES = {
+    status.value: "HTTP/1.1 {} {}\r\n".format(status.value, status.phrase).encode("latin-1")
+    for status in HTTPStatus
+}
+
+_date_line = (0, b"")
+
+
+def status_line(status_code, reason=None):
+    """
+    The status line of a response.
+
+    :param status_code (int): The status code.
+    :param reason (str): Reason phrase; the standard one when None or equal.
+
+    :rtype bytes: the CRLF terminated line.
+    """
+    line = STATUS_LINES.get(status_code)
+    if line is not None and (reason is None or line[13:-2] == reason.encode("latin-1", "replace")):
+        return line
+    return "HTTP/1.1 {} {}\r\n".format(status_code, reason or "").encode("utf-8")
+
+
+def date_line():
+    """
+    The ``Date`` header line, formatted again once the second changed.
+
+    :rtype bytes: the CRLF terminated line.
+    """
+    global _date_line
+    now = int(time.time())
+    cached = _date_line
+    if cached[0] != now:
+        # A single tuple assignment: threads racing here format the same
+        # value, none can see a half-updated cache.
+        cached = _date_line = (now, "Date: {}\r\n".format(formatdate(now, usegmt=True)).encode("ascii"))
+    return cached[1]
+
+
+def build_header(status_code, reason, headers, content_length=None):
+    """
+    Serialize the header block of a response.
+
+    :param status_code (int): The status code.
+    :param reason (str): The reason phrase.
+    :param headers (dict): Headers set on the response; ``Content-Length``
+                           and ``Cache-Control`` there win over the defaults.
+    :param content_length (int): Length of the body, or None to leave it to
+                                 ``headers``.
+
+    :rtype bytes: status line, headers and the blank line ending them.
+    """
+    parts = [status_line(status_code, reason), date_line()]
+    if (content_length is not None and status_code not in NO_BODY_STATUSES
+            and "Content-Length" not in headers):
+        parts.append(b"Content-Length: %d\r\n" % content_length)
+    if "Cache-Control" not in headers:
+        parts.append(DEFAULT_CACHE_CONTROL)
+    if headers:
+        parts.append("".join("{}: {}\r\n".format(k, v) for k, v in headers.items()).encode("utf-8"))
+    parts.append(b"\r\n")
+    return b"".join(parts)
@@ -321,10 +321,124 @@ Request and Response objects to handle client-server communication.
 from .request import Request
 from .response import Response
 from .dictionary import CaseInsensitiveDict
+from .parser import HttpParser, ParseError
+from .pools import ObjectPool
+from .context import call_handler
+from .websocket import WebSocketRoute, HandshakeError, handshake, serve_websocket
+from .log import get_logger
+from .writer import (FileBody, ChunkedBody, StreamAborted, send_buffers, buffers_size,
+                     release)
+from .staticcache import STATIC_CACHE
+from .validators import make_etag, file_validators, not_modified
+from .ranges import (RangeNotSatisfiable, parse_range, if_range_matches, slice_body,
+                     content_range, multipart_body)
+from .compression import (MIN_SIZE as COMPRESS_MIN_SIZE, choose_encoding, compress,
+                          is_compressible, variant_etag)
+import asyncio
 import base64
+import collections.abc
+import inspect
 import json
 import mimetypes
+import os
 import socket
+import threading
+from http import HTTPStatus
+
+log = get_logger("HttpAdapter")
+
+#: Seconds an idle persistent connection is kept open between two requests.
+KEEPALIVE_TIMEOUT = 5.0
+#: Maximum number of requests served on one persistent connection.
+KEEPALIVE_MAX_REQUESTS = 100
+#: Pipelined responses are flushed once this many bytes are pending.
+PIPELINE_FLUSH_BYTES = 64 * 1024
+#: Seconds a client may pause while sending a request.
+READ_TIMEOUT = 1.0
+WRITE_TIMEOUT = 30.0
+#: Files at least this large are sent with ``sendfile`` instead of being read.
+SENDFILE_MIN_SIZE = 8 * 1024
+#: Largest handler body given a hash ``ETag`` on every response.
+ETAG_MAX_BODY = 1024 * 1024
+
+
+def status_reason(status_code):
+    """
+    Standard reason phrase of an HTTP status code.
+
+    :param status_code (int): The status code.
+
+    :rtype str: the phrase, ``OK`` for unknown codes.
+    """
+    try:
+        return HTTPStatus(status_code).phrase
+    except ValueError:
+        return "OK"
+
+
+def wants_keep_alive(version, headers):
+    """
+    Decide from the request whether the client asked for a persistent connection.
+
+    HTTP/1.1 connections are persistent unless ``Connection: close`` is sent;
+    HTTP/1.0 connections are closed unless ``Connection: keep-alive`` is sent.
+
+    :param version (str): Request HTTP version, e.g. ``HTTP/1.1``.
+    :param headers (dict): Request headers with lowercase keys.
+
+    :rtype bool: True if the connection may stay open after the response.
+    """
+    tokens = [t.strip().lower() for t in (headers.get('connection') or '').split(',')]
+    if 'close' in tokens:
+        return False
+    if version == 'HTTP/1.1':
+        return True
+    return 'keep-alive' in tokens
+
+
+class ConnectionStats:
+    """
+    Process-wide counters of connections and requests, used to report how
+    often persistent connections are reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.reused = 0
+
+    def opened(self):
+        """
+        Count a newly accepted connection.
+        """
+        with self._lock:
+            self.connections += 1
+
+    def served(self, reused):
+        """
+        Count a request.
+
+        :param reused (bool): The request arrived on an already used connection.
+        """
+        with self._lock:
+            self.requests += 1
+            if reused:
+                self.reused += 1
+
+    def snapshot(self):
+        """
+        :rtype dict: connection/request counters and reuse ratios.
+        """
+        with self._lock:
+            return {
+                "connections": self.connections,
+                "requests": self.requests,
+                "reused_requests": self.reused,
+                "reuse_ratio": round(self.reused / self.requests, 3) if self.requests else 0.0,
+                "requests_per_connection": round(self.requests / self.connections, 3) if self.connections else 0.0,
+            }
+
 
 class HttpAdapter:
     """
@@ -356,6 +470,28 @@ class HttpAdapter:
         "response",
     ]
 
+    #: Optional callable invoked once per parsed request, shared by every
+    #: adapter of the process (the pre-fork supervisor uses it to count
+    #: requests per worker).
+    request_counter = None
+
+    #: Idle time allowed between two requests of a persistent connection.
+    keepalive_timeout = KEEPALIVE_TIMEOUT
+    #: Requests served on a persistent connection before it is closed.
+    keepalive_max_requests = KEEPALIVE_MAX_REQUESTS
+    #: Process-wide connection reuse counters.
+    connection_stats = ConnectionStats()
+    #: Process-wide cache of the files served by handlers.
+    static_cache = STATIC_CACHE
+    #: Smallest handler body compressed on the fly; 0 disables it.
+    compress_min_size = COMPRESS_MIN_SIZE
+    #: Serve WebSocket upgrades and event streams on threads of their own
+    #: rather than on the thread of the connection: set by the ``pool``
+    #: engine, whose few workers would all end up waiting on such clients.
+    hand_over_long_lived = False
+    #: Process-wide free list of adapters, see :meth:`acquire`.
+    pool = None
+
     def __init__(self, ip, port, conn, connaddr, routes):
         """
         Initialize a new HttpAdapter instance.
@@ -381,6 +517,55 @@ class HttpAdapter:
         self.request = Request()
         #: Response
         self.response = Response()
+        #: Whether the connection stays open after the current response.
+        self.keep_alive = False
+        #: WebSocket route the connection switches to after the response.
+        self.upgrade = None
+
+    @classmethod
+    def acquire(cls, ip, port, conn, connaddr, routes):
+        """
+        Take an idle adapter from :attr:`pool`, or create one, for a new
+        connection; hand it back with :meth:`release`.
+
+        :param ip (str): IP address of the client.
+        :param port (int): Port number of the client.
+        :param conn (socket): Active socket connection.
+        :param connaddr (tuple): Address of the connected client.
+        :param routes (dict): Mapping of route paths to handler functions.
+
+        :rtype HttpAdapter
+        """
+        daemon = cls.pool.acquire()
+        daemon.ip, daemon.port = ip, port
+        daemon.conn, daemon.connaddr, daemon.routes = conn, connaddr, routes
+        return daemon
+
+    def release(self):
+        """
+        Give the adapter back to :attr:`pool` once its connection is done.
+        Neither the adapter nor its request and response may be used
+        afterwards.
+        """
+        HttpAdapter.pool.release(self)
+
+    def recycle(self):
+        """
+        Make the adapter ready for the next request of the connection: the
+        :class:`Request <Request>` and :class:`Response <Response>` are reset
+        instead of allocated again.
+        """
+        self.request.reset()
+        self.response.reset()
+        self.keep_alive = False
+        self.upgrade = None
+
+    def reset(self):
+        """
+        Forget the connection, before the adapter goes back to :attr:`pool`.
+        """
+        self.recycle()
+        self.conn = self.connaddr = self.routes = None
 
     def handle_client(self, conn, addr, routes):
         """
@@ -388,285 +573,427 @@ class HttpAdapter:
 
         This method reads the request from the socket, prepares the request object,
         invokes the appropriate route handler if available, builds the response,
-        and sends it back to the client.
+        and sends it back to the client. Persistent connections are served in a
+        loop until the client closes, asks to close, stays idle longer than
+        :attr:`keepalive_timeout` or reaches :attr:`keepalive_max_requests`.
+        A connection upgraded to WebSocket is then served by this thread until
+        it closes, or by a thread of its own if :attr:`hand_over_long_lived`
+        is set, like an event stream.
 
         :param conn (socket): The client socket connection.
         :param addr (tuple): The client's address.
         :param routes (dict): The route mapping for dispatching requests.
+
+        :rtype bool: True if the connection was handed over to another thread,
+                     which gives the adapter back; the caller releases it otherwise.
         """
 
         # Connection handler.
         self.conn = conn        
         # Connection address.
         self.connaddr = addr
-        # Request handler
-        req = self.request
-        # Response handler
-        resp = self.response
 
-        # Read request header and body robustly (respect Content-Length)
-        data = b""
-        # First, read until headers end
+        stats = HttpAdapter.connection_stats
+        stats.opened()
+
+        full = []
+        parser = HttpParser()
+        served = 0
+        # Buffers of the pipelined responses, written in order in one send.
+        pending = []
+        pending_bytes = 0
+        handed_over = False
         try:
-            conn.settimeout(1.0)
-            while b"\r\n\r\n" not in data:
-                chunk = conn.recv(4096)
-                if not chunk:
+            while True:
+                try:
+                    parsed = parser.next_request()
+                    if parsed is None:
+                        # Nothing complete is buffered: flush before blocking on the socket.
+                        if pending and not self.send_pending(conn, pending):
+                            pending = []
+                            break
+                        pending, pending_bytes = [], 0
+                        idle_timeout = self.keepalive_timeout if served else None
+                        parsed = self.read_request(conn, parser, idle_timeout)
+                except ParseError as e:
+                    log.warning("rejecting request from {}: {}", addr, e)
+                    full = [e.response()]
+                    pending.extend(full)
+                    break
+                if parsed is None:
                     break
-                data += chunk
-        except socket.timeout:
-            # Proceed with whatever we have
-            pass
 
-        header_bytes = data
-        body_bytes = b""
-        if b"\r\n\r\n" in data:
-            header_bytes, body_bytes = data.split(b"\r\n\r\n", 1)
+                if served:
+                    self.recycle()
+                served += 1
+                stats.served(reused=served > 1)
+
+                try:
+                    full = self.process_request(parsed, routes,
+                                                can_keep_alive=served < self.keepalive_max_requests)
+                except Exception as e:
+                    # e.g. a handler returning the path of a missing file
+                    log.error("error processing request from {}: {}", addr, e)
+                    self.keep_alive = False
+                    self.hook_failed(e)
+                    full = self.build_reply(self.request, None)
+                pending.extend(full)
+                pending_bytes += buffers_size(full)
+                if not self.keep_alive:
+                    break
+                # A streamed body goes out as it is produced.
+                if pending_bytes >= PIPELINE_FLUSH_BYTES or isinstance(full[-1], ChunkedBody):
+                    if not self.send_pending(conn, pending):
+                        pending = []
+                        break
+                    pending, pending_bytes = [], 0
+
+            if (self.hand_over_long_lived and pending and isinstance(pending[-1], ChunkedBody)
+                    and pending[-1].waits_for_events()):
+                self.start_send(conn, pending)
+                handed_over = True
+            elif pending and not self.send_pending(conn, pending):
+                self.upgrade = None
+            if self.upgrade is not None:
+                if self.hand_over_long_lived:
+                    self.start_upgrade(conn, parser.detach())
+                    handed_over = True
+                else:
+                    self.serve_upgrade(conn, parser.detach())
+        finally:
+            parser.close()
+            if not handed_over:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        return handed_over
+
+    def send_pending(self, conn, pending):
+        """
+        Write the buffered responses, in request order, with vectored sends.
+
+        :param conn (socket): The client socket connection.
+        :param pending (list): Buffers of complete HTTP responses.
 
-        # Parse headers to find Content-Length
+        :rtype bool: False if the client went away.
+        """
+        # A streamed body may wait on a slow reader for longer than a read.
+        conn.settimeout(WRITE_TIMEOUT)
         try:
-            header_text = header_bytes.decode('utf-8', errors='ignore')
-        except Exception:
-            header_text = ''
+            send_buffers(conn, pending)
+        except OSError as e:
+            if isinstance(e, StreamAborted):
+                log.error("{}", e)
+            release(pending)
+            return False
+        return True
+
+    def start_send(self, conn, pending):
+        """
+        :meth:`send_pending` on a thread of its own, then close the
+        connection: for an event stream, which lasts as long as its client.
+        The adapter goes back to :attr:`pool` once it is sent.
 
-        # Build a simple headers dict
-        headers = {}
-        header_lines = header_text.split('\r\n')
-        for line in header_lines[1:]:
-            if ': ' in line:
-                k, v = line.split(': ', 1)
-                headers[k.lower()] = v
+        :param conn (socket): The client socket connection.
+        :param pending (list): Buffers of complete HTTP responses, the last
+                               one closing the connection.
+        """
+        def run():
+            try:
+                self.send_pending(conn, pending)
+            finally:
+                try:
+                    conn.close()
+                except OSError:
+                    pass
+                self.release()
+        threading.Thread(target=run, name="event-stream", daemon=True).start()
+
+    def process_request(self, parsed, routes, can_keep_alive=False):
+        """
+        Prepare, route and answer one request without touching the socket.
+
+        :param parsed (ParsedRequest): Request cut out by the :class:`HttpParser`.
+        :param routes (dict): The route mapping for dispatching requests.
+        :param can_keep_alive (bool): The connection limits allow another request
+                                      after this one.
+
+        :rtype list: buffers (header, body) of the complete HTTP response;
+                     :attr:`keep_alive` tells whether the connection may stay open.
+        """
+        req = self.prepare_request(parsed, routes)
+        if req is None:
+            return self.build_bad_request()
+        self.decide_keep_alive(req, can_keep_alive)
+
+        hook = self.route_request(req, routes)
+        if isinstance(hook, WebSocketRoute):
+            return self.upgrade_websocket(req, hook)
+        app_response_data = None
+        if hook is not None:
+            try:
+                app_response_data = self.invoke_hook(hook, req)
+                if inspect.isawaitable(app_response_data):
+                    # async def handler served by a threaded engine
+                    app_response_data = asyncio.run(app_response_data)
+            except Exception as e:
+                self.hook_failed(e)
+        return self.build_reply(req, app_response_data)
 
-        content_length = int(headers.get('content-length', '0')) if headers.get('content-length') else 0
+    def read_request(self, conn, parser, idle_timeout=None):
+        """
+        Receive from a blocking socket until the parser holds a complete request.
+
+        :param conn (socket): The client socket connection.
+        :param parser (HttpParser): Parser of the connection, possibly holding
+                                    bytes received after the previous request.
+        :param idle_timeout (float): Seconds to wait for the first byte of a
+                                     request on a persistent connection.
 
-        # If we haven't read full body yet, read remaining bytes
-        remaining = content_length - len(body_bytes)
+        :rtype ParsedRequest: the request, or None if the client closed or stayed idle.
+        :raise ParseError: If the request is malformed, too large or stalls.
+        """
         try:
-            while remaining > 0:
-                chunk = conn.recv(min(4096, remaining))
-                if not chunk:
-                    break
-                body_bytes += chunk
-                remaining -= len(chunk)
+            conn.settimeout(idle_timeout if idle_timeout and not parser.pending() else READ_TIMEOUT)
+            while True:
+                parsed = parser.next_request()
+                if parsed is not None:
+                    return parsed
+                interim = parser.interim()
+                if interim is not None:
+                    # Expect: 100-continue, the client waits before sending the body.
+                    conn.sendall(interim)
+                if not parser.recv_into(conn):
+                    return None
+                conn.settimeout(READ_TIMEOUT)
         except socket.timeout:
+            if parser.pending():
+                raise ParseError(408)
+        except OSError:
             pass
+        return None
 
-        # Prepare msg as decoded header + separator + body string
-        try:
-            body_str = body_bytes.decode('utf-8', errors='ignore') if body_bytes else None
-        except Exception:
-            body_str = None
+    def prepare_request(self, parsed, routes):
+        """
+        Prepare the :class:`Request <Request>` from a parsed request.
+
+        The method does no socket I/O, so every serving engine (threads, pool,
+        asyncio, reactor) shares the same request preparation.
+
+        :param parsed (ParsedRequest): Request cut out by the :class:`HttpParser`.
+        :param routes (dict): The route mapping for dispatching requests.
 
-        msg = header_text + '\r\n\r\n' + (body_str or '')
-        req.prepare(msg, routes)
+        :rtype Request: the prepared request, or None if it is malformed.
+        """
+        req = self.request
+        if HttpAdapter.request_counter is not None:
+            HttpAdapter.request_counter()
+
+        req.prepare_parsed(parsed.method, parsed.target, parsed.version,
+                           parsed.headers, routes)
 
         # Check if request preparation failed
         if req.path is None or req.method is None:
-            print(f"[HttpAdapter] Request preparation failed - invalid request")
-            resp.status_code = 400
-            resp.reason = "Bad Request"
-            resp._content = b"<h1>400 Bad Request</h1>"
-            try:
-                header_bytes = (f"HTTP/1.1 400 Bad Request\r\n"
-                               f"Content-Type: text/html\r\n"
-                               f"Content-Length: {len(resp._content)}\r\n\r\n").encode('utf-8')
-                conn.sendall(header_bytes + resp._content)
-            except Exception:
-                pass
-            try:
-                conn.close()
-            except Exception:
-                pass
+            log.warning("Request preparation failed - invalid request")
             return None
 
-        # Ensure request body and headers available to hooks
-        req.body = body_str
-        req.headers = headers  # keep lowercase keys
+        # Bytes, or the reader of a spooled body; decoded on first access.
+        req.raw_body = parsed.body
+        return req
+
+    def decide_keep_alive(self, req, can_keep_alive):
+        """
+        Set :attr:`keep_alive` from the request ``Connection`` header, its HTTP
+        version and the per-connection limits.
+
+        :param req (Request): The prepared request.
+        :param can_keep_alive (bool): The connection limits allow another request.
+        """
+        self.keep_alive = bool(can_keep_alive) and wants_keep_alive(req.version, req.headers)
 
-        # Normalize path and method
-        path = getattr(req, "url", None) or getattr(req, "path", None) or "/"
+    def build_bad_request(self):
+        """
+        Build the ``400 Bad Request`` reply for a request that could not be parsed.
+        The connection is always closed afterwards.
+
+        :rtype list: buffers (header, body) of the complete HTTP response.
+        """
+        resp = self.response
+        self.keep_alive = False
+        resp.status_code = 400
+        resp.reason = "Bad Request"
+        resp._content = b"<h1>400 Bad Request</h1>"
+        return [(f"HTTP/1.1 400 Bad Request\r\n"
+                 f"Content-Type: text/html\r\n"
+                 f"Content-Length: {len(resp._content)}\r\n"
+                 f"Connection: close\r\n\r\n").encode('utf-8'), resp._content]
+
+    def route_request(self, req, routes):
+        """
+        Find the route handler for a prepared request.
+
+        When no handler matches, the response status is set to 405, with an
+        ``Allow`` header, if the path exists for other methods, or 404 otherwise.
+
+        :param req (Request): The prepared request.
+        :param routes (RouteTable): The route table, compiled when the engine
+                                    started (see :func:`compile_routes`).
+
+        :rtype callable: the handler, or None.
+        """
+        resp = self.response
+
+        # Normalize path and method; the query string never takes part in routing.
+        path = (req.path or "/").split("?", 1)[0]
         if not path.startswith("/"):
             path = "/" + path
-        # prefer already-parsed method else derive from headers/first line
-        method = (getattr(req, "method", None) or headers.get("method") or "GET").upper()
+        method = (req.method or "GET").upper()
+
+        log.debug("Processing request: {} {}", method, path, sample=True)
+
+        handler, allowed, req.params = routes.resolve(method, path)
+        if handler is not None:
+            req.hook = handler
+            log.debug("route handler found for {} -> {}", path,
+                      getattr(handler, '__name__', handler), sample=True)
+            return handler
+
+        req.hook = None
+        resp.headers["Content-Type"] = "text/html"
+        if allowed is not None:
+            # A handler for the path exists but for a different method
+            resp.status_code = 405
+            resp.reason = "Method Not Allowed"
+            resp.headers["Allow"] = allowed
+            resp._content = b"<h1>405 Method Not Allowed</h1>"
+            log.debug("path {} exists but method {} not allowed -> 405", path, method)
+        else:
+            log.debug("no handler found for ({}, {})", method, path)
+            resp.status_code = 404
+            resp.reason = "Not Found"
+            resp._content = b"<h1>404 Not Found</h1>"
+        return None
 
-        print(f"[HttpAdapter] Processing request: {method} {path}")
+    def upgrade_websocket(self, req, route):
+        """
+        Answer a request to a WebSocket route: ``101 Switching Protocols``
+        for a valid upgrade, after which :attr:`upgrade` tells the engine to
+        hand the socket to :meth:`serve_upgrade`, or an error closing the
+        connection (see :func:`handshake`).
 
-        # Try to find the best matching handler in routes
-        handler = None
-        method_allowed_for_path = False  # True if path exists but method differs
+        :param req (Request): The prepared request.
+        :param route (WebSocketRoute): The route found for it.
 
+        :rtype list: buffers of the complete HTTP response.
+        """
+        self.keep_alive = False
         try:
-            # Debug: show request and routes shape
+            header = handshake(req, route.origins)
+        except HandshakeError as e:
+            log.debug("refusing WebSocket upgrade of {}: {}", req.path, e)
+            return [e.response()]
+        self.upgrade = route
+        return [header]
+
+    def serve_upgrade(self, sock, buffered=b""):
+        """
+        Run the WebSocket handler of :attr:`upgrade` over the connection,
+        its ``101`` sent, until it is closed. Blocks the calling thread.
+
+        :param sock (socket): The client socket.
+        :param buffered (bytes): Bytes received after the upgrade request.
+        """
+        route, self.upgrade = self.upgrade, None
+        serve_websocket(sock, route, self.request, buffered)
+
+    def start_upgrade(self, sock, buffered=b""):
+        """
+        :meth:`serve_upgrade` on a thread of its own, for the engines whose
+        threads must not block; the adapter goes back to :attr:`pool` once
+        the connection is closed.
+
+        :param sock (socket): The client socket.
+        :param buffered (bytes): Bytes received after the upgrade request.
+        """
+        def run():
             try:
-                if isinstance(routes, dict):
-                    print(f"[HttpAdapter] trying to match route for ({method}, {path}) against routes keys: {list(routes.keys())}")
-                else:
-                    print(f"[HttpAdapter] trying to match route for ({method}, {path}) against routes type: {type(routes)}")
-            except Exception:
-                pass
+                self.serve_upgrade(sock, buffered)
+            finally:
+                self.release()
+        threading.Thread(target=run, name="websocket", daemon=True).start()
 
-            if isinstance(routes, dict):
-                # 1) direct (METHOD, PATH)
-                handler = routes.get((method, path))
-                if handler:
-                    print(f"[HttpAdapter] matched by (METHOD, PATH)")
-                else:
-                    # 2) Path-only: check path key (legacy)
-                    if path in routes:
-                        potential = routes.get(path)
-                        if callable(potential):
-                            handler = potential
-                            print(f"[HttpAdapter] matched by PATH-only key")
-                    # 3) check for any other methods registered for same path
-                    if not handler:
-                        # scan for keys that match the path but with different method
-                        for k in routes.keys():
-                            try:
-                                if isinstance(k, (list, tuple)) and len(k) >= 2:
-                                    if k[1] == path and k[0].upper() != method:
-                                        method_allowed_for_path = True
-                                        break
-                                elif isinstance(k, str):
-                                    # string key like "GET /path" or "POST:/path"
-                                    upk = k.strip().upper()
-                                    if upk.endswith(" " + path.upper()) or upk.endswith(":" + path):
-                                        # extract method part before space/colon
-                                        km = upk.split(" ", 1)[0].split(":")[0]
-                                        if km != method:
-                                            method_allowed_for_path = True
-                                            break
-                            except Exception:
-                                continue
-
-                # 4) also accept reversed tuple (PATH, METHOD) stored cases
-                if not handler and (path, method) in routes:
-                    handler = routes.get((path, method))
-                    if handler:
-                        print(f"[HttpAdapter] matched by (PATH, METHOD) tuple")
-
-            # 5) If routes is list/tuple of pairs
-            if not handler and isinstance(routes, (list, tuple)):
-                for item in routes:
-                    try:
-                        if isinstance(item, (list, tuple)) and len(item) >= 2:
-                            key = item[0]
-                            val = item[1]
-                            if key == (method, path) or key == path:
-                                handler = val
-                                print(f"[HttpAdapter] matched in list/tuple routes by key {key}")
-                                break
-                            # detect path-only entries with different methods
-                            if key == path:
-                                # if stored as tuple (method,path) elsewhere, check other entries
-                                pass
-                    except Exception:
-                        continue
-
-            # 6) Map index variants (allow / -> /index.html)
-            if not handler:
-                variants = [path]
-                if path == "/":
-                    variants += ["/index.html", "/index.htm"]
-                else:
-                    if path.endswith("index.html") or path.endswith("index.htm"):
-                        variants += ["/"]
-                for v in variants:
-                    if isinstance(routes, dict) and (method, v) in routes:
-                        handler = routes[(method, v)]
-                        print(f"[HttpAdapter] matched by variant (METHOD, PATH) {(method, v)}")
-                        break
-                    if isinstance(routes, dict) and v in routes and callable(routes[v]):
-                        handler = routes[v]
-                        print(f"[HttpAdapter] matched by variant PATH {v}")
-                        break
+    def invoke_hook(self, hook, req):
+        """
+        Call a route handler with a :class:`RequestContext` or the WeApRous
+        ``(headers, body)`` signature, whichever it declares (see
+        :mod:`daemon.context`), plus the parameters captured by its route path
+        as keyword arguments.
 
-            # Assign handler if found
-            if handler and callable(handler):
-                req.hook = handler
-                print(f"[HttpAdapter] fallback: route handler found for {path} -> {getattr(handler,'__name__', handler)}")
-            else:
-                # If a handler for the path exists but for a different method, return 405
-                if method_allowed_for_path:
-                    resp.status_code = 405
-                    resp.reason = "Method Not Allowed"
-                    resp._content = b"<h1>405 Method Not Allowed</h1>"
-                    print(f"[HttpAdapter] path {path} exists but method {method} not allowed -> 405")
-                else:
-                    # No handler found for path at all
-                    print(f"[HttpAdapter] fallback: no handler found for ({method}, {path})")
-                    # leave req.hook as None so rest of code returns 404 later
-        except Exception as e:
-            print(f"[HttpAdapter] route-finder exception: {e}")
-        # --- END REPLACEMENT ---
+        For an ``async def`` handler the returned coroutine is handed back to
+        the caller, which is expected to await it.
 
+        :param hook (callable): The route handler.
+        :param req (Request): The prepared request.
 
-        # populate body on the request object so app hooks receive it
-        req.body = body_str
-        req.headers = headers  # ensure headers available
+        :rtype: the handler result (dict, bytes, str, None or a coroutine).
+        """
+        log.debug("hook in route-path METHOD {} PATH {}", getattr(hook, "_route_methods", None),
+                  getattr(hook, "_route_path", None), sample=True)
 
-        # If a previous step set a non-200 status (e.g., 405), send it now
-        if getattr(resp, "status_code", None) == 405:
-            # Build and send the 405 response immediately
-            try:
-                header_bytes = resp.build_response_header(req)
-            except Exception:
-                status_line = f"HTTP/1.1 {getattr(resp, 'status_code', 405)} {getattr(resp, 'reason', 'Method Not Allowed')}\r\n"
-                ct = resp.headers.get("Content-Type", "text/plain")
-                clen = len(getattr(resp, "_content", b"") or b"")
-                header_bytes = (status_line + f"Content-Type: {ct}\r\nContent-Length: {clen}\r\n\r\n").encode("utf-8")
-            body_bytes = getattr(resp, "_content", b"") or b""
-            full = header_bytes + (body_bytes if isinstance(body_bytes, (bytes, bytearray)) else str(body_bytes).encode("utf-8"))
-            try:
-                conn.sendall(full)
-            except Exception:
-                pass
-            try:
-                conn.close()
-            except Exception:
-                pass
-            return full
+        # Ensure the full path with query string is available in headers
+        if req.path:
+            req.headers['path'] = req.path
 
-        # Call the route hook only if it's callable. Handle exceptions from the hook and missing handlers.
-        app_response_data = None
-        hook = getattr(req, "hook", None)
+        return call_handler(hook, req)
 
-        if callable(hook):
-            # Debug information (optional)
-            try:
-                route_path = getattr(hook, "_route_path", None)
-                route_methods = getattr(hook, "_route_methods", None)
-                print(f"[HttpAdapter] hook in route-path METHOD {route_methods} PATH {route_path}")
-            except Exception:
-                pass
+    def hook_failed(self, error):
+        """
+        Turn an exception raised by a route handler into a ``500`` response.
 
-            # Ensure the full path with query string is available in headers
-            if hasattr(req, 'path') and req.path:
-                req.headers['path'] = req.path
-                print(f"[HttpAdapter] Added path to headers: {req.path}")
+        :param error (Exception): The exception raised by the handler.
+        """
+        log.error("Exception in route hook: {}", error)
+        resp = self.response
+        resp.status_code = 500
+        resp.reason = "Internal Server Error"
+        resp.headers["Content-Type"] = "text/html"
+        resp._content = (f"<h1>500 Internal Server Error</h1><pre>{error}</pre>").encode("utf-8")
 
-            try:
-                app_response_data = hook(headers=req.headers, body=req.body)
-            except Exception as e:
-                # If the handler itself crashed, return 500
-                print(f"[HttpAdapter] Exception in route hook: {e}")
-                resp.status_code = 500
-                resp.reason = "Internal Server Error"
-                resp._content = (f"<h1>500 Internal Server Error</h1><pre>{e}</pre>").encode("utf-8")
-        else:
-            # No callable hook found → 404 Not Found (leave resp._content set by earlier code if any)
-            print(f"[HttpAdapter] No callable route hook for request path {getattr(req, 'url', getattr(req, 'path', '<unknown>'))}")
-            resp.status_code = 404
-            resp.reason = "Not Found"
-            resp._content = b"<h1>404 Not Found</h1>"
+    def build_reply(self, req, app_response_data):
+        """
+        Build the HTTP response buffers from a handler result.
+
+        Supports dict (JSON or explicit ``_status``/``_content``/``_mime``,
+        where ``_content`` may be a :class:`FileBody` or an iterator, plus
+        extra ``_headers``), bytes, str (file path
+        or plain text), iterators such as generators (streamed, see
+        :meth:`start_stream`) and None. Error statuses set
+        while routing (404, 405) or by :meth:`hook_failed` (500) are kept.
+
+        :param req (Request): The prepared request.
+        :param app_response_data: The handler result.
+
+        :rtype list: buffers of the complete HTTP response: the serialized
+                     header and the body, which is not copied.
+        """
+        resp = self.response
 
         if isinstance(app_response_data, dict):
             # If the app returned an explicit content blob (binary or bytes)
             if "_content" in app_response_data:
                 resp._content = app_response_data["_content"]
+                if isinstance(resp._content, FileBody) and resp._content.whole:
+                    resp._content, headers = self.load_file(
+                        resp._content.path, accept_encoding=req.headers.get("accept-encoding"))
+                    # The handler's _mime wins over the guessed content type.
+                    resp.headers.update((k, v) for k, v in headers.items()
+                                        if k != "Content-Type")
                 resp.headers["Content-Type"] = app_response_data.get("_mime", "application/octet-stream")
                 resp.status_code = int(app_response_data.get("_status", 200))
-                resp.reason = "OK"
+                resp.reason = status_reason(resp.status_code)
+                if isinstance(resp._content, collections.abc.Iterator):
+                    self.start_stream(req, resp._content)
             else:
                 # Otherwise the dict is JSON-serializable; return JSON
                 content = json.dumps(app_response_data).encode("utf-8")
@@ -675,6 +1002,9 @@ class HttpAdapter:
                 resp.status_code = 200
                 resp.reason = "OK"
 
+            # Extra response headers, e.g. Cache-Control
+            resp.headers.update(app_response_data.get("_headers") or {})
+
             # Support both key names "_set_cookie" and "set_cookie"
             cookie_val = None
             try:
@@ -695,21 +1025,47 @@ class HttpAdapter:
         elif isinstance(app_response_data, str):
             if "." in app_response_data and not app_response_data.strip().startswith("<"):
                 mime = mimetypes.guess_type(app_response_data)[0] or "text/plain"
-                with open(app_response_data, "rb") as f:
-                    resp._content = f.read()
-                resp.headers["Content-Type"] = mime
+                resp._content, headers = self.load_file(
+                    app_response_data, mime, req.headers.get("accept-encoding"))
+                resp.headers.update(headers)
             else:
                 resp._content = app_response_data.encode()
                 resp.headers["Content-Type"] = "text/plain"
             resp.status_code = 200
             resp.reason = "OK"
 
-        else:
+        elif isinstance(app_response_data, collections.abc.Iterator):
+            resp.headers["Content-Type"] = "application/octet-stream"
+            resp.status_code = 200
+            resp.reason = "OK"
+            self.start_stream(req, app_response_data)
+
+        elif resp.status_code is None:
             resp._content = b""
             resp.status_code = 200
             resp.reason = "OK"
 
-        # Build and send HTTP response bytes from prepared resp and req.
+        # Content-Length must count encoded bytes for persistent connections
+        body_bytes = getattr(resp, '_content', b'') or b''
+        if not isinstance(body_bytes, (bytes, bytearray, FileBody, ChunkedBody)):
+            body_bytes = str(body_bytes).encode('utf-8')
+        resp._content = body_bytes
+        encoding = self.negotiate_encoding(req, resp)
+        self.check_conditional(req, resp, encoding)
+        if encoding is not None and resp.status_code == 200:
+            resp._content = compress(resp._content, encoding)
+            resp.headers["Content-Encoding"] = encoding
+        self.apply_range(req, resp)
+        body_bytes = resp._content
+
+        if self.keep_alive:
+            resp.headers["Connection"] = "keep-alive"
+            resp.headers["Keep-Alive"] = "timeout={}, max={}".format(
+                int(self.keepalive_timeout), self.keepalive_max_requests)
+        else:
+            resp.headers["Connection"] = "close"
+
+        # Build HTTP response bytes from prepared resp and req.
         # The Response.build_response method is tuned for static file serving
         # and may return 404 for app routes (non-file paths). Instead, construct
         # headers from resp and send resp._content directly.
@@ -719,14 +1075,179 @@ class HttpAdapter:
             # Fallback: build a minimal header
             status_line = f"HTTP/1.1 {getattr(resp, 'status_code', 200)} {getattr(resp, 'reason', 'OK')}\r\n"
             ct = resp.headers.get('Content-Type', 'application/json')
-            clen = len(getattr(resp, '_content', b''))
-            header_bytes = (status_line + f"Content-Type: {ct}\r\nContent-Length: {clen}\r\n\r\n").encode('utf-8')
+            clen = len(body_bytes)
+            conn_hdr = resp.headers["Connection"]
+            header_bytes = (status_line + f"Content-Type: {ct}\r\nContent-Length: {clen}\r\n"
+                            f"Connection: {conn_hdr}\r\n\r\n").encode('utf-8')
+
+        if isinstance(body_bytes, list):
+            # multipart/byteranges: part headers and ranges of the body
+            return [header_bytes] + body_bytes
+        if isinstance(body_bytes, ChunkedBody):
+            # The primed first frame leaves with the header.
+            head, body_bytes.head = body_bytes.head, b""
+            if body_bytes.done:
+                body_bytes.close()
+                return [header_bytes, head]
+            return [header_bytes, head, body_bytes]
+        return [header_bytes, body_bytes]
+
+    def start_stream(self, req, chunks):
+        """
+        Make a handler iterator the streamed body of the response.
 
-        body_bytes = getattr(resp, '_content', b'') or b''
-        full = header_bytes + (body_bytes if isinstance(body_bytes, (bytes, bytearray)) else str(body_bytes).encode('utf-8'))
-        conn.sendall(full)
-        conn.close()
-        return full
+        The body is sent with ``Transfer-Encoding: chunked`` (to HTTP/1.0
+        clients as is, closing the connection), without compression nor
+        validators. Its first piece is produced here, so that a generator
+        failing before it still gets a ``500``; the following ones are pulled
+        as the client reads. A generator reading ``ctx`` keeps the request
+        valid until it is exhausted.
+
+        :param req (Request): The prepared request.
+        :param chunks (iterator): The pieces of the body, bytes or str.
+        """
+        resp = self.response
+        body = ChunkedBody(chunks, framed=req.version == "HTTP/1.1")
+        try:
+            body.prime()
+        except StreamAborted as e:
+            body.close()
+            self.hook_failed(e.__cause__)
+            return
+        resp._content = body
+        if body.framed:
+            resp.headers["Transfer-Encoding"] = "chunked"
+        else:
+            self.keep_alive = False
+        if self.hand_over_long_lived and body.waits_for_events():
+            # Sent from a thread of its own (see handle_client), which does
+            # not read the next request.
+            self.keep_alive = False
+
+    def load_file(self, path, mime=None, accept_encoding=None):
+        """
+        Body and headers of a file-backed response.
+
+        Files are served from :attr:`static_cache` when they fit in it, in the
+        precompressed variant the client accepts if any. The others become a
+        :class:`FileBody` sent by the kernel with ``sendfile``, or are read
+        when small enough to leave with their header in a single write.
+
+        :param path (str): Path of the file.
+        :param mime (str): Content type, guessed from the path when None.
+        :param accept_encoding (str): The request ``Accept-Encoding`` header.
+
+        :rtype tuple: (bytes|FileBody, headers dict).
+        :raise OSError: If the file cannot be read.
+        """
+        entry = self.static_cache.get(path, mime)
+        if entry is not None:
+            return entry.select(accept_encoding)
+        stat = os.stat(path)
+        body = FileBody(path, 0, stat.st_size)
+        if len(body) < SENDFILE_MIN_SIZE:
+            body = body.read()
+        headers = {"Content-Type": mime or mimetypes.guess_type(path)[0]
+                   or "application/octet-stream"}
+        headers.update(file_validators(stat))
+        return body, headers
+
+    def negotiate_encoding(self, req, resp):
+        """
+        Pick the content coding of a handler body compressed on the fly.
+
+        Only compressible bodies of at least :attr:`compress_min_size` bytes
+        qualify; they get ``Vary: Accept-Encoding`` whatever the client
+        accepts. Files (which carry ``Last-Modified``) are only sent in the
+        variants precompressed by the static cache.
+
+        :param req (Request): The prepared request.
+        :param resp (Response): The response, body already set.
+
+        :rtype str: the coding to apply, or None.
+        """
+        body = resp._content
+        if (not self.compress_min_size or isinstance(body, (FileBody, ChunkedBody))
+                or len(body) < self.compress_min_size
+                or "Content-Encoding" in resp.headers or "Last-Modified" in resp.headers
+                or not is_compressible(resp.headers.get("Content-Type"))):
+            return None
+        resp.headers["Vary"] = "Accept-Encoding"
+        return choose_encoding(req.headers.get("accept-encoding"))
+
+    def check_conditional(self, req, resp, encoding=None):
+        """
+        Add the validators of a successful ``GET`` response and turn it into a
+        bodyless ``304 Not Modified`` when the client's copy is still current.
+
+        Files carry the ``ETag`` and ``Last-Modified`` set by :meth:`load_file`;
+        other bodies get the hash of their bytes as ``ETag``, tagged with the
+        coding they are about to be compressed with. Streamed bodies are left
+        alone.
+
+        :param req (Request): The prepared request.
+        :param resp (Response): The response, body already set.
+        :param encoding (str): Content coding chosen by :meth:`negotiate_encoding`.
+        """
+        if (resp.status_code != 200 or req.method not in ("GET", "HEAD")
+                or isinstance(resp._content, ChunkedBody)):
+            return
+        etag = resp.headers.get("ETag")
+        body = resp._content
+        if etag is None and not isinstance(body, FileBody) and len(body) <= ETAG_MAX_BODY:
+            etag = resp.headers["ETag"] = variant_etag(make_etag(body), encoding)
+        if not_modified(req.headers, etag, resp.headers.get("Last-Modified")):
+            resp.status_code = 304
+            resp.reason = "Not Modified"
+            resp._content = b""
+
+    def apply_range(self, req, resp):
+        """
+        Answer the ``Range`` header of a file-backed ``GET``.
+
+        Files (which carry ``Last-Modified``) advertise ``Accept-Ranges``. One
+        satisfiable range becomes a ``206 Partial Content`` with a slice of
+        the body, several a ``multipart/byteranges`` body, none a ``416``. The
+        ranges apply to the representation selected, compressed or not, and
+        are ignored when ``If-Range`` names another version of the file.
+
+        :param req (Request): The prepared request.
+        :param resp (Response): The response, body and validators already set.
+        """
+        if resp.status_code != 200 or "Last-Modified" not in resp.headers:
+            return
+        resp.headers["Accept-Ranges"] = "bytes"
+        header = req.headers.get("range")
+        if header is None or req.method != "GET":
+            return
+        if_range = req.headers.get("if-range")
+        if if_range is not None and not if_range_matches(
+                if_range, resp.headers.get("ETag"), resp.headers["Last-Modified"]):
+            return
+
+        body = resp._content
+        size = len(body)
+        try:
+            ranges = parse_range(header, size)
+        except RangeNotSatisfiable:
+            resp.status_code = 416
+            resp.reason = status_reason(416)
+            resp.headers["Content-Range"] = "bytes */{}".format(size)
+            resp._content = b""
+            return
+        if ranges is None:
+            return
+
+        resp.status_code = 206
+        resp.reason = status_reason(206)
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            resp.headers["Content-Range"] = content_range(start, end, size)
+            resp._content = slice_body(body, start, end)
+            return
+        mime, parts = multipart_body(body, ranges, size, resp.headers["Content-Type"])
+        resp.headers["Content-Type"] = mime
+        resp._content = parts
 
     def extract_cookies(self, req, resp):
         """
@@ -843,4 +1364,8 @@ class HttpAdapter:
             encoded_auth = encoded_bytes.decode('latin1')
             headers["Proxy-Authorization"] = f"Basic {encoded_auth}"
 
-        return headers
\ No newline at end of file
+        return headers
+
+
+HttpAdapter.pool = ObjectPool(lambda: HttpAdapter(None, None, None, None, None),
+                              reset=lambda daemon: daemon.reset())
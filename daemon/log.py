@@ -0,0 +1,298 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.log
+~~~~~~~~~~~~~~~~~
+
+This module provides the leveled, asynchronous logger of the backend.
+
+Serving threads never write to the console themselves: a call below the
+configured level returns after one comparison, and an enabled call only puts
+a ``(time, level, name, message, args)`` tuple on a :class:`queue.SimpleQueue`
+(no Python level lock). A background writer thread formats the records
+(``str.format`` style, deferred until then) and writes them in batches, so
+worker threads no longer serialize on the stdout lock.
+
+Hot-path debug lines can be sampled: with ``sample=True`` only one call out of
+``sample_every`` per logger is recorded. When the writer falls behind, records
+beyond :data:`MAX_PENDING` are dropped and counted instead of growing memory.
+
+Usage Example:
+--------------
+>>> from daemon.log import configure, get_logger
+>>> configure(level="debug", sample_every=100)
+>>> log = get_logger("HttpAdapter")
+>>> log.debug("Processing request: {} {}", "GET", "/", sample=True)
+>>> log.info("Listening on port {}", 9000)
+"""
+
+import atexit
+import itertools
+import os
+import queue
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+#: Level silencing every record.
+OFF = 100
+
+LEVELS = {
+    "debug": DEBUG,
+    "info": INFO,
+    "warning": WARNING,
+    "error": ERROR,
+    "off": OFF,
+}
+LEVEL_NAMES = {
+    DEBUG: "DEBUG",
+    INFO: "INFO",
+    WARNING: "WARNING",
+    ERROR: "ERROR",
+}
+
+#: Default level.
+LEVEL = INFO
+#: Default sampling of ``sample=True`` records: one out of this many.
+SAMPLE_EVERY = 100
+#: Records waiting for the writer beyond which new ones are dropped.
+MAX_PENDING = 100000
+#: Records written per batch.
+BATCH_SIZE = 512
+
+_level = LEVEL
+_sample_every = SAMPLE_EVERY
+_stream = None
+_queue = queue.SimpleQueue()
+_writer = None
+_writer_lock = threading.Lock()
+_dropped = 0
+_loggers = {}
+
+
+def configure(level=None, sample_every=None, stream=None):
+    """
+    Set the process-wide logging options.
+
+    :param level (str|int): Minimum level, a name of :data:`LEVELS` or a number.
+    :param sample_every (int): Keep one out of this many sampled records.
+    :param stream (file): Destination of the records, standard output by default.
+
+    :raise ValueError: If the level name is unknown.
+    """
+    global _level, _sample_every, _stream
+    if level is not None:
+        if isinstance(level, str):
+            if level.lower() not in LEVELS:
+                raise ValueError("Unknown log level {!r}".format(level))
+            level = LEVELS[level.lower()]
+        _level = level
+    if sample_every is not None:
+        _sample_every = max(1, int(sample_every))
+    if stream is not None:
+        _stream = stream
+
+
+def get_logger(name):
+    """
+    Return the logger of a component, creating it once.
+
+    :param name (str): Component name, written as the ``[name]`` prefix.
+
+    :rtype Logger
+    """
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, Logger(name))
+    return logger
+
+
+class Logger:
+    """
+    Named entry point of the logging subsystem.
+
+    Messages use ``str.format`` placeholders filled from the positional
+    arguments by the writer thread, e.g. ``log.info("port {}", port)``.
+    """
+
+    __slots__ = ("name", "_calls")
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = itertools.count()
+
+    def enabled(self, level):
+        """
+        Tell whether records of a level are currently kept.
+
+        :param level (int): The level.
+
+        :rtype bool
+        """
+        return level >= _level
+
+    def log(self, level, msg, *args, sample=False):
+        """
+        Record a message.
+
+        :param level (int): Level of the message.
+        :param msg (str): Message, with ``{}`` placeholders.
+        :param args: Values of the placeholders.
+        :param sample (bool): Keep only one call out of ``sample_every``.
+        """
+        if level < _level:
+            return
+        if sample and next(self._calls) % _sample_every:
+            return
+        _emit(level, self.name, msg, args)
+
+    def debug(self, msg, *args, sample=False):
+        """Record a message at DEBUG level, see :meth:`log`."""
+        if _level > DEBUG:
+            return
+        if sample and next(self._calls) % _sample_every:
+            return
+        _emit(DEBUG, self.name, msg, args)
+
+    def info(self, msg, *args, sample=False):
+        """Record a message at INFO level, see :meth:`log`."""
+        if _level > INFO:
+            return
+        if sample and next(self._calls) % _sample_every:
+            return
+        _emit(INFO, self.name, msg, args)
+
+    def warning(self, msg, *args):
+        """Record a message at WARNING level, see :meth:`log`."""
+        if _level <= WARNING:
+            _emit(WARNING, self.name, msg, args)
+
+    def error(self, msg, *args):
+        """Record a message at ERROR level, see :meth:`log`."""
+        if _level <= ERROR:
+            _emit(ERROR, self.name, msg, args)
+
+
+def _emit(level, name, msg, args):
+    """
+    Queue a record for the writer thread.
+    """
+    global _dropped
+    if _writer is None:
+        _start_writer()
+    if _queue.qsize() >= MAX_PENDING:
+        _dropped += 1
+        return
+    _queue.put((time.time(), level, name, msg, args))
+
+
+def _start_writer():
+    """
+    Start the writer thread once per process.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_drain, args=(_queue,),
+                                       name="log-writer", daemon=True)
+            _writer.start()
+
+
+def format_record(record):
+    """
+    Render a queued record as one line.
+
+    :param record (tuple): (created, level, name, msg, args).
+
+    :rtype str: the line, newline included.
+    """
+    created, level, name, msg, args = record
+    if args:
+        try:
+            msg = msg.format(*args)
+        except (IndexError, KeyError, ValueError):
+            msg = "{} {}".format(msg, args)
+    return "{}.{:03d} {:<7} [{}] {}\n".format(
+        time.strftime("%H:%M:%S", time.localtime(created)),
+        int(created % 1 * 1000), LEVEL_NAMES.get(level, level), name, msg)
+
+
+def _drain(records):
+    """
+    Writer thread: write the queued records in batches until the sentinel.
+    """
+    reported = 0
+    while True:
+        batch = [records.get()]
+        while len(batch) < BATCH_SIZE:
+            try:
+                batch.append(records.get_nowait())
+            except queue.Empty:
+                break
+
+        stop = False
+        lines = []
+        for record in batch:
+            if record is None:
+                stop = True
+            else:
+                lines.append(format_record(record))
+        if _dropped != reported:
+            lines.append(format_record((time.time(), WARNING, "Log",
+                                        "{} records dropped, writer behind", (_dropped - reported,))))
+            reported = _dropped
+
+        stream = _stream or sys.stdout
+        try:
+            stream.write("".join(lines))
+            stream.flush()
+        except (OSError, ValueError):
+            # Closed or broken stream: logging must never take the server down.
+            pass
+        if stop:
+            return
+
+
+def shutdown(timeout=1.0):
+    """
+    Write the pending records and stop the writer thread.
+
+    :param timeout (float): Seconds to wait for the writer.
+    """
+    global _writer
+    with _writer_lock:
+        writer = _writer
+        if writer is None:
+            return
+        _queue.put(None)
+        _writer = None
+    writer.join(timeout)
+
+
+def _after_fork():
+    """
+    Give a forked child its own queue; the parent's writer thread is not copied.
+    """
+    global _queue, _writer, _writer_lock
+    _queue = queue.SimpleQueue()
+    _writer = None
+    _writer_lock = threading.Lock()
+
+
+atexit.register(shutdown)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,610 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.parser
+~~~~~~~~~~~~~~~~~
+
+This module provides an incremental HTTP/1.x request parser shared by every
+serving engine.
+
+Bytes are received straight into one reusable ``bytearray`` per connection
+(``socket.recv_into`` on a :class:`memoryview`), so a request is never built
+by repeated ``bytes`` concatenation. The parser is a two state machine:
+
+- ``HEADERS``: look for the blank line ending the header block, resuming the
+  search where the previous one stopped; the block is decoded once and only
+  the request line is split, the headers are kept as a
+  :class:`RequestHeaders` mapping that looks up fields on first access;
+- ``BODY``: wait until ``Content-Length`` bytes follow the headers and hand
+  them over as ``bytes``;
+- ``SPOOL`` and the ``CHUNK_*`` states: a body larger than
+  :data:`SPOOL_SIZE <daemon.body.SPOOL_SIZE>`, or sent with
+  ``Transfer-Encoding: chunked``, is moved out of the buffer as it arrives,
+  its chunked framing decoded, into a :class:`BodySpool <BodySpool>` that
+  writes it to a temporary file once it grows large. Such a body is handed
+  over as a :class:`RequestBody <RequestBody>` reader instead of ``bytes``.
+
+A request announcing ``Expect: 100-continue`` makes :meth:`HttpParser.interim`
+return the ``100 Continue`` response the serving engine sends before waiting
+for the body; a body refused from its headers (413, 501) is answered
+without reading it.
+
+Consumed bytes are dropped by moving two indexes; leftover bytes of a
+pipelined request stay in place for the next call. Oversized header blocks
+and bodies raise :class:`ParseError` carrying the HTTP status to answer.
+
+The receive buffer is taken from :data:`RECV_BUFFERS` and given back by
+:meth:`HttpParser.close` when the connection ends, so a new connection does
+not allocate one.
+
+Usage Example:
+--------------
+>>> parser = HttpParser()
+>>> parser.feed(b"GET / HTTP/1.1\\r\\nHost: a\\r\\n\\r\\n")
+>>> parser.next_request().method
+'GET'
+"""
+
+from collections.abc import MutableMapping
+
+from .body import BodySpool, SPOOL_SIZE
+from .pools import ObjectPool
+
+#: Upper bound of the request line plus headers.
+MAX_HEADER_SIZE = 64 * 1024
+#: Upper bound of a request body.
+MAX_BODY_SIZE = 8 * 1024 * 1024
+#: Initial size of the receive buffer of a connection.
+BUFFER_SIZE = 8 * 1024
+#: Free space guaranteed to every receive call.
+RECV_SIZE = 4 * 1024
+
+#: Longest chunk size line (size and extensions) of a chunked body.
+MAX_CHUNK_LINE = 1024
+
+# Parser states.
+HEADERS = "headers"
+BODY = "body"
+SPOOL = "spool"
+CHUNK_SIZE = "chunk-size"
+CHUNK_DATA = "chunk-data"
+CHUNK_END = "chunk-end"
+TRAILERS = "trailers"
+
+#: Interim response to ``Expect: 100-continue``.
+CONTINUE = b"HTTP/1.1 100 Continue\r\n\r\n"
+
+HEX_DIGITS = frozenset(b"0123456789abcdefABCDEF")
+
+# Body limit of the parsers created without an explicit one, see configure().
+_max_body_size = MAX_BODY_SIZE
+
+
+def _shrink(buf):
+    """
+    Give a receive buffer grown by a large request its initial size back.
+    """
+    del buf[BUFFER_SIZE:]
+
+
+#: Receive buffers of the closed connections, reused by the next parsers.
+RECV_BUFFERS = ObjectPool(lambda: bytearray(BUFFER_SIZE), reset=_shrink)
+
+REASONS = {
+    400: "Bad Request",
+    408: "Request Timeout",
+    413: "Content Too Large",
+    431: "Request Header Fields Too Large",
+    501: "Not Implemented",
+}
+
+
+def configure(max_body_size=None):
+    """
+    Set the process-wide body limit of the parsers created afterwards.
+
+    :param max_body_size (int): Largest accepted request body; unchanged when None.
+    """
+    global _max_body_size
+    if max_body_size is not None:
+        _max_body_size = max_body_size
+
+
+class ParseError(Exception):
+    """
+    A request the parser refuses; the connection must be answered with
+    :attr:`status` and closed.
+    """
+
+    def __init__(self, status, message=""):
+        super().__init__(message or REASONS.get(status, "Bad Request"))
+        self.status = status
+        self.reason = REASONS.get(status, "Bad Request")
+
+    def response(self):
+        """
+        Build the complete error response.
+
+        :rtype bytes: HTTP response closing the connection.
+        """
+        body = self.reason.encode("ascii")
+        return ("HTTP/1.1 {} {}\r\n"
+                "Content-Type: text/plain\r\n"
+                "Content-Length: {}\r\n"
+                "Connection: close\r\n\r\n").format(
+                    self.status, self.reason, len(body)).encode("ascii") + body
+
+
+class RequestHeaders(MutableMapping):
+    """
+    Request headers parsed lazily from the raw header block.
+
+    Looking up one field searches the block for it and remembers the value;
+    the block is only split into every field when the mapping is iterated,
+    sized or a field deleted. Names are case-insensitive and, as with a
+    repeated field, the last occurrence wins. Assigned values (e.g. the
+    ``path`` given to handlers) shadow the block.
+    """
+
+    __slots__ = ("_block", "_lower", "_values")
+
+    def __init__(self, block=""):
+        """
+        :param block (str): Header lines, CRLF separated, without the
+                            request line and the blank line.
+        """
+        #: Raw header lines, None once split into :attr:`_values`.
+        self._block = "\r\n" + block if block else None
+        #: Lowercased copy of the block, built on the first lookup.
+        self._lower = None
+        #: Lowercase name -> value of the fields looked up or assigned.
+        self._values = {}
+
+    def lowered(self):
+        """
+        Lowercased copy of the raw block, where fields are searched.
+
+        :rtype str: the copy, or None when the block had to be split instead
+                    (lowercasing some non ASCII characters moves the offsets).
+        """
+        lower = self._block.lower()
+        if len(lower) != len(self._block):
+            self.parse_all()
+            return None
+        self._lower = lower
+        return lower
+
+    def parse_all(self):
+        """
+        Split the remaining raw block into every field.
+        """
+        if self._block is None:
+            return
+        values = {}
+        for line in self._block.split("\r\n"):
+            key, sep, val = line.partition(":")
+            if sep:
+                values[key.strip().lower()] = val.strip()
+        values.update(self._values)
+        self._values = values
+        self._block = self._lower = None
+
+    def get(self, name, default=None):
+        # Overridden: the Mapping version goes through KeyError on misses,
+        # which most lookups (Content-Length of a GET, If-None-Match) are.
+        key = name.lower()
+        value = self._values.get(key)
+        if value is not None or self._block is None:
+            return default if value is None else value
+        lower = self._lower or self.lowered()
+        if lower is None:
+            value = self._values.get(key)
+            return default if value is None else value
+        # The last occurrence wins, as when the block is split.
+        start = lower.rfind("\r\n" + key + ":")
+        if start < 0:
+            return default
+        start += len(key) + 3
+        end = lower.find("\r", start)
+        value = self._values[key] = self._block[start:end if end >= 0 else None].strip()
+        return value
+
+    def __getitem__(self, name):
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __setitem__(self, name, value):
+        self._values[name.lower()] = value
+
+    def __delitem__(self, name):
+        self.parse_all()
+        del self._values[name.lower()]
+
+    def __iter__(self):
+        self.parse_all()
+        return iter(self._values)
+
+    def __len__(self):
+        self.parse_all()
+        return len(self._values)
+
+    def __repr__(self):
+        self.parse_all()
+        return "RequestHeaders({!r})".format(self._values)
+
+
+class ParsedRequest:
+    """
+    Request line, headers and body of one request, as cut out by the parser.
+
+    Attributes:
+        method (str): HTTP verb.
+        target (str): Request target (path and query string).
+        version (str): HTTP version, e.g. ``HTTP/1.1``.
+        headers (RequestHeaders): Header values, case-insensitive names.
+        body (bytes|RequestBody): Request body, a :class:`RequestBody` reader
+                                  when it was spooled.
+    """
+
+    __slots__ = ("method", "target", "version", "headers", "body")
+
+    def __init__(self, method, target, version, headers, body=b""):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    def __repr__(self):
+        return "<ParsedRequest {} {}>".format(self.method, self.target)
+
+
+def parse_head(head):
+    """
+    Split a decoded request line and header block.
+
+    :param head (str): Request line and headers, without the blank line.
+
+    :rtype ParsedRequest: the request, body not yet attached; the headers
+                          are parsed lazily.
+    :raise ParseError: If the request line is malformed.
+    """
+    # Tolerate empty lines before the request line (RFC 9112, section 2.2).
+    line, _, block = head.lstrip("\r\n").partition("\r\n")
+    parts = line.split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise ParseError(400, "Malformed request line {!r}".format(line[:100]))
+    return ParsedRequest(parts[0], parts[1], parts[2], RequestHeaders(block))
+
+
+class HttpParser:
+    """
+    Incremental request parser working on one reusable receive buffer.
+
+    Attributes:
+        max_header_size (int): Largest accepted request line plus headers.
+        max_body_size (int): Largest accepted request body.
+        spool_size (int): Largest body kept in the receive buffer; larger
+                          ones are spooled.
+    """
+
+    __attrs__ = [
+        "max_header_size",
+        "max_body_size",
+        "spool_size",
+    ]
+
+    __slots__ = ("max_header_size", "max_body_size", "spool_size", "_buf",
+                 "_start", "_end", "_scan", "_state", "_request",
+                 "_remaining", "_spool", "_continue")
+
+    def __init__(self, max_header_size=MAX_HEADER_SIZE, max_body_size=None,
+                 buffer_size=BUFFER_SIZE, spool_size=SPOOL_SIZE):
+        """
+        Initialize a new HttpParser instance.
+
+        :param max_header_size (int): Largest accepted request line plus headers.
+        :param max_body_size (int): Largest accepted request body; the limit
+                                    set by :func:`configure` when None.
+        :param buffer_size (int): Initial size of the receive buffer; a
+                                  buffer of the default size comes from
+                                  :data:`RECV_BUFFERS`.
+        :param spool_size (int): Largest body kept in the receive buffer.
+        """
+        self.max_header_size = max_header_size
+        self.max_body_size = _max_body_size if max_body_size is None else max_body_size
+        self.spool_size = spool_size
+        if buffer_size == BUFFER_SIZE:
+            self._buf = RECV_BUFFERS.acquire()
+        else:
+            self._buf = bytearray(buffer_size)
+        #: First byte not consumed yet.
+        self._start = 0
+        #: End of the received bytes.
+        self._end = 0
+        #: Where the search for the end of the headers resumes.
+        self._scan = 0
+        self._state = HEADERS
+        self._request = None
+        #: Body bytes (or bytes of the current chunk) still expected.
+        self._remaining = 0
+        self._spool = None
+        #: A ``100 Continue`` is owed to the client.
+        self._continue = False
+
+    def close(self):
+        """
+        Give the receive buffer back to :data:`RECV_BUFFERS` and drop a body
+        being spooled. The parser must not be used afterwards; closing it
+        again does nothing.
+        """
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        buf, self._buf = self._buf, None
+        if buf is not None:
+            RECV_BUFFERS.release(buf)
+
+    def detach(self):
+        """
+        Close the parser of a connection switching protocols.
+
+        :rtype bytes: what was received after the last request, e.g. the
+                      first frames of a WebSocket client.
+        """
+        data = bytes(self._buf[self._start:self._end]) if self._buf is not None else b""
+        self.close()
+        return data
+
+    def pending(self):
+        """
+        Number of received bytes not consumed by a parsed request; at least 1
+        while the rest of a request whose headers were parsed is awaited.
+
+        :rtype int: 0 when no request is in progress.
+        """
+        n = self._end - self._start
+        if not n and self._state != HEADERS:
+            return 1
+        return n
+
+    def interim(self):
+        """
+        The ``100 Continue`` response owed to a client that announced
+        ``Expect: 100-continue`` and waits for it before sending the body.
+        It is returned once, and only while no byte of the body arrived.
+
+        :rtype bytes: the response to send, or None.
+        """
+        if self._continue:
+            self._continue = False
+            if self._end == self._start:
+                return CONTINUE
+        return None
+
+    def writable(self, size=RECV_SIZE):
+        """
+        Make room for at least ``size`` more bytes and expose it.
+
+        Consumed bytes are reclaimed first; the buffer only grows when the
+        unconsumed bytes of the current request fill it.
+
+        :param size (int): Bytes the caller wants to write.
+
+        :rtype memoryview: the free tail of the buffer.
+        """
+        if len(self._buf) - self._end < size:
+            if self._start:
+                self._compact()
+            if len(self._buf) - self._end < size:
+                self._buf.extend(bytes(max(size, len(self._buf))))
+        return memoryview(self._buf)[self._end:]
+
+    def _compact(self):
+        """
+        Move the unconsumed bytes to the front of the buffer.
+        """
+        shift = self._start
+        self._buf[:self._end - shift] = self._buf[shift:self._end]
+        self._end -= shift
+        self._scan = max(0, self._scan - shift)
+        self._start = 0
+
+    def recv_into(self, sock, size=RECV_SIZE):
+        """
+        Receive bytes from a socket straight into the buffer.
+
+        :param sock (socket.socket): The client socket.
+        :param size (int): Free space guaranteed to the receive call.
+
+        :rtype int: bytes received, 0 when the peer closed the connection.
+        """
+        view = self.writable(size)
+        try:
+            n = sock.recv_into(view)
+        finally:
+            view.release()
+        self._end += n
+        return n
+
+    def feed(self, data):
+        """
+        Append bytes obtained by other means (e.g. an asyncio stream).
+
+        :param data (bytes): Received bytes.
+        """
+        n = len(data)
+        view = self.writable(n)
+        view[:n] = data
+        view.release()
+        self._end += n
+
+    def next_request(self):
+        """
+        Cut the next complete request out of the buffer.
+
+        :rtype ParsedRequest: the request, or None while more bytes are needed.
+        :raise ParseError: If the request is malformed or exceeds the limits.
+        """
+        if self._state == HEADERS:
+            buf = self._buf
+            end = buf.find(b"\r\n\r\n", self._scan, self._end)
+            if end < 0:
+                if self._end - self._start > self.max_header_size:
+                    raise ParseError(431)
+                # The terminator may straddle the next receive.
+                self._scan = max(self._start, self._end - 3)
+                return None
+            if end - self._start > self.max_header_size:
+                raise ParseError(431)
+
+            request = parse_head(bytes(buf[self._start:end]).decode("utf-8", errors="ignore"))
+            self._start = self._scan = end + 4
+            self._begin_body(request)
+            self._request = request
+
+        if self._state == BODY:
+            if self._end - self._start < self._remaining:
+                return None
+            if self._remaining:
+                self._request.body = bytes(self._buf[self._start:self._start + self._remaining])
+                self._start += self._remaining
+        elif not self._spool_body():
+            return None
+        return self._finish()
+
+    def _begin_body(self, request):
+        """
+        Choose how the body following the headers is read.
+
+        :raise ParseError: If the framing is invalid, unsupported or too large.
+        """
+        headers = request.headers
+        coding = headers.get("transfer-encoding")
+        length = headers.get("content-length")
+        if coding is not None:
+            if length is not None:
+                # Ambiguous framing, the way requests are smuggled.
+                raise ParseError(400, "Both Transfer-Encoding and Content-Length")
+            if coding.strip().lower() != "chunked":
+                raise ParseError(501, "Unsupported Transfer-Encoding {!r}".format(coding))
+            self._state = CHUNK_SIZE
+            self._spool = BodySpool(self.spool_size)
+        else:
+            try:
+                length = int(length or "0")
+            except ValueError:
+                raise ParseError(400, "Invalid Content-Length {!r}".format(length))
+            if length < 0:
+                raise ParseError(400, "Invalid Content-Length {!r}".format(length))
+            if length > self.max_body_size:
+                raise ParseError(413)
+            self._remaining = length
+            if length > self.spool_size:
+                self._state = SPOOL
+                self._spool = BodySpool(self.spool_size, expected=length)
+            else:
+                self._state = BODY
+            if not length:
+                return
+        self._continue = (request.version == "HTTP/1.1" and
+                          headers.get("expect", "").strip().lower() == "100-continue")
+
+    def _spool_body(self):
+        """
+        Move the received body bytes to the spool, decoding the chunked
+        framing; chunk extensions and trailer fields are ignored.
+
+        :rtype bool: True once the whole body is spooled.
+        :raise ParseError: If the framing is malformed or the body too large.
+        """
+        buf = self._buf
+        while True:
+            state = self._state
+            if state == SPOOL or state == CHUNK_DATA:
+                n = min(self._end - self._start, self._remaining)
+                if n:
+                    view = memoryview(buf)[self._start:self._start + n]
+                    try:
+                        self._spool.write(view)
+                    finally:
+                        view.release()
+                    self._start += n
+                    self._remaining -= n
+                if self._remaining:
+                    if self._start == self._end:
+                        # Everything received is spooled: receive at the front.
+                        self._start = self._end = 0
+                    return False
+                if state == SPOOL:
+                    return True
+                self._state = CHUNK_END
+            elif state == CHUNK_END:
+                if self._end - self._start < 2:
+                    return False
+                if buf[self._start:self._start + 2] != b"\r\n":
+                    raise ParseError(400, "Malformed chunk")
+                self._start += 2
+                self._state = CHUNK_SIZE
+            else:
+                eol = buf.find(b"\r\n", self._start, self._end)
+                if eol < 0:
+                    if self._end - self._start > MAX_CHUNK_LINE:
+                        raise ParseError(400, "Chunk line too long")
+                    return False
+                line = bytes(buf[self._start:eol])
+                self._start = eol + 2
+                if state == TRAILERS:
+                    if not line:
+                        return True
+                    continue
+                digits = line.split(b";", 1)[0].strip()
+                if not digits or not HEX_DIGITS.issuperset(digits):
+                    raise ParseError(400, "Invalid chunk size {!r}".format(line[:40]))
+                size = int(digits, 16)
+                if self._spool.size + size > self.max_body_size:
+                    raise ParseError(413)
+                if size:
+                    self._remaining = size
+                    self._state = CHUNK_DATA
+                else:
+                    self._state = TRAILERS
+
+    def _finish(self):
+        """
+        Hand over the request whose body is complete and get ready for the next.
+
+        :rtype ParsedRequest
+        """
+        request = self._request
+        if self._spool is not None:
+            request.body = self._spool.finish()
+            self._spool = None
+        self._request = None
+        self._state = HEADERS
+        self._remaining = 0
+        self._continue = False
+        if self._start == self._end:
+            # Everything consumed: rewind instead of moving bytes later, and
+            # give back the room a large body needed.
+            self._start = self._end = self._scan = 0
+            if len(self._buf) > self.max_header_size:
+                del self._buf[self.max_header_size:]
+        else:
+            self._scan = self._start
+        return request
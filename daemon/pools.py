@@ -0,0 +1,128 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.pools
+~~~~~~~~~~~~~~~~~
+
+This module provides the free lists recycling the per-connection objects of
+a worker process: the :class:`HttpAdapter <HttpAdapter>` with its
+:class:`Request <Request>` and :class:`Response <Response>`, and the receive
+buffers of the :class:`HttpParser <HttpParser>`.
+
+A released object is reset and kept for the next connection, up to
+``max_size`` objects; beyond that it is left to the garbage collector. An
+object must not be used after it has been released.
+
+Usage Example:
+--------------
+>>> buffers = ObjectPool(lambda: bytearray(8192), max_size=4)
+>>> buf = buffers.acquire()
+>>> buffers.release(buf)
+>>> buffers.acquire() is buf
+True
+"""
+
+import threading
+
+#: Objects kept by default in a free list.
+MAX_POOLED = 256
+
+
+class ObjectPool:
+    """
+    A bounded, thread-safe free list of reusable objects.
+
+    Attributes:
+        factory (callable): Creates a new object when the free list is empty.
+        reset (callable): Called with a released object to clear its state;
+                          an object it fails on is dropped.
+        max_size (int): Largest number of idle objects kept; 0 disables reuse.
+    """
+
+    __attrs__ = [
+        "factory",
+        "reset",
+        "max_size",
+    ]
+
+    def __init__(self, factory, reset=None, max_size=MAX_POOLED):
+        """
+        Initialize a new, empty ObjectPool instance.
+
+        :param factory (callable): Creates a new object.
+        :param reset (callable): Clears the state of a released object.
+        :param max_size (int): Largest number of idle objects kept.
+        """
+        self.factory = factory
+        self.reset = reset
+        self.max_size = max_size
+        self._free = []
+        self._lock = threading.Lock()
+        # Counters, guarded by _lock.
+        self._created = 0
+        self._reused = 0
+        self._dropped = 0
+
+    def acquire(self):
+        """
+        Take an idle object, or create one.
+
+        :rtype: the object.
+        """
+        with self._lock:
+            if self._free:
+                self._reused += 1
+                return self._free.pop()
+            self._created += 1
+        return self.factory()
+
+    def release(self, obj):
+        """
+        Reset an object no longer used and keep it for a later :meth:`acquire`.
+
+        :param obj: An object obtained from :meth:`acquire`.
+        """
+        if self.reset is not None:
+            try:
+                self.reset(obj)
+            except Exception:
+                # e.g. a buffer still exported to a memoryview
+                with self._lock:
+                    self._dropped += 1
+                return
+        with self._lock:
+            if len(self._free) < self.max_size:
+                self._free.append(obj)
+            else:
+                self._dropped += 1
+
+    def clear(self):
+        """
+        Drop the idle objects.
+        """
+        with self._lock:
+            del self._free[:]
+
+    def snapshot(self):
+        """
+        :rtype dict: idle objects and created/reused/dropped counters.
+        """
+        with self._lock:
+            acquired = self._created + self._reused
+            return {
+                "idle": len(self._free),
+                "created": self._created,
+                "reused": self._reused,
+                "dropped": self._dropped,
+                "reuse_ratio": round(self._reused / acquired, 3) if acquired else 0.0,
+            }
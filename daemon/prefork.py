@@ -0,0 +1,284 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.prefork
+~~~~~~~~~~~~~~~~~
+
+This module provides a pre-fork multi-process mode for the backend. A parent
+supervisor forks N worker processes which all accept on the same port, so
+the backend is no longer capped at one core by the GIL.
+
+Two ways of sharing the port are supported:
+
+- the parent binds one listening socket and every worker inherits it
+  (default, works on any platform with ``os.fork``);
+- with ``reuse_port=True`` every worker binds its own socket with
+  ``SO_REUSEPORT`` and the kernel load-balances new connections.
+
+The supervisor restarts workers that exit or crash and periodically reports
+how many requests each worker has served, from counters kept in shared memory.
+
+Usage Example:
+--------------
+>>> run_prefork(lambda server: run_backend(ip, port, routes, server=server),
+...             "0.0.0.0", 9000, workers=4)
+"""
+
+import ctypes
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+from .httpadapter import HttpAdapter
+from .log import get_logger, shutdown as shutdown_logging
+
+log = get_logger("Prefork")
+
+#: Seconds between two per-worker request count reports.
+REPORT_INTERVAL = 30.0
+#: A worker dying faster than this after its start is considered crash-looping.
+MIN_UPTIME = 1.0
+#: Delay before restarting a crash-looping worker.
+RESTART_BACKOFF = 1.0
+
+
+def bind_listener(ip, port, reuse_port=False, backlog=1024):
+    """
+    Create a listening TCP socket.
+
+    :param ip (str): IP address to bind.
+    :param port (int): Port number to listen on.
+    :param reuse_port (bool): Set ``SO_REUSEPORT`` so several processes can bind the port.
+    :param backlog (int): Listen backlog.
+
+    :rtype socket.socket: the bound, listening socket.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server.bind((ip, port))
+    server.listen(backlog)
+    return server
+
+
+class Supervisor:
+    """
+    Parent process forking, watching and restarting the backend workers.
+
+    Attributes:
+        serve (callable): Runs an engine on a listening socket; called in each worker.
+        ip (str): IP address to bind.
+        port (int): Port number to listen on.
+        workers (int): Number of worker processes.
+        reuse_port (bool): Each worker binds its own ``SO_REUSEPORT`` socket.
+        report_interval (float): Seconds between two request count reports.
+    """
+
+    __attrs__ = [
+        "serve",
+        "ip",
+        "port",
+        "workers",
+        "reuse_port",
+        "report_interval",
+    ]
+
+    def __init__(self, serve, ip, port, workers, reuse_port=False,
+                 report_interval=REPORT_INTERVAL):
+        self.serve = serve
+        self.ip = ip
+        self.port = port
+        self.workers = workers
+        self.reuse_port = reuse_port
+        self.report_interval = report_interval
+        #: Requests served per worker slot, shared with the children.
+        self.counts = multiprocessing.RawArray(ctypes.c_ulonglong, workers)
+        #: pid -> (slot, start time) of the running workers.
+        self.children = {}
+        self.restarts = [0] * workers
+        self.server = None
+        self.stopping = False
+
+    def run(self):
+        """
+        Fork the workers and supervise them until SIGINT/SIGTERM.
+        """
+        if not self.reuse_port:
+            self.server = bind_listener(self.ip, self.port)
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        mode = "SO_REUSEPORT" if self.reuse_port else "shared socket"
+        log.info("supervisor {} starting {} workers on port {} ({})",
+                 os.getpid(), self.workers, self.port, mode)
+        for slot in range(self.workers):
+            self.spawn(slot)
+
+        last_report = time.monotonic()
+        while not self.stopping:
+            self.reap()
+            now = time.monotonic()
+            if self.report_interval and now - last_report >= self.report_interval:
+                self.report()
+                last_report = now
+            time.sleep(0.2)
+
+        self.shutdown()
+
+    def spawn(self, slot):
+        """
+        Fork the worker of a slot.
+
+        :param slot (int): Index of the worker, also its request counter index.
+        """
+        pid = os.fork()
+        if pid:
+            self.children[pid] = (slot, time.monotonic())
+            return
+
+        # Child process.
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        code = 0
+        try:
+            server = self.server
+            if server is None:
+                server = bind_listener(self.ip, self.port, reuse_port=True)
+            HttpAdapter.request_counter = make_counter(self.counts, slot)
+            log.info("worker {} (slot {}) serving", os.getpid(), slot)
+            self.serve(server)
+        except BaseException as e:
+            log.error("worker {} (slot {}) failed: {}", os.getpid(), slot, e)
+            code = 1
+        finally:
+            # os._exit skips atexit: write the pending log records first.
+            shutdown_logging()
+            os._exit(code)
+
+    def reap(self):
+        """
+        Collect exited workers and start replacements.
+        """
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot, started = self.children.pop(pid, (None, 0))
+            if slot is None or self.stopping:
+                continue
+            log.warning("worker {} (slot {}) exited with status {}, restarting",
+                        pid, slot, status)
+            self.restarts[slot] += 1
+            if time.monotonic() - started < MIN_UPTIME:
+                time.sleep(RESTART_BACKOFF)
+            self.spawn(slot)
+
+    def stats(self):
+        """
+        Per-worker request counts and restart counts.
+
+        :rtype dict: slot -> {"pid", "requests", "restarts"}.
+        """
+        pids = {slot: pid for pid, (slot, _) in self.children.items()}
+        return {
+            slot: {
+                "pid": pids.get(slot),
+                "requests": self.counts[slot],
+                "restarts": self.restarts[slot],
+            }
+            for slot in range(self.workers)
+        }
+
+    def report(self):
+        """
+        Print the per-worker request counts.
+        """
+        stats = self.stats()
+        total = sum(s["requests"] for s in stats.values())
+        log.info("{} requests served, per worker {}", total, stats)
+
+    def stop(self, signum, frame):
+        """
+        Signal handler: stop supervising and terminate the workers.
+        """
+        self.stopping = True
+
+    def shutdown(self):
+        """
+        Terminate the workers and wait for them.
+        """
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self.children):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.children.clear()
+        self.report()
+        if self.server is not None:
+            self.server.close()
+
+
+def make_counter(counts, slot):
+    """
+    Build the per-request callback incrementing a worker's shared counter.
+
+    :param counts (RawArray): Shared request counters.
+    :param slot (int): Index of the worker.
+
+    :rtype callable: a thread-safe increment function.
+    """
+    lock = threading.Lock()
+
+    def count():
+        with lock:
+            counts[slot] += 1
+    return count
+
+
+def run_prefork(serve, ip, port, workers, reuse_port=False,
+                report_interval=REPORT_INTERVAL):
+    """
+    Entry point of the pre-fork mode.
+
+    :param serve (callable): Runs an engine on the given listening socket.
+    :param ip (str): IP address to bind.
+    :param port (int): Port number to listen on.
+    :param workers (int): Number of worker processes.
+    :param reuse_port (bool): Each worker binds its own ``SO_REUSEPORT`` socket.
+    :param report_interval (float): Seconds between two request count reports.
+
+    :raise RuntimeError: If the platform cannot fork.
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Pre-fork workers need os.fork, which this platform lacks")
+    if reuse_port and not hasattr(socket, "SO_REUSEPORT"):
+        log.warning("SO_REUSEPORT unavailable, sharing one listening socket")
+        reuse_port = False
+    try:
+        Supervisor(serve, ip, port, workers, reuse_port=reuse_port,
+                   report_interval=report_interval).run()
+    except OSError as e:
+        log.error("Socket error: {}", e)
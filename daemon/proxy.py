@@ -258,6 +258,9 @@ import threading
 from .response import *
 from .httpadapter import HttpAdapter
 from .dictionary import CaseInsensitiveDict
+from .log import get_logger
+
+log = get_logger("Proxy")
 
 #: A dictionary mapping hostnames to backend IP and port tuples.
 #: Used to determine routing targets for incoming requests.
@@ -293,7 +296,7 @@ def forward_request(host, port, request):
             response += chunk
         return response
     except socket.error as e:
-      print("Socket error: {}".format(e))
+      log.error("Socket error: {}", e)
       return (
             "HTTP/1.1 404 Not Found\r\n"
             "Content-Type: text/plain\r\n"
@@ -314,17 +317,14 @@ def resolve_routing_policy(hostname, routes):
     :params routes (dict): dictionary mapping hostnames and location.
     """
 
-    print(hostname)
     proxy_map, policy = routes.get(hostname,('127.0.0.1:9000','round-robin'))
-    print(proxy_map)
-    print(policy)
+    log.debug("hostname {} proxy_map {} policy {}", hostname, proxy_map, policy)
 
     proxy_host = ''
     proxy_port = '9000'
     if isinstance(proxy_map, list):
         if len(proxy_map) == 0:
-            print("[Proxy] Empty resolved routing of hostname {}".format(hostname))
-            print("Empty proxy_map result")
+            log.warning("Empty resolved routing of hostname {}", hostname)
             # TODO: implement the error handling for non mapped host
             #       the policy is design by team, but it can be 
             #       basic default host in your self-defined system
@@ -347,7 +347,7 @@ def resolve_routing_policy(hostname, routes):
             proxy_host = '127.0.0.1'
             proxy_port = '9000'
     else:
-        print("[Proxy] resolve route of hostname {} is a singulair to".format(hostname))
+        log.debug("resolve route of hostname {} is a singulair to", hostname)
         proxy_host, proxy_port = proxy_map.split(":", 2)
 
     return proxy_host, proxy_port
@@ -403,7 +403,7 @@ def handle_client(ip, port, conn, addr, routes):
 
         # log first line for debug
         first_line = request_text.splitlines()[0] if request_text else "<empty>"
-        print(f"[Proxy] Received from {addr}: {first_line}")
+        log.debug("Received from {}: {}", addr, first_line, sample=True)
 
         # Try extracting Host header
         hostname = None
@@ -431,7 +431,7 @@ def handle_client(ip, port, conn, addr, routes):
                 pass
 
         log_host = hostname if hostname else "<unknown-host>"
-        print(f"[Proxy] {addr} at Host: {log_host}")
+        log.debug("{} at Host: {}", addr, log_host, sample=True)
 
         if not hostname:
             # Bad request: no host information
@@ -446,11 +446,11 @@ def handle_client(ip, port, conn, addr, routes):
         try:
             resolved_host, resolved_port = resolve_routing_policy(hostname, routes)
         except Exception as e:
-            print(f"[Proxy] resolve_routing_policy error: {e}")
+            log.error("resolve_routing_policy error: {}", e)
             resolved_host, resolved_port = None, None
 
         if not resolved_host:
-            print(f"[Proxy] No route for host {hostname}")
+            log.warning("No route for host {}", hostname)
             try:
                 conn.sendall(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
             except Exception:
@@ -462,10 +462,10 @@ def handle_client(ip, port, conn, addr, routes):
         try:
             resolved_port = int(resolved_port) if resolved_port is not None else 80
         except Exception:
-            print(f"[Proxy] Invalid resolved port '{resolved_port}', defaulting to 80")
+            log.warning("Invalid resolved port '{}', defaulting to 80", resolved_port)
             resolved_port = 80
 
-        print(f"[Proxy] Host name {hostname} is forwarded to {resolved_host}:{resolved_port}")
+        log.debug("Host name {} is forwarded to {}:{}", hostname, resolved_host, resolved_port, sample=True)
 
         # Forward request to backend and return response
         try:
@@ -479,13 +479,13 @@ def handle_client(ip, port, conn, addr, routes):
                 # backend returned nothing
                 conn.sendall(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
         except Exception as e:
-            print(f"[Proxy] Error forwarding to backend {resolved_host}:{resolved_port} - {e}")
+            log.error("Error forwarding to backend {}:{} - {}", resolved_host, resolved_port, e)
             try:
                 conn.sendall(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
             except Exception:
                 pass
     except Exception as outer:
-        print(f"[Proxy] Unexpected error in handle_client: {outer}")
+        log.error("Unexpected error in handle_client: {}", outer)
     finally:
         try:
             conn.close()
@@ -512,7 +512,7 @@ def run_proxy(ip, port, routes):
     try:
         proxy.bind((ip, port))
         proxy.listen(50)
-        print("[Proxy] Listening on IP {} port {}".format(ip,port))
+        log.info("Listening on IP {} port {}", ip, port)
         while True:
             conn, addr = proxy.accept()
             #
@@ -525,7 +525,7 @@ def run_proxy(ip, port, routes):
             #client_thread.join()  # Optional: Wait for the thread to finish (not usually needed for daemon threads)
             
     except socket.error as e:
-      print("Socket error: {}".format(e))
+      log.error("Socket error: {}", e)
 
 def create_proxy(ip, port, routes):
     """
@@ -0,0 +1,160 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.ranges
+~~~~~~~~~~~~~~~~~
+
+This module provides the byte ``Range`` requests of file-backed responses
+(RFC 9110 section 14): ``206 Partial Content`` with one range, or several
+ranges as a ``multipart/byteranges`` body, and ``416 Range Not Satisfiable``.
+
+Parts of a body are never copied: a range of in-memory bytes is a
+:class:`memoryview` slice and a range of a file a :class:`FileBody` with the
+matching offset and count, still sent with ``sendfile``.
+
+Usage Example:
+--------------
+>>> parse_range("bytes=0-99, -100", 1000)
+[(0, 99), (900, 999)]
+>>> parse_range("bytes=2000-", 1000)
+Traceback (most recent call last):
+RangeNotSatisfiable: ...
+"""
+
+import secrets
+
+from .writer import FileBody
+
+#: Ranges accepted in one request; more, or overlapping ones, are ignored
+#: and the whole body is sent instead.
+MAX_RANGES = 16
+
+
+class RangeNotSatisfiable(Exception):
+    """
+    No range of the request overlaps the body: answer ``416``.
+    """
+
+
+def parse_range(header, size):
+    """
+    Parse a ``Range`` header against a body size.
+
+    :param header (str): The request header, e.g. ``bytes=0-99,200-``.
+    :param size (int): Length of the body.
+
+    :rtype list: the (first, last) byte positions, inclusive, in request
+                 order; None when the header must be ignored (other unit,
+                 malformed, too many or overlapping ranges).
+    :raise RangeNotSatisfiable: If no range overlaps the body.
+    """
+    unit, sep, specs = header.partition("=")
+    if not sep or unit.strip().lower() != "bytes":
+        return None
+    ranges = []
+    for spec in specs.split(","):
+        spec = spec.strip()
+        if not spec:
+            continue
+        first, sep, last = spec.partition("-")
+        first, last = first.strip(), last.strip()
+        if not sep or not (first or last):
+            return None
+        if (first and not first.isdigit()) or (last and not last.isdigit()):
+            return None
+        if not first:
+            # Suffix range: the last N bytes, none of an empty body.
+            length = int(last)
+            if not length or not size:
+                continue
+            ranges.append((max(0, size - length), size - 1))
+            continue
+        start = int(first)
+        if last:
+            if int(last) < start:
+                return None
+            end = int(last)
+        else:
+            end = size - 1
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    if not ranges:
+        raise RangeNotSatisfiable(header)
+    if len(ranges) > MAX_RANGES:
+        return None
+    ordered = sorted(ranges)
+    for (_, end), (start, _) in zip(ordered, ordered[1:]):
+        if start <= end:
+            return None
+    return ranges
+
+
+def slice_body(body, start, end):
+    """
+    A range of a body, without copying it.
+
+    :param body (bytes|FileBody): The whole body.
+    :param start (int): First byte.
+    :param end (int): Last byte, inclusive.
+
+    :rtype memoryview|FileBody
+    """
+    if isinstance(body, FileBody):
+        return FileBody(body.path, body.offset + start, end - start + 1)
+    return memoryview(body)[start:end + 1]
+
+
+def content_range(start, end, size):
+    """
+    :rtype str: the ``Content-Range`` value of a range.
+    """
+    return "bytes {}-{}/{}".format(start, end, size)
+
+
+def multipart_body(body, ranges, size, mime):
+    """
+    Build a ``multipart/byteranges`` body.
+
+    :param body (bytes|FileBody): The whole body.
+    :param ranges (list): (first, last) byte positions.
+    :param size (int): Length of the whole body.
+    :param mime (str): Content type of the whole body.
+
+    :rtype tuple: (content type with boundary, list of buffers).
+    """
+    boundary = secrets.token_hex(12)
+    parts = []
+    for start, end in ranges:
+        parts.append("\r\n--{}\r\nContent-Type: {}\r\nContent-Range: {}\r\n\r\n".format(
+            boundary, mime, content_range(start, end, size)).encode("latin-1"))
+        parts.append(slice_body(body, start, end))
+    parts.append("\r\n--{}--\r\n".format(boundary).encode("latin-1"))
+    return "multipart/byteranges; boundary={}".format(boundary), parts
+
+
+def if_range_matches(header, etag, last_modified):
+    """
+    Evaluate ``If-Range``: the ranges only apply to an unchanged body.
+
+    :param header (str): The request header, an entity tag or a date.
+    :param etag (str): ``ETag`` of the response, or None.
+    :param last_modified (str): ``Last-Modified`` of the response, or None.
+
+    :rtype bool
+    """
+    header = header.strip()
+    if header.startswith('"') or header.startswith("W/"):
+        # Strong comparison: a weak tag never matches.
+        return etag is not None and not etag.startswith("W/") and header == etag
+    return last_modified is not None and header == last_modified
@@ -0,0 +1,501 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.reactor
+~~~~~~~~~~~~~~~~~
+
+This module provides the ``reactor`` serving engine of the backend. A single
+thread multiplexes, with :mod:`selectors` (epoll on Linux), the accept, header
+read, body read and response write steps of every connection on non-blocking
+sockets. No thread is pinned while a slow client trickles its request.
+
+Once a request is complete it is handed to a :class:`WorkerPool <WorkerPool>`
+which runs the :class:`HttpAdapter <HttpAdapter>` routing and the route
+handler. The rendered response is posted back to the reactor thread through
+a wake-up socket pair and written out non-blockingly. Persistent connections
+go back to the read step after their response, idle ones are closed after
+:attr:`HttpAdapter.keepalive_timeout`. Pipelined requests received together
+are processed in order by one worker and answered with one write.
+
+Usage Example:
+--------------
+>>> Reactor("127.0.0.1", 9000, routes={}).serve_forever()
+"""
+
+import collections
+import selectors
+import socket
+import time
+
+from .httpadapter import HttpAdapter
+from .parser import HttpParser, ParseError
+from .workerpool import WorkerPool, OVERFLOW_REJECT
+from .routing import compile_routes
+from .writer import ChunkedBody, StreamAborted, send_some, release
+from .log import get_logger
+
+log = get_logger("Reactor")
+
+#: Seconds a client may take to send its complete request.
+READ_TIMEOUT = 30.0
+#: Most pipelined requests dispatched together from one connection buffer.
+PIPELINE_DEPTH = 16
+#: Seconds between two sweeps of the connection deadlines (also the longest
+#: wait in ``select``): timeouts are enforced to within this precision.
+EXPIRE_INTERVAL = 1.0
+
+# Connection states.
+READING = "reading"
+DISPATCHED = "dispatched"
+WRITING = "writing"
+
+REQUEST_TIMEOUT = (b"HTTP/1.1 408 Request Timeout\r\n"
+                   b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+SERVICE_UNAVAILABLE = (b"HTTP/1.1 503 Service Unavailable\r\n"
+                       b"Content-Type: text/plain\r\nContent-Length: 19\r\n"
+                       b"Retry-After: 1\r\nConnection: close\r\n\r\n"
+                       b"Service Unavailable")
+
+
+class Connection:
+    """
+    Per-connection state kept by the reactor between readiness events.
+    """
+
+    __slots__ = ("sock", "addr", "state", "parser", "outbuf", "deadline",
+                 "requests", "keep_alive", "upgrade")
+
+    def __init__(self, sock, addr):
+        self.sock = sock
+        self.addr = addr
+        self.state = READING
+        #: Incremental parser holding the received, not yet dispatched bytes.
+        self.parser = HttpParser()
+        #: Buffers of the responses not written yet, see :mod:`daemon.writer`.
+        self.outbuf = []
+        self.deadline = time.monotonic() + READ_TIMEOUT
+        #: Requests received on this connection.
+        self.requests = 0
+        #: Whether the connection stays open after the pending response.
+        self.keep_alive = False
+        #: Adapter holding a WebSocket upgrade, served once its 101 is written.
+        self.upgrade = None
+
+
+class Reactor:
+    """
+    A selectors based event loop serving the WeApRous routes.
+
+    Attributes:
+        ip (str): IP address to bind the server.
+        port (int): Port number to listen on.
+        routes (dict): Mapping of route paths to handler functions.
+        pool (WorkerPool): Workers running the route handlers.
+    """
+
+    __attrs__ = [
+        "ip",
+        "port",
+        "routes",
+        "pool",
+    ]
+
+    def __init__(self, ip, port, routes, threads=16, queue_size=128, server=None):
+        """
+        Initialize a new Reactor instance.
+
+        :param ip (str): IP address to bind the server.
+        :param port (int): Port number to listen on.
+        :param routes (dict): Mapping of route paths to handler functions.
+        :param threads (int): Number of handler worker threads.
+        :param queue_size (int): Capacity of the handler queue; requests beyond
+                                 it are answered with ``503``.
+        :param server (socket.socket): Already listening socket to serve instead of binding.
+        """
+        self.ip = ip
+        self.port = port
+        self.routes = compile_routes(routes)
+        self.server = server
+        self.pool = WorkerPool(workers=threads, queue_size=queue_size,
+                               overflow=OVERFLOW_REJECT, on_reject=self.reject,
+                               name="reactor-worker")
+        self.selector = selectors.DefaultSelector()
+        self.connections = {}
+        #: Responses rendered by the workers, waiting for the reactor thread.
+        self.completed = collections.deque()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+
+    def serve_forever(self):
+        """
+        Bind the listening socket and run the event loop.
+        """
+        server = self.server
+        if server is None:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind((self.ip, self.port))
+            server.listen(1024)
+        server.setblocking(False)
+
+        self.pool.start()
+        self.selector.register(server, selectors.EVENT_READ, self.accept)
+        self.selector.register(self._wakeup_r, selectors.EVENT_READ, self.drain_completed)
+
+        log.info("Listening on port {} (reactor engine, {})",
+                 self.port, type(self.selector).__name__)
+        if self.routes != {}:
+            log.debug("route settings {}", self.routes)
+
+        next_expiry = time.monotonic() + EXPIRE_INTERVAL
+        while True:
+            for key, mask in self.selector.select(timeout=EXPIRE_INTERVAL):
+                callback = key.data
+                if key.fileobj in (server, self._wakeup_r):
+                    callback(key.fileobj)
+                else:
+                    callback(key.fileobj, mask)
+            # The sweep visits every connection: not once per readiness event.
+            now = time.monotonic()
+            if now >= next_expiry:
+                self.expire(now)
+                next_expiry = now + EXPIRE_INTERVAL
+
+    def accept(self, server):
+        """
+        Accept every pending connection and watch it for readability.
+        """
+        while True:
+            try:
+                sock, addr = server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            conn = Connection(sock, addr)
+            self.connections[sock] = conn
+            HttpAdapter.connection_stats.opened()
+            self.selector.register(sock, selectors.EVENT_READ, self.on_event)
+
+    def on_event(self, sock, mask):
+        """
+        Dispatch a readiness event to the read or write step.
+        """
+        conn = self.connections.get(sock)
+        if conn is None:
+            return
+        if mask & selectors.EVENT_READ and conn.state == READING:
+            self.on_readable(conn)
+        elif mask & selectors.EVENT_WRITE and conn.state == WRITING:
+            self.on_writable(conn)
+
+    def on_readable(self, conn):
+        """
+        Read what is available, then check for a complete request.
+        """
+        try:
+            received = conn.parser.recv_into(conn.sock)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self.close(conn)
+            return
+        if not received:
+            self.close(conn)
+            return
+
+        # The idle deadline becomes a read deadline, renewed by every receive
+        # (like the per-read timeout of the other engines) so that a large
+        # upload is not cut short.
+        conn.deadline = time.monotonic() + READ_TIMEOUT
+        self.parse(conn)
+
+    def parse(self, conn):
+        """
+        Dispatch the buffered requests once their headers and bodies are complete.
+
+        Pipelined requests already sitting in the buffer are cut out together
+        and dispatched as one batch, answered in order with a single write.
+        """
+        batch = []
+        while len(batch) < PIPELINE_DEPTH:
+            try:
+                parsed = conn.parser.next_request()
+            except ParseError as e:
+                log.warning("rejecting request from {}: {}", conn.addr, e)
+                if batch:
+                    # Answer the valid requests first; the error then comes
+                    # back through the read step and closes the connection.
+                    break
+                self.respond(conn, e.response())
+                return
+            if parsed is None:
+                break
+            batch.append(parsed)
+
+        if batch:
+            self.dispatch(conn, batch)
+        else:
+            self.send_interim(conn)
+
+    def send_interim(self, conn):
+        """
+        Send the ``100 Continue`` a client waits for before sending its body.
+        It is a few bytes on a connection with nothing else to write: a full
+        socket buffer only delays the body until the client stops waiting.
+        """
+        interim = conn.parser.interim()
+        if interim is not None:
+            try:
+                conn.sock.send(interim)
+            except OSError:
+                pass
+
+    def dispatch(self, conn, batch):
+        """
+        Hand a batch of complete requests to the worker pool.
+
+        :param batch (list): The parsed requests, in order.
+        """
+        conn.state = DISPATCHED
+        self.selector.unregister(conn.sock)
+
+        jobs = []
+        for parsed in batch:
+            conn.requests += 1
+            HttpAdapter.connection_stats.served(reused=conn.requests > 1)
+            can_keep_alive = conn.requests < HttpAdapter.keepalive_max_requests
+            jobs.append((parsed, can_keep_alive))
+            if not can_keep_alive:
+                # The connection closes after this one; drop what follows.
+                break
+        self.pool.submit(self.process, conn, jobs)
+
+    def process(self, conn, jobs):
+        """
+        Route and render a batch of requests in order; runs on a worker thread.
+        """
+        responses = []
+        keep_alive = False
+        daemon = HttpAdapter.acquire(self.ip, self.port, conn.sock, conn.addr, self.routes)
+        for i, (parsed, can_keep_alive) in enumerate(jobs):
+            if i:
+                daemon.recycle()
+            try:
+                full = daemon.process_request(parsed, self.routes,
+                                              can_keep_alive=can_keep_alive)
+            except Exception as e:
+                log.error("error processing request from {}: {}", conn.addr, e)
+                daemon.keep_alive = False
+                daemon.hook_failed(e)
+                full = daemon.build_reply(daemon.request, None)
+            responses.extend(full)
+            keep_alive = daemon.keep_alive
+            if isinstance(full[-1], ChunkedBody):
+                # The generator may read the request until it is exhausted:
+                # the adapter goes with the body, which releases it.
+                full[-1].owner = daemon
+                daemon = HttpAdapter.acquire(self.ip, self.port, conn.sock, conn.addr,
+                                             self.routes)
+            if not keep_alive:
+                break
+        if daemon.upgrade is not None:
+            # Its request stays valid until the WebSocket is closed.
+            conn.upgrade = daemon
+        else:
+            daemon.release()
+        self.post(conn, responses, keep_alive)
+
+    def reject(self, conn, jobs):
+        """
+        Worker pool overflow callback: answer ``503`` without running the
+        handlers. A streamed response whose next piece cannot be scheduled
+        already has its status line out: the connection is closed instead.
+        """
+        if isinstance(jobs, ChunkedBody):
+            release(conn.outbuf)
+            self.post(conn, [], False)
+            return
+        self.post(conn, [SERVICE_UNAVAILABLE], False)
+
+    def produce(self, conn, body):
+        """
+        Pull the next piece of a streamed response and put its frame in front
+        of the body; runs on a worker thread, so a generator may block (e.g.
+        waiting for new messages) without stalling the reactor.
+
+        :param body (ChunkedBody): The body at the front of ``conn.outbuf``,
+                                   which the reactor does not touch meanwhile.
+        """
+        try:
+            frame = body.next_frame()
+        except StreamAborted as e:
+            log.error("{}", e)
+            release(conn.outbuf)
+            self.post(conn, [], False)
+            return
+        if body.done:
+            body.close()
+            del conn.outbuf[0]
+        if frame:
+            conn.outbuf.insert(0, frame)
+        # A long stream is alive as long as it produces.
+        conn.deadline = time.monotonic()
+        self.post(conn, conn.outbuf, conn.keep_alive)
+
+    def post(self, conn, buffers, keep_alive):
+        """
+        Queue rendered responses for the reactor thread and wake it up.
+
+        :param buffers (list): Buffers of the responses, in request order.
+        """
+        self.completed.append((conn, buffers, keep_alive))
+        try:
+            self._wakeup_w.send(b"\0")
+        except (BlockingIOError, InterruptedError):
+            # The wake-up pipe is already full, the reactor will drain it.
+            pass
+
+    def drain_completed(self, wakeup):
+        """
+        Move the responses rendered by the workers to the write step.
+        """
+        try:
+            while wakeup.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        while self.completed:
+            conn, buffers, keep_alive = self.completed.popleft()
+            if conn.sock in self.connections:
+                conn.state = WRITING
+                conn.keep_alive = keep_alive
+                conn.outbuf = buffers
+                self.selector.register(conn.sock, selectors.EVENT_WRITE, self.on_event)
+
+    def respond(self, conn, full):
+        """
+        Answer directly from the reactor thread (protocol errors, timeouts).
+        """
+        conn.state = WRITING
+        conn.keep_alive = False
+        conn.outbuf = [full]
+        self.selector.modify(conn.sock, selectors.EVENT_WRITE, self.on_event)
+
+    def on_writable(self, conn):
+        """
+        Write as much of the pending responses as the socket accepts, header
+        and body buffers together in one vectored send. Once everything in
+        front of a streamed body is written, a worker produces its next piece:
+        a client that reads slowly holds the generator back.
+        """
+        try:
+            done = send_some(conn.sock, conn.outbuf)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self.close(conn)
+            return
+        if done:
+            if conn.upgrade is not None:
+                self.detach(conn)
+            elif conn.keep_alive:
+                self.rearm(conn)
+            else:
+                self.close(conn)
+        elif isinstance(conn.outbuf[0], ChunkedBody):
+            conn.state = DISPATCHED
+            self.selector.unregister(conn.sock)
+            body = conn.outbuf[0]
+            # An event stream calls back when it has something to send, so
+            # that an idle subscriber does not hold a worker.
+            produce = lambda: self.pool.submit(self.produce, conn, body)
+            if body.when_ready(produce):
+                produce()
+
+    def detach(self, conn):
+        """
+        Hand a connection switching to WebSocket over to a thread of its own
+        (see :meth:`HttpAdapter.start_upgrade`): the reactor forgets it.
+        """
+        self.connections.pop(conn.sock, None)
+        self.selector.unregister(conn.sock)
+        daemon, conn.upgrade = conn.upgrade, None
+        daemon.start_upgrade(conn.sock, conn.parser.detach())
+
+    def rearm(self, conn):
+        """
+        Put a persistent connection back in the read step for its next request.
+        """
+        conn.state = READING
+        conn.outbuf = []
+        pending = conn.parser.pending()
+        conn.deadline = time.monotonic() + (
+            READ_TIMEOUT if pending else HttpAdapter.keepalive_timeout)
+        self.selector.modify(conn.sock, selectors.EVENT_READ, self.on_event)
+        if pending:
+            self.parse(conn)
+
+    def expire(self, now):
+        """
+        Answer ``408`` to connections that did not complete their request in time
+        and close persistent connections idle for longer than the keep-alive timeout.
+
+        :param now (float): ``time.monotonic()`` of the sweep.
+        """
+        for conn in list(self.connections.values()):
+            if conn.state == READING and conn.deadline < now:
+                if conn.parser.pending():
+                    self.respond(conn, REQUEST_TIMEOUT)
+                    conn.deadline = now + READ_TIMEOUT
+                else:
+                    self.close(conn)
+            elif conn.state == WRITING and conn.deadline + READ_TIMEOUT < now:
+                self.close(conn)
+
+    def close(self, conn):
+        """
+        Forget a connection and close its socket.
+        """
+        self.connections.pop(conn.sock, None)
+        release(conn.outbuf)
+        conn.parser.close()
+        if conn.upgrade is not None:
+            conn.upgrade.release()
+            conn.upgrade = None
+        try:
+            self.selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
+
+
+def run_reactor_backend(ip, port, routes, threads=16, queue_size=128, server=None):
+    """
+    Entry point of the ``reactor`` engine.
+
+    :param ip (str): IP address to bind the server.
+    :param port (int): Port number to listen on.
+    :param routes (dict): Dictionary of route handlers.
+    :param threads (int): Number of handler worker threads.
+    :param queue_size (int): Capacity of the handler queue.
+    :param server (socket.socket): Already listening socket (pre-fork workers).
+    """
+    try:
+        Reactor(ip, port, routes, threads=threads, queue_size=queue_size,
+                server=server).serve_forever()
+    except OSError as e:
+        log.error("Socket error: {}", e)
@@ -417,9 +417,26 @@ daemon.request
 
 This module provides a Request object to manage and persist 
 request settings (cookies, auth, proxies).
+
+Requests are created for every request served, so the object is kept small
+(``__slots__``) and does no parsing up front: the headers come from the
+parser as a lazily parsed :class:`RequestHeaders` mapping, and the cookies,
+the query parameters and the body, as text, form or JSON, are only decoded
+on first access, once per request. A large body spooled to a temporary file
+by the parser is read through :attr:`Request.stream` without loading it.
 """
+from .body import RequestBody
 from .dictionary import CaseInsensitiveDict
+from .log import get_logger
+from .parser import RequestHeaders
+from urllib.parse import parse_qs
 import base64
+import json
+
+log = get_logger("Request")
+
+# Marks a body not decoded yet (None is a valid decoded value).
+_UNSET = object()
 
 class Request():
     """The fully mutable "class" `Request <Request>` object,
@@ -437,6 +454,10 @@ class Request():
       >>> r = req.prepare(incoming_msg)
       >>> r
       <Request>
+      >>> r.cookies.get("auth"), r.query.get("channel")
+      ('true', ['general'])
+      >>> r.form.get("username"), r.json
+      (['admin@mail'], None)
     """
     __attrs__ = [
         "method",
@@ -450,6 +471,10 @@ class Request():
         "hook",
     ]
 
+    __slots__ = ("method", "url", "headers", "path", "version", "routes",
+                 "hook", "params", "auth", "_payload", "_body", "_stream",
+                 "_cookies", "_query", "_form", "_json")
+
     def __init__(self):
         #: HTTP verb to send to the server.
         self.method = None
@@ -459,14 +484,159 @@ class Request():
         self.headers = None
         #: HTTP path
         self.path = None        
-        # The cookies set used to create Cookie header
-        self.cookies = {}
-        #: request body to send to the server.
-        self.body = None
+        #: HTTP version
+        self.version = None
+        # Body as received (bytes, or a spooled RequestBody), then decoded
+        # as text and wrapped in a reader on first access.
+        self._payload = b""
+        self._body = _UNSET
+        self._stream = None
         #: Routes
         self.routes = {}
         #: Hook point for routed mapped-path
         self.hook = None
+        #: Parameters captured by the route path, e.g. ``<name>``.
+        self.params = {}
+        #: Credentials given to :meth:`prepare_auth`.
+        self.auth = None
+        # The cookies set used to create Cookie header, parsed on first access.
+        self._cookies = None
+        # Query string parameters, parsed on first access.
+        self._query = None
+        # Decoded form and JSON bodies, on first access.
+        self._form = None
+        self._json = _UNSET
+
+    def reset(self):
+        """Forget the previous request, so that the object can be reused
+        for the next one. The route table is kept."""
+        self.method = self.url = self.headers = self.path = self.version = None
+        self.hook = self.auth = None
+        self.raw_body = b""
+        if self.params:
+            self.params = {}
+        self._cookies = self._query = self._form = None
+        self._json = _UNSET
+
+    @property
+    def raw_body(self):
+        """
+        The body as received. A spooled body is read from its file into
+        memory on every access; prefer :attr:`stream` for those.
+
+        :rtype bytes
+        """
+        payload = self._payload
+        if isinstance(payload, RequestBody):
+            return payload.getvalue()
+        return payload
+
+    @raw_body.setter
+    def raw_body(self, payload):
+        """
+        :param payload (bytes|RequestBody): The body cut out by the parser.
+        """
+        previous = self._payload
+        if isinstance(previous, RequestBody) and previous is not payload:
+            # Removes the temporary file of the previous request.
+            previous.close()
+        self._payload = payload
+        self._body = _UNSET
+        self._stream = None
+
+    @property
+    def body(self):
+        """
+        The body decoded as UTF-8 on first access.
+
+        :rtype str: the text, or None when the body is empty.
+        """
+        if self._body is _UNSET:
+            raw = self.raw_body
+            self._body = raw.decode("utf-8", errors="ignore") if raw else None
+        return self._body
+
+    @body.setter
+    def body(self, body):
+        self._body = body
+
+    @property
+    def stream(self):
+        """
+        File-like reader of the body, also iterable by chunks, which reads a
+        spooled body from its temporary file.
+
+        :rtype RequestBody
+        """
+        if self._stream is None:
+            payload = self._payload
+            if not isinstance(payload, RequestBody):
+                payload = RequestBody.from_bytes(payload)
+            self._stream = payload
+        return self._stream
+
+    @property
+    def cookies(self):
+        """
+        Cookies of the ``Cookie`` header, parsed on first access.
+
+        :rtype dict: cookie name -> value.
+        """
+        if self._cookies is None:
+            cookies = {}
+            header = self.headers.get("cookie", "") if self.headers is not None else ""
+            for pair in header.split(";"):
+                key, sep, value = pair.strip().partition("=")
+                if sep:
+                    cookies[key] = value
+            self._cookies = cookies
+        return self._cookies
+
+    @cookies.setter
+    def cookies(self, cookies):
+        self._cookies = cookies
+
+    @property
+    def query(self):
+        """
+        Parameters of the query string, parsed on first access.
+
+        :rtype dict: name -> list of values.
+        """
+        if self._query is None:
+            _, _, query = (self.path or "").partition("?")
+            self._query = parse_qs(query) if query else {}
+        return self._query
+
+    @property
+    def form(self):
+        """
+        Fields of an ``application/x-www-form-urlencoded`` body (or of a body
+        sent without ``Content-Type``), decoded on first access.
+
+        :rtype dict: name -> list of values; empty for other bodies.
+        """
+        if self._form is None:
+            ctype = self.headers.get("content-type", "") if self.headers is not None else ""
+            form = {}
+            if self.body and (not ctype or ctype.startswith("application/x-www-form-urlencoded")):
+                form = parse_qs(self.body, keep_blank_values=True)
+            self._form = form
+        return self._form
+
+    @property
+    def json(self):
+        """
+        The JSON body, decoded on first access.
+
+        :rtype: the decoded value, or None when the body is empty or not JSON.
+        """
+        if self._json is _UNSET:
+            try:
+                self._json = json.loads(self.body) if self.body else None
+            except ValueError:
+                self._json = None
+        return self._json
 
     def extract_request_line(self, request):
         try:
@@ -482,25 +652,31 @@ class Request():
         return method, path, version
              
     def prepare_headers(self, request):
-        """Prepares the given HTTP headers."""
-        lines = request.split('\r\n')
-        headers = {}
-        for line in lines[1:]:
-            if ': ' in line:
-                key, val = line.split(': ', 1)
-                headers[key.lower()] = val
-        return headers
+        """Prepares the given HTTP headers, parsed on first access."""
+        _, _, block = request.partition('\r\n')
+        return RequestHeaders(block.split('\r\n\r\n', 1)[0])
 
     def prepare(self, request, routes=None):
         """Prepares the entire request with the given parameters."""
 
         # Prepare the request line from the request header
-        self.method, self.path, self.version = self.extract_request_line(request)
-        print("[Request] {} path {} version {}".format(self.method, self.path, self.version))
+        method, path, version = self.extract_request_line(request)
+        headers = self.prepare_headers(request) if path is not None else {}
+        self.prepare_parsed(method, path, version, headers, routes)
+
+    def prepare_parsed(self, method, path, version, headers, routes=None):
+        """Prepares the request from an already split request line and
+        headers (a mapping with lowercase or case-insensitive keys), e.g. as
+        cut out by :class:`HttpParser`."""
+
+        if path == '/':
+            path = '/index.html'
+        self.method, self.path, self.version = method, path, version
+        log.debug("{} path {} version {}", self.method, self.path, self.version, sample=True)
 
         # Handle case where path extraction failed
         if self.path is None:
-            print("[Request] ERROR: Failed to extract path from request")
+            log.warning("Failed to extract path from request")
             self.headers = {}
             return
         
@@ -513,22 +689,12 @@ class Request():
         
         original_path = self.path
 
-        # Split path and query string for route matching
-        if '?' in self.path:
-            route_path, query_string = self.path.split('?', 1)
-        else:
-            route_path = self.path
-            query_string = ''
-
         if routes:
             self.routes = routes
-            # Look up route using path WITHOUT query parameters
-            self.hook = routes.get((self.method, route_path))
-            
-            if not self.hook:
-                print(f"[Request] No route found for {self.method} {route_path}")
+            # The hook is resolved by HttpAdapter.route_request, which also
+            # matches the route paths capturing parameters.
 
-        self.headers = self.prepare_headers(request)
+        self.headers = headers
 
         # Store the original full path in headers so handlers can access query params
         self.headers['path'] = original_path
@@ -536,18 +702,10 @@ class Request():
             # self.hook manipulation goes here
             # ...
             #
-        cookies = self.headers.get('cookie', '')
-            #
-            #  TODO: implement the cookie function here
-            #        by parsing the header            #
-
-        if cookies:
-            for pair in cookies.split(';'):
-                stripped_pair = pair.strip()
-                if '=' in stripped_pair:
-                    key, value = stripped_pair.split('=', 1)
-                    self.cookies[key] = value
-
+        # Cookies and query parameters are parsed on first access, see
+        # :attr:`cookies` and :attr:`query`.
+        self._cookies = self._query = self._form = None
+        self._json = _UNSET
         return
 
     def prepare_body(self, data, files, json=None):
@@ -563,7 +721,7 @@ class Request():
         # TODO prepare the request authentication
         #
 	# self.auth = ...
-        if hasattr(self, 'auth') and self.auth:
+        if self.auth:
             self.prepare_auth(self.auth)
         return
 
@@ -25,9 +25,18 @@ import os
 import mimetypes
 import json
 from .dictionary import CaseInsensitiveDict
+from .log import get_logger
+from .staticcache import STATIC_CACHE
+from .headers import build_header
+from .writer import ChunkedBody, buffers_size
+
+log = get_logger("Response")
 
 BASE_DIR = ""
 
+#: Elapsed time of a response not sent yet; timedelta is immutable.
+NO_ELAPSED = datetime.timedelta(0)
+
 class Response():   
     """The :class:`Response <Response>` object, which contains a
     server's response to an HTTP request.
@@ -113,12 +122,32 @@ class Response():
         self.cookies = CaseInsensitiveDict()
 
         #: The amount of time elapsed between sending the request
-        self.elapsed = datetime.timedelta(0)
+        self.elapsed = NO_ELAPSED
 
         #: The :class:`PreparedRequest <PreparedRequest>` object to which this
         #: is a response.
         self.request = None
 
+    def reset(self):
+        """
+        Forget the previous response, so that the object can be reused for
+        the next request. The header dict, cookie jar and history list are
+        emptied in place rather than allocated again.
+        """
+        self._content = False
+        self._content_consumed = False
+        self._next = None
+        self.status_code = None
+        self.headers.clear()
+        self.url = None
+        self.encoding = None
+        if self.history:
+            del self.history[:]
+        self.reason = None
+        if self.cookies:
+            self.cookies.clear()
+        self.elapsed = NO_ELAPSED
+        self.request = None
 
     def get_mime_type(self, path):
         """
@@ -152,7 +181,7 @@ class Response():
 
         # Processing mime_type based on main_type and sub_type
         main_type, sub_type = mime_type.split('/', 1)
-        print("[Response] processing MIME main_type={} sub_type={}".format(main_type,sub_type))
+        log.debug("processing MIME main_type={} sub_type={}", main_type, sub_type, sample=True)
         if main_type == 'text':
             self.headers['Content-Type']='text/{}'.format(sub_type)
             if sub_type == 'plain' or sub_type == 'css':
@@ -206,7 +235,7 @@ class Response():
 
         filepath = os.path.join(base_dir, path.lstrip('/'))
 
-        print("[Response] serving the object at location {}".format(filepath))
+        log.debug("serving the object at location {}", filepath, sample=True)
             #
             #  TODO: implement the step of fetch the object file
             #        store in the return value of content
@@ -216,19 +245,23 @@ class Response():
     
         try:
             # Check if file exists and is a file (not directory)
-            if os.path.exists(filepath) and os.path.isfile(filepath):
-                # Read the file content in binary mode
-                with open(filepath, 'rb') as f:
-                    content = f.read()
+            if os.path.isfile(filepath):
+                # Served from the shared static cache when it fits in it
+                entry = STATIC_CACHE.get(filepath)
+                if entry is not None:
+                    content = entry.content
+                else:
+                    with open(filepath, 'rb') as f:
+                        content = f.read()
             else:
-                print("[Response] File not found at {}".format(filepath))
+                log.warning("File not found at {}", filepath)
                 # Return empty content for missing files
                 content = b""
         except IOError as e:
-            print("[Response] IOError reading file {}: {}".format(filepath, e))
+            log.error("IOError reading file {}: {}", filepath, e)
             content = b""
         except Exception as e:
-            print("[Response] Unexpected error reading file {}: {}".format(filepath, e))
+            log.error("Unexpected error reading file {}: {}", filepath, e)
             content = b""
 
         return len(content), content
@@ -239,49 +272,22 @@ class Response():
         Constructs the HTTP response headers based on the class:`Request <Request>
         and internal attributes.
 
+        Only response headers are written (see :mod:`daemon.headers`): the
+        status line, ``Date``, ``Content-Length`` of the body and the headers
+        set on the response. The body is never appended here, it is sent next
+        to the header (see :mod:`daemon.writer`). A streamed body has no
+        ``Content-Length``: its end is told by the chunked coding.
+
         :params request (class:`Request <Request>`): incoming request object.
 
         :rtypes bytes: encoded HTTP response header.
         """
-        reqhdr = request.headers
-        rsphdr = self.headers
-
-        #Build dynamic headers
-        headers = {
-                "Accept": "{}".format(reqhdr.get("Accept", "application/json")),
-                "Accept-Language": "{}".format(reqhdr.get("Accept-Language", "en-US,en;q=0.9")),
-                "Authorization": "{}".format(reqhdr.get("Authorization", "Basic <credentials>")),
-                "Cache-Control": "no-cache",
-                "Content-Type": "{}".format(self.headers['Content-Type']),
-                "Content-Length": "{}".format(len(self._content)),
-#                "Cookie": "{}".format(reqhdr.get("Cookie", "sessionid=xyz789")), #dummy cooki
-        #
-        # TODO prepare the request authentication
-        #
-	# self.auth = ...
-                "Date": "{}".format(datetime.datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S GMT")),
-                "Max-Forward": "10",
-                "Pragma": "no-cache",
-                "Proxy-Authorization": "Basic dXNlcjpwYXNz",  # example base64
-                "Warning": "199 Miscellaneous warning",
-                "User-Agent": "{}".format(reqhdr.get("User-Agent", "Chrome/123.0.0.0")),
-            }
-        headers.update(self.headers)
-        fmt_header = "HTTP/1.1 {} {}\r\n".format(self.status_code, self.reason)
-        for key, value in headers.items():
-            fmt_header += "{}: {}\r\n".format(key, value)
-        
-        fmt_header += "\r\n"
-        # Header text alignment
-            #
-            #  TODO: implement the header building to create formated
-            #        header from the provied headers
-            #
-        #
-        # TODO prepare the request authentication
-        #
-	# self.auth = ...
-        return str(fmt_header).encode('utf-8')
+        body = self._content or b""
+        if isinstance(body, ChunkedBody):
+            length = None
+        else:
+            length = buffers_size(body) if isinstance(body, list) else len(body)
+        return build_header(self.status_code, self.reason, self.headers, length)
 
 
     def build_notfound(self):
@@ -315,7 +321,7 @@ class Response():
         path = request.path
 
         mime_type = self.get_mime_type(path)
-        print("[Response] {} path {} mime_type {}".format(request.method, request.path, mime_type))
+        log.debug("{} path {} mime_type {}", request.method, request.path, mime_type, sample=True)
 
         base_dir = ""
 
@@ -339,7 +345,17 @@ class Response():
 
         return self._header + self._content
     
-    def build_response_from_handler(self, request, handler_result):
+    def connection_header(self, keep_alive):
+        """
+        Format the ``Connection`` header line.
+
+        :param keep_alive (bool): Whether the connection stays open after the response.
+
+        :rtype str: the header line, CRLF terminated.
+        """
+        return "Connection: keep-alive\r\n" if keep_alive else "Connection: close\r\n"
+
+    def build_response_from_handler(self, request, handler_result, keep_alive=False):
         """
         Build HTTP response from route handler return value.
         
@@ -351,6 +367,7 @@ class Response():
         
         :param request: Request object
         :param handler_result: Return value from route handler
+        :param keep_alive: Announce a persistent connection instead of closing it
         :return: Complete HTTP response bytes
         """
         
@@ -382,7 +399,7 @@ class Response():
                 # Add standard headers
                 response += "Content-Type: {}\r\n".format(mime_type)
                 response += "Content-Length: {}\r\n".format(len(content))
-                response += "Connection: close\r\n"
+                response += self.connection_header(keep_alive)
                 response += "\r\n"
                 
                 return response.encode('utf-8') + content
@@ -395,20 +412,20 @@ class Response():
                     response = "HTTP/1.1 200 OK\r\n"
                     response += "Content-Type: application/json\r\n"
                     response += "Content-Length: {}\r\n".format(len(content))
-                    response += "Connection: close\r\n"
+                    response += self.connection_header(keep_alive)
                     response += "\r\n"
                     
                     return response.encode('utf-8') + content
                 except Exception as e:
-                    print("[Response] Error encoding JSON: {}".format(e))
-                    return self.build_error_response(500, "Internal Server Error")
+                    log.error("Error encoding JSON: {}", e)
+                    return self.build_error_response(500, "Internal Server Error", keep_alive)
         
         elif isinstance(handler_result, bytes):
             # Binary response
             response = "HTTP/1.1 200 OK\r\n"
             response += "Content-Type: application/octet-stream\r\n"
             response += "Content-Length: {}\r\n".format(len(handler_result))
-            response += "Connection: close\r\n"
+            response += self.connection_header(keep_alive)
             response += "\r\n"
             
             return response.encode('utf-8') + handler_result
@@ -423,7 +440,7 @@ class Response():
                 mime_type = self.get_mime_type(handler_result)
                 
                 if not os.path.exists(file_path):
-                    print("[Response] File not found: {}".format(file_path))
+                    log.warning("File not found: {}", file_path)
                     return self.build_notfound()
                 
                 with open(file_path, 'rb') as f:
@@ -432,20 +449,20 @@ class Response():
                 response = "HTTP/1.1 200 OK\r\n"
                 response += "Content-Type: {}\r\n".format(mime_type or 'application/octet-stream')
                 response += "Content-Length: {}\r\n".format(len(content))
-                response += "Connection: close\r\n"
+                response += self.connection_header(keep_alive)
                 response += "\r\n"
                 
                 return response.encode('utf-8') + content
                 
             except Exception as e:
-                print("[Response] Error serving file {}: {}".format(handler_result, e))
-                return self.build_error_response(500, "Internal Server Error")
+                log.error("Error serving file {}: {}", handler_result, e)
+                return self.build_error_response(500, "Internal Server Error", keep_alive)
         
         else:
             # Unknown type, return error
-            return self.build_error_response(500, "Invalid handler return type")
+            return self.build_error_response(500, "Invalid handler return type", keep_alive)
     
-    def build_error_response(self, status_code, message):
+    def build_error_response(self, status_code, message, keep_alive=False):
         """Build a simple error response"""
         content = message.encode('utf-8')
         status_text = {
@@ -459,7 +476,7 @@ class Response():
         response = "HTTP/1.1 {} {}\r\n".format(status_code, status_text)
         response += "Content-Type: text/plain\r\n"
         response += "Content-Length: {}\r\n".format(len(content))
-        response += "Connection: close\r\n"
+        response += self.connection_header(keep_alive)
         response += "\r\n"
         
         return response.encode('utf-8') + content
@@ -0,0 +1,294 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.routing
+~~~~~~~~~~~~~~~~~
+
+This module provides the compiled route table used to dispatch requests.
+
+The routes registered on a :class:`WeApRous <WeApRous>` app are compiled once,
+when the app starts, into a ``path -> method -> handler`` index with the
+``Allow`` header value of every path precomputed. Resolving a static path is
+then a constant number of dict lookups whatever the number of routes, and
+tells apart ``404`` (unknown path) from ``405`` (known path, other methods).
+
+Route paths may capture parts of the request path:
+
+- ``<name>`` matches one path segment, e.g. ``/channels/<name>/messages``;
+- ``<path:name>`` matches the rest of the path, slashes included, e.g.
+  ``/static/<path:filename>``.
+
+Those routes are stored in a tree keyed by path segments (a radix tree whose
+edges are whole segments), so matching costs one dict lookup per segment of
+the request path, not one test per route. Static segments win over ``<name>``,
+which wins over ``<path:name>``. The percent-decoded captures are passed to
+the handler as keyword arguments.
+
+The route key spellings accepted by the former adapter lookup are normalized
+at compile time: ``(METHOD, PATH)``, ``(PATH, METHOD)``, ``"METHOD /path"``,
+``"METHOD:/path"`` and a bare ``"/path"`` matching every method.
+
+Usage Example:
+--------------
+>>> table = RouteTable({("GET", "/hello"): hello})
+>>> table.resolve("GET", "/hello")
+(<function hello>, 'GET', {})
+>>> table.resolve("POST", "/hello")
+(None, 'GET', {})
+>>> table[("GET", "/users/<uid>")] = user
+>>> table.resolve("GET", "/users/42")
+(<function user>, 'GET', {'uid': '42'})
+"""
+
+import re
+from urllib.parse import unquote
+
+#: Method placeholder of routes registered for every method.
+ANY_METHOD = "*"
+
+#: Paths served by the route of another path when they have none of their own.
+INDEX_ALIASES = {
+    "/": "/index.html",
+    "/index.html": "/",
+    "/index.htm": "/",
+}
+
+
+#: A path segment capturing a parameter: ``<name>`` or ``<path:name>``.
+PARAM_SEGMENT = re.compile(r"^<(?:(path):)?([A-Za-z_][A-Za-z0-9_]*)>$")
+
+
+def is_pattern(path):
+    """
+    Tell whether a route path captures parameters.
+
+    :param path (str): Route path.
+
+    :rtype bool
+    """
+    return "<" in path
+
+
+class RouteNode:
+    """
+    One path segment of the route tree.
+    """
+
+    __slots__ = ("children", "param", "wildcard", "name", "methods", "pattern")
+
+    def __init__(self, name=None):
+        #: static segment -> RouteNode
+        self.children = {}
+        #: Node matching any single segment.
+        self.param = None
+        #: Node matching the rest of the path.
+        self.wildcard = None
+        #: Parameter captured by this node.
+        self.name = name
+        #: {METHOD: handler} of the route ending at this node.
+        self.methods = None
+        #: Route path ending at this node.
+        self.pattern = None
+
+
+def iter_routes(routes):
+    """
+    Normalize route definitions into ``(METHOD, path, handler)`` triples.
+
+    :param routes (dict|list): Route mapping, or list of ``(key, handler)`` pairs.
+
+    :rtype generator: the normalized routes; entries that are not callable
+                      or whose key cannot be understood are skipped.
+    """
+    items = routes.items() if isinstance(routes, dict) else routes
+    for item in items:
+        try:
+            key, handler = item[0], item[1]
+        except (TypeError, IndexError):
+            continue
+        if not callable(handler):
+            continue
+
+        if isinstance(key, (tuple, list)) and len(key) >= 2:
+            method, path = str(key[0]), str(key[1])
+            if method.startswith("/") and not path.startswith("/"):
+                # Reversed (PATH, METHOD) key.
+                method, path = path, method
+        elif isinstance(key, str):
+            key = key.strip()
+            if key.startswith("/"):
+                method, path = ANY_METHOD, key
+            else:
+                method, _, path = key.replace(":", " ", 1).partition(" ")
+                path = path.strip()
+        else:
+            continue
+
+        if not path.startswith("/"):
+            path = "/" + path
+        yield method.upper(), path, handler
+
+
+class RouteTable(dict):
+    """
+    Routes keyed by ``(METHOD, path)``, compiled into a per-path index.
+
+    The class is a :class:`dict` so it can be passed wherever the raw route
+    mapping was used; entries added with ``table[(method, path)] = handler``
+    are indexed as well.
+
+    Attributes:
+        paths (dict): static path -> {METHOD: handler}.
+        tree (RouteNode): Root of the tree of the routes capturing parameters.
+        allowed (dict): route path -> ``Allow`` header value.
+    """
+
+    __attrs__ = [
+        "paths",
+        "tree",
+        "allowed",
+    ]
+
+    def __init__(self, routes=()):
+        """
+        Compile a route mapping.
+
+        :param routes (dict|list): Route definitions, see :func:`iter_routes`.
+        """
+        super().__init__()
+        self.paths = {}
+        self.tree = RouteNode()
+        self.allowed = {}
+        for method, path, handler in iter_routes(routes):
+            self[(method, path)] = handler
+
+    def __setitem__(self, key, handler):
+        method, path = key
+        if is_pattern(path):
+            methods = self.insert(path)
+        else:
+            methods = self.paths.setdefault(path, {})
+        super().__setitem__(key, handler)
+        methods[method] = handler
+        self.allowed[path] = ", ".join(sorted(m for m in methods if m != ANY_METHOD))
+
+    def insert(self, pattern):
+        """
+        Add the nodes of a route path capturing parameters.
+
+        :param pattern (str): Route path, e.g. ``/channels/<name>/messages``.
+
+        :rtype dict: the {METHOD: handler} mapping of the route.
+        :raise ValueError: If the pattern is malformed or conflicts with
+                           another route on a parameter name.
+        """
+        node = self.tree
+        segments = pattern.strip("/").split("/")
+        for i, segment in enumerate(segments):
+            match = PARAM_SEGMENT.match(segment)
+            if match is None:
+                if "<" in segment or ">" in segment:
+                    raise ValueError("Malformed route segment {!r} in {}".format(segment, pattern))
+                node = node.children.setdefault(segment, RouteNode())
+                continue
+
+            kind, name = match.groups()
+            if kind == "path":
+                if i != len(segments) - 1:
+                    raise ValueError("<path:{}> must end the route {}".format(name, pattern))
+                if node.wildcard is None:
+                    node.wildcard = RouteNode(name)
+                child = node.wildcard
+            else:
+                if node.param is None:
+                    node.param = RouteNode(name)
+                child = node.param
+            if child.name != name:
+                raise ValueError("Route {} names <{}> a parameter already named <{}>".format(
+                    pattern, name, child.name))
+            node = child
+
+        if node.methods is None:
+            node.methods = {}
+            node.pattern = pattern
+        return node.methods
+
+    def match(self, node, segments, i, params):
+        """
+        Walk the route tree along the request path segments.
+
+        :param node (RouteNode): Current node.
+        :param segments (list): Request path segments.
+        :param i (int): Index of the segment to match below ``node``.
+        :param params (dict): Receives the captured parameters.
+
+        :rtype RouteNode: the node ending the matched route, or None.
+        """
+        if i == len(segments):
+            return node if node.methods is not None else None
+
+        segment = segments[i]
+        child = node.children.get(segment)
+        if child is not None:
+            found = self.match(child, segments, i + 1, params)
+            if found is not None:
+                return found
+        if node.param is not None and segment:
+            found = self.match(node.param, segments, i + 1, params)
+            if found is not None:
+                params[node.param.name] = unquote(segment)
+                return found
+        if node.wildcard is not None and node.wildcard.methods is not None:
+            params[node.wildcard.name] = unquote("/".join(segments[i:]))
+            return node.wildcard
+        return None
+
+    def resolve(self, method, path):
+        """
+        Find the handler of a request.
+
+        :param method (str): Uppercase request method.
+        :param path (str): Request path, without the query string.
+
+        :rtype tuple: (handler, allowed, params). ``handler`` is None when
+                      nothing matches; ``allowed`` is then None for an unknown
+                      path (404) or the ``Allow`` header value of the path (405).
+                      ``params`` holds the parameters captured by the route.
+        """
+        params = {}
+        methods = self.paths.get(path)
+        if methods is None:
+            alias = INDEX_ALIASES.get(path)
+            methods = self.paths.get(alias) if alias else None
+            if methods is not None:
+                path = alias
+            else:
+                node = self.match(self.tree, path.strip("/").split("/"), 0, params)
+                if node is None:
+                    return None, None, params
+                methods, path = node.methods, node.pattern
+        handler = methods.get(method) or methods.get(ANY_METHOD)
+        return handler, self.allowed[path], params
+
+
+def compile_routes(routes):
+    """
+    Compile the routes handed to a serving engine, once, when it starts.
+
+    :param routes (dict|list): Route definitions, or an already compiled table.
+
+    :rtype RouteTable: ``routes`` itself if it is already a :class:`RouteTable`.
+    """
+    if isinstance(routes, RouteTable):
+        return routes
+    return RouteTable(routes or {})
@@ -0,0 +1,361 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.staticcache
+~~~~~~~~~~~~~~~~~
+
+This module provides the in-memory cache of the static files served by the
+backend (``www/``, ``static/`` and any path returned by a handler).
+
+An entry holds the file bytes and the response headers precomputed from
+them (content type, hash ``ETag`` and ``Last-Modified``), plus its ``gzip``
+and ``deflate`` variants when the file is compressible, keyed by absolute
+path. A hit costs one dict lookup; the file is only
+``os.stat``-ed again once the entry is older than ``revalidate_interval``
+seconds, and re-read when its size, mtime or inode changed. The entries are kept in least recently used order and evicted once
+their total size exceeds ``max_bytes``. Files larger than ``max_entry_size``
+are not cached, the backend sends them with ``sendfile`` instead.
+An optional :attr:`StaticCache.transform` hook may rewrite the bytes of a file
+when it is read (the HTML pages referencing fingerprinted assets); headers and
+variants are computed from the rewritten bytes.
+
+:meth:`StaticCache.preload` reads (and compresses) the files of the static
+directories when the backend starts, before the workers are forked.
+
+Usage Example:
+--------------
+>>> cache = StaticCache(max_bytes=32 * 1024 * 1024, revalidate_interval=1.0)
+>>> entry = cache.get("static/js/chat.js")
+>>> entry.headers["Content-Type"], len(entry.content)
+('text/javascript', 34596)
+>>> content, headers = entry.select("gzip, deflate")
+>>> headers["Content-Encoding"]
+'gzip'
+>>> cache.stats()["hit_ratio"]
+0.0
+"""
+
+import collections
+import mimetypes
+import os
+import threading
+import time
+
+from .validators import file_validators
+from .compression import (ENCODINGS, MIN_SIZE as COMPRESS_MIN_SIZE, choose_encoding,
+                          compress, is_compressible, variant_etag)
+
+#: Default budget of the cached file bytes.
+MAX_BYTES = 32 * 1024 * 1024
+#: Default size above which files are not cached.
+MAX_ENTRY_SIZE = 1024 * 1024
+#: Default seconds between two ``os.stat`` checks of a cached file.
+REVALIDATE_INTERVAL = 1.0
+#: Directories read into the cache when the backend starts.
+PRELOAD_DIRS = ("www", "static")
+
+
+class StaticEntry:
+    """
+    A cached file.
+
+    Attributes:
+        path (str): Path of the file, the cache key.
+        content (bytes): File bytes.
+        headers (dict): Response headers precomputed for the file.
+        variants (dict): content coding -> (compressed bytes, headers).
+        size (int): File size when read.
+        mtime_ns (int): Modification time when read.
+        ino (int): Inode when read.
+        checked (float): ``time.monotonic()`` of the last validation.
+    """
+
+    __slots__ = ("path", "content", "headers", "variants", "size", "mtime_ns",
+                 "ino", "checked")
+
+    def __init__(self, path, content, headers, stat, checked):
+        self.path = path
+        self.content = content
+        self.headers = headers
+        self.variants = {}
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.ino = stat.st_ino
+        self.checked = checked
+
+    def matches(self, stat):
+        """
+        Tell whether the file is unchanged since it was read.
+
+        :param stat (os.stat_result): Fresh status of the file.
+
+        :rtype bool
+        """
+        return (stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+                and stat.st_ino == self.ino)
+
+    @property
+    def weight(self):
+        """
+        :rtype int: bytes held by the entry, variants included.
+        """
+        return len(self.content) + sum(len(v[0]) for v in self.variants.values())
+
+    def compress_variants(self):
+        """
+        Compute the compressed variants of a compressible file, keeping only
+        those smaller than the original.
+        """
+        if len(self.content) < COMPRESS_MIN_SIZE or not is_compressible(self.headers["Content-Type"]):
+            return
+        for encoding in ENCODINGS:
+            data = compress(self.content, encoding)
+            if len(data) < len(self.content):
+                headers = dict(self.headers)
+                headers["Content-Encoding"] = encoding
+                headers["ETag"] = variant_etag(self.headers["ETag"], encoding)
+                self.variants[encoding] = (data, headers)
+        # Set on the original too: its absence must not be cached for
+        # clients that accept a coding.
+        self.headers["Vary"] = "Accept-Encoding"
+        for _, headers in self.variants.values():
+            headers["Vary"] = "Accept-Encoding"
+
+    def select(self, accept_encoding):
+        """
+        Pick the variant matching the client ``Accept-Encoding``.
+
+        :param accept_encoding (str): The request header, or None.
+
+        :rtype tuple: (bytes, headers) of the variant, or of the original.
+        """
+        if self.variants:
+            encoding = choose_encoding(accept_encoding, tuple(self.variants))
+            if encoding is not None:
+                return self.variants[encoding]
+        return self.content, self.headers
+
+
+class StaticCache:
+    """
+    Byte-budgeted LRU cache of static files, shared by the threads of a process.
+
+    Attributes:
+        max_bytes (int): Budget of the cached bytes; 0 disables the cache.
+        max_entry_size (int): Largest cached file.
+        revalidate_interval (float): Seconds a cached file is served without
+                                     checking it on disk.
+        transform (callable): ``transform(path, content) -> content`` applied
+                              to the files read, or None.
+    """
+
+    __attrs__ = [
+        "max_bytes",
+        "max_entry_size",
+        "revalidate_interval",
+        "transform",
+    ]
+
+    def __init__(self, max_bytes=MAX_BYTES, max_entry_size=MAX_ENTRY_SIZE,
+                 revalidate_interval=REVALIDATE_INTERVAL):
+        """
+        Initialize a new StaticCache instance.
+
+        :param max_bytes (int): Budget of the cached bytes; 0 disables the cache.
+        :param max_entry_size (int): Largest cached file.
+        :param revalidate_interval (float): Seconds between two checks of a file.
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_size = max_entry_size
+        self.revalidate_interval = revalidate_interval
+        self.transform = None
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.uncacheable = 0
+
+    def configure(self, max_bytes=None, revalidate_interval=None, max_entry_size=None):
+        """
+        Change the cache limits; options left to None are unchanged.
+
+        :param max_bytes (int): Budget of the cached bytes; 0 disables the cache.
+        :param revalidate_interval (float): Seconds between two checks of a file.
+        :param max_entry_size (int): Largest cached file.
+        """
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max(0, int(max_bytes))
+            if revalidate_interval is not None:
+                self.revalidate_interval = max(0.0, float(revalidate_interval))
+            if max_entry_size is not None:
+                self.max_entry_size = max(0, int(max_entry_size))
+            self._evict()
+
+    @property
+    def enabled(self):
+        """
+        :rtype bool: False when the byte budget is 0.
+        """
+        return self.max_bytes > 0
+
+    def get(self, path, mime=None):
+        """
+        Return the cached entry of a file, reading or refreshing it if needed.
+
+        :param path (str): Path of the file.
+        :param mime (str): Content type; guessed from the path when None.
+
+        :rtype StaticEntry: the entry, or None when the file is not cacheable
+                            (too large, or the cache is disabled).
+        :raise OSError: If the file cannot be found or read.
+        """
+        if not self.max_bytes:
+            return None
+        key = os.path.abspath(path)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if now - entry.checked < self.revalidate_interval:
+                    self.hits += 1
+                    return entry
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.discard(key)
+            raise
+        if entry is not None and entry.matches(stat):
+            entry.checked = now
+            with self._lock:
+                self.hits += 1
+                self.revalidations += 1
+            return entry
+
+        if stat.st_size > self.max_entry_size or stat.st_size > self.max_bytes:
+            self.discard(key)
+            with self._lock:
+                self.misses += 1
+                self.uncacheable += 1
+            return None
+
+        with open(path, "rb") as f:
+            content = f.read()
+        if self.transform is not None:
+            content = self.transform(path, content)
+        mime = mime or mimetypes.guess_type(path)[0] or "application/octet-stream"
+        entry = StaticEntry(path, content, self.build_headers(content, mime, stat),
+                            stat, now)
+        entry.compress_variants()
+        with self._lock:
+            self.misses += 1
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old.weight
+            self._entries[key] = entry
+            self.size += entry.weight
+            self._evict()
+        return entry
+
+    def preload(self, directories=PRELOAD_DIRS):
+        """
+        Read the files of some directories into the cache, compressing them.
+
+        Missing directories and unreadable files are skipped.
+
+        :param directories (tuple): Directories to walk.
+
+        :rtype int: number of cached files.
+        """
+        if not self.max_bytes:
+            return 0
+        count = 0
+        for directory in directories:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    try:
+                        if self.get(os.path.join(root, name)) is not None:
+                            count += 1
+                    except OSError:
+                        continue
+        return count
+
+    def build_headers(self, content, mime, stat):
+        """
+        Compute the response headers of a file once, when it is cached.
+
+        :param content (bytes): File bytes.
+        :param mime (str): Content type.
+        :param stat (os.stat_result): Status of the file.
+
+        :rtype dict: ``Content-Type`` and the validators, the ETag being the
+                     hash of the content.
+        """
+        headers = {"Content-Type": mime}
+        headers.update(file_validators(stat, content))
+        return headers
+
+    def discard(self, path):
+        """
+        Drop the entry of a file, if cached.
+
+        :param path (str): Path of the file.
+        """
+        with self._lock:
+            entry = self._entries.pop(os.path.abspath(path), None)
+            if entry is not None:
+                self.size -= entry.weight
+
+    def clear(self):
+        """
+        Drop every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _evict(self):
+        """
+        Drop the least recently used entries until the budget is met; the
+        lock must be held.
+        """
+        while self._entries and self.size > self.max_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self.size -= entry.weight
+            self.evictions += 1
+
+    def stats(self):
+        """
+        :rtype dict: entry count, cached bytes, hit/miss counters and ratio.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "uncacheable": self.uncacheable,
+            }
+
+
+#: Cache shared by every adapter of the process.
+STATIC_CACHE = StaticCache()
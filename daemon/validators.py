@@ -0,0 +1,135 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.validators
+~~~~~~~~~~~~~~~~~
+
+This module provides the HTTP cache validators (``ETag``, ``Last-Modified``)
+of the responses and the evaluation of conditional ``GET`` requests
+(``If-None-Match``, ``If-Modified-Since``, RFC 9110 section 13).
+
+ETags are strong: the hash of the body. For cached static files it is
+computed once, when the file is read into the cache; files too large for the
+cache use their size and modification time instead, like most servers, so
+they are never read just to be validated.
+
+Usage Example:
+--------------
+>>> etag = make_etag(b"body")
+>>> not_modified({"if-none-match": etag}, etag, None)
+True
+"""
+
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+
+
+def make_etag(content):
+    """
+    Strong entity tag of a body.
+
+    :param content (bytes): The body.
+
+    :rtype str: the quoted tag.
+    """
+    return '"{}"'.format(hashlib.blake2b(content, digest_size=16).hexdigest())
+
+
+def file_etag(stat):
+    """
+    Entity tag of a file that is not hashed, from its size and mtime.
+
+    :param stat (os.stat_result): Status of the file.
+
+    :rtype str: the quoted tag.
+    """
+    return '"{:x}-{:x}"'.format(stat.st_mtime_ns, stat.st_size)
+
+
+def http_date(timestamp):
+    """
+    Format a timestamp as an HTTP date, e.g. ``Sun, 06 Nov 1994 08:49:37 GMT``.
+
+    :param timestamp (float): Seconds since the epoch.
+
+    :rtype str
+    """
+    return formatdate(timestamp, usegmt=True)
+
+
+def file_validators(stat, content=None):
+    """
+    Validator headers of a file.
+
+    :param stat (os.stat_result): Status of the file.
+    :param content (bytes): The file bytes, hashed for the ETag when given.
+
+    :rtype dict: ``ETag`` and ``Last-Modified`` headers.
+    """
+    return {
+        "ETag": make_etag(content) if content is not None else file_etag(stat),
+        "Last-Modified": http_date(stat.st_mtime),
+    }
+
+
+def etag_matches(header, etag):
+    """
+    Evaluate ``If-None-Match`` (weak comparison, RFC 9110 section 13.1.2).
+
+    :param header (str): The request header value.
+    :param etag (str): Tag of the current representation.
+
+    :rtype bool
+    """
+    if header.strip() == "*":
+        return True
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(headers, etag, last_modified):
+    """
+    Tell whether a conditional ``GET`` can be answered with ``304 Not Modified``.
+
+    ``If-None-Match`` wins over ``If-Modified-Since``, which is only looked at
+    when the request carries no entity tags.
+
+    :param headers (dict): Request headers with lowercase keys.
+    :param etag (str): ``ETag`` of the response, or None.
+    :param last_modified (str): ``Last-Modified`` of the response, or None.
+
+    :rtype bool
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+        modified = parsedate_to_datetime(last_modified)
+    except (TypeError, ValueError, IndexError):
+        # Invalid dates are ignored (RFC 9110 section 13.1.3).
+        return False
+    if since.tzinfo is None or modified.tzinfo is None:
+        return False
+    return modified <= since
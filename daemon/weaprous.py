@@ -119,6 +119,12 @@ This module provides a WeApRous object to deploy RESTful url web app with routin
 """
 
 from .backend import create_backend
+from .routing import RouteTable
+from .context import takes_context
+from .websocket import WebSocketRoute
+from .log import get_logger
+
+log = get_logger("WeApRous")
 
 class WeApRous:
     """The fully mutable :class:`WeApRous <WeApRous>` object, which is a lightweight,
@@ -130,6 +136,10 @@ class WeApRous:
     Each route is mapped to a handler function based on HTTP method and path. It mappings
     supports tracking the combined HTTP methods and path route mappings internally.
 
+    A handler receives a :class:`RequestContext <RequestContext>` (query, form
+    and JSON body decoded once) unless it declares the original ``headers`` /
+    ``body`` parameters, which are still supported as they were.
+
     Usage::
       >>> import daemon.weaprous
       >>> app = WeApRous()
@@ -141,7 +151,21 @@ class WeApRous:
       >>> def hello(headers, body):
       >>>     return {'message': 'Hello, world!'}
 
-      >>> app.run()
+      >>> @app.route('/slow', methods=['GET'])
+      >>> async def slow(headers, body):
+      >>>     await asyncio.sleep(1)
+      >>>     return {'message': 'done'}
+
+      >>> @app.route('/channels/<name>/messages', methods=['POST'])
+      >>> def post(ctx, name):
+      >>>     return {'channel': name, 'text': (ctx.json or {}).get('text')}
+
+      >>> @app.websocket('/ws')
+      >>> def chat(ws):
+      >>>     for message in ws:
+      >>>         ws.send(message)
+
+      >>> app.run(engine="asyncio")
     """
 
     def __init__(self):
@@ -151,6 +175,8 @@ class WeApRous:
         Sets up an empty route registry and prepares placeholders for IP and port.
         """
         self.routes = {}
+        #: Routes compiled by :meth:`run`.
+        self.route_table = None
         self.ip = None
         self.port = None
         return
@@ -172,9 +198,13 @@ class WeApRous:
         :param path (str): The URL path to route.
         :param methods (list): A list of HTTP methods (e.g., ['GET', 'POST']) to bind.
 
+        The handler signature, ``(ctx, **params)`` or the original
+        ``(headers, body, **params)``, is looked up once here.
+
         :rtype: function - A decorator that registers the handler function.
         """
         def decorator(func):
+            takes_context(func)
             # register for each method
             for m in methods:
                 key = (str(m).upper(), path)
@@ -188,18 +218,63 @@ class WeApRous:
             return func
         return decorator
 
-    def run(self):
+    def websocket(self, path, origins=None):
+        """
+        Decorator to register the handler of a WebSocket route.
+
+        A ``GET`` of the path asking to upgrade to WebSocket is answered
+        ``101 Switching Protocols``, then the handler is called with the
+        :class:`WebSocket <WebSocket>` of the connection (``ws.ctx`` is the
+        upgrade request) plus the parameters captured by the path. The
+        connection is closed when it returns. Other requests to the path get
+        ``426 Upgrade Required``.
+
+        :param path (str): The URL path to route.
+        :param origins: ``Origin`` of the pages allowed to connect: None for
+                        the pages served by this host, ``"*"`` for any page,
+                        or a list such as ``['https://chat.example.org']``.
+
+        :rtype: function - A decorator that registers the handler function.
+        """
+        def decorator(func):
+            self.routes[("GET", path)] = WebSocketRoute(func, origins)
+            try:
+                func._route_path = path
+                func._route_methods = ["GET"]
+            except Exception:
+                pass
+            return func
+        return decorator
+
+    def run(self, engine="thread", **options):
         """
         Start the backend server and begin handling requests.
 
         This method launches the TCP server using the configured IP and port,
         and dispatches incoming requests to the registered route handlers.
 
+        :param engine (str): Serving engine, ``thread`` (one thread per connection),
+                             ``pool`` (bounded worker pool), ``asyncio``
+                             (single event loop, ``async def`` handlers awaited)
+                             or ``reactor`` (selectors event loop plus handler pool).
+        :param options: Engine sizing and process count forwarded to :func:`create_backend`
+                        (``threads``, ``queue_size``, ``overflow``, ``stats_interval``,
+                        ``workers``, ``reuse_port``, ``report_interval``).
+
         :raise: Error if IP or port has not been configured.
         """
         if not self.ip or not self.port:
-            print("Rous app need to preapre address"
-                  "by calling app.prepare_address(ip,port)")
+            log.warning("Rous app need to preapre address "
+                        "by calling app.prepare_address(ip,port)")
+
+        self.route_table = self.compile_routes()
+        create_backend(self.ip, self.port, self.route_table, engine=engine, **options)
 
-        create_backend(self.ip, self.port, self.routes)
+    def compile_routes(self):
+        """
+        Compile the registered routes into the table used for dispatch.
+
+        :rtype RouteTable: path -> method -> handler index of :attr:`routes`.
+        """
+        return RouteTable(self.routes)
         
@@ -0,0 +1,844 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.websocket
+~~~~~~~~~~~~~~~~~
+
+This module provides WebSocket (RFC 6455) connections for the routes
+registered with :meth:`WeApRous.websocket <WeApRous.websocket>`.
+
+A ``GET`` of such a route asking for ``Upgrade: websocket`` is answered
+``101 Switching Protocols`` by the :class:`HttpAdapter <HttpAdapter>` (see
+:func:`handshake`); the engine then leaves the socket to
+:func:`serve_websocket`, which calls the handler with a :class:`WebSocket`.
+The frames are cut out by a :class:`FrameParser`: client frames must be
+masked, fragmented messages are reassembled up to :data:`MAX_MESSAGE_SIZE`
+bytes, text is checked to be UTF-8, pings are answered and the closing
+handshake is carried out.
+
+The handler receives with blocking :meth:`WebSocket.receive` calls.
+:meth:`WebSocket.send` may be called from any thread, e.g. by the handler of
+another connection: frames are queued, up to :data:`MAX_QUEUED_BYTES`, and
+written by the thread of the connection, which a ``send`` never blocks. A
+peer silent for :data:`PING_INTERVAL` seconds is pinged, and dropped if it
+does not answer within as long.
+
+A connection holds a thread for its lifetime: the one that served its
+upgrade request with the ``thread`` and ``pool`` engines, one of its own with
+the ``asyncio`` and ``reactor`` engines.
+
+Usage Example:
+--------------
+>>> @app.websocket('/echo')
+>>> def echo(ws):
+>>>     for message in ws:
+>>>         ws.send(message)
+"""
+
+import base64
+import collections
+import hashlib
+import selectors
+import socket
+import struct
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .context import RequestContext
+from .headers import build_header
+from .writer import send_some, buffers_size
+from .log import get_logger
+
+log = get_logger("WebSocket")
+
+#: Appended to ``Sec-WebSocket-Key`` to compute ``Sec-WebSocket-Accept``.
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+#: The only protocol version, sent back to clients asking for another one.
+VERSION = "13"
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+CLOSE_NORMAL = 1000
+CLOSE_GOING_AWAY = 1001
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_UNSUPPORTED_DATA = 1003
+#: Reported for a close frame without a code; never sent.
+CLOSE_NO_STATUS = 1005
+#: Reported for a connection lost without closing handshake; never sent.
+CLOSE_ABNORMAL = 1006
+CLOSE_INVALID_DATA = 1007
+CLOSE_POLICY_VIOLATION = 1008
+CLOSE_MESSAGE_TOO_BIG = 1009
+CLOSE_INTERNAL_ERROR = 1011
+
+#: Largest message accepted, fragments included; larger ones close with 1009.
+MAX_MESSAGE_SIZE = 1024 * 1024
+#: Bytes queued for a peer before it is dropped as too slow.
+MAX_QUEUED_BYTES = 4 * 1024 * 1024
+#: Seconds of silence before the peer is pinged, then before it is dropped.
+PING_INTERVAL = 20.0
+#: Seconds to wait for the close frame of the peer after sending ours.
+CLOSE_TIMEOUT = 5.0
+#: Bytes read from the socket at once.
+RECV_SIZE = 64 * 1024
+
+
+class HandshakeError(Exception):
+    """
+    An upgrade request refused; it is answered with :attr:`status` and the
+    connection is closed.
+    """
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+    def response(self):
+        """
+        Build the complete error response.
+
+        :rtype bytes: HTTP response closing the connection.
+        """
+        body = str(self).encode("utf-8")
+        headers = {"Content-Type": "text/plain", "Connection": "close"}
+        headers.update(self.headers)
+        return build_header(self.status, None, headers, len(body)) + body
+
+
+class ProtocolError(Exception):
+    """
+    A frame breaking the protocol; the connection is closed with :attr:`code`.
+    """
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def accept_key(key):
+    """
+    :param key (str): The ``Sec-WebSocket-Key`` of the request.
+
+    :rtype str: the ``Sec-WebSocket-Accept`` proving the upgrade was understood.
+    """
+    digest = hashlib.sha1((key + GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def header_tokens(value):
+    """
+    :rtype set: lowercase tokens of a comma-separated header value.
+    """
+    return {token.strip().lower() for token in (value or "").split(",")}
+
+
+def normalize_origin(origin):
+    """
+    :param origin (str): An origin, e.g. ``http://Host:8000/``.
+
+    :rtype str: the origin compared by :func:`origin_allowed`, e.g.
+                ``http://host:8000``.
+    """
+    return origin.strip().lower().rstrip("/")
+
+
+def origin_allowed(origin, host, origins=None):
+    """
+    Check the ``Origin`` of a browser opening a WebSocket. Cookies are sent
+    along whatever page opens it, so a page of another site must not be
+    able to act on behalf of a logged in user.
+
+    :param origin (str): The ``Origin`` header, e.g. ``http://host:8000``.
+    :param host (str): The ``Host`` header of the request.
+    :param origins: None for pages of ``host`` only, ``"*"`` for any page,
+                    or a collection of allowed origins.
+
+    :rtype bool
+    """
+    if origins == "*":
+        return True
+    if origins is not None:
+        return normalize_origin(origin) in {normalize_origin(allowed) for allowed in origins}
+    return bool(host) and urlsplit(origin).netloc.lower() == host.lower()
+
+
+def handshake(req, origins=None):
+    """
+    Check a request to a WebSocket route and build its ``101 Switching
+    Protocols`` response.
+
+    :param req (Request): The prepared ``GET`` request.
+    :param origins: Allowed ``Origin`` values, see :func:`origin_allowed`.
+
+    :rtype bytes: the response header.
+    :raise HandshakeError: ``426`` for a request that is not an upgrade or
+                           asks for another version, ``400`` for a malformed
+                           one, ``403`` for a foreign origin.
+    """
+    headers = req.headers
+    if ("websocket" not in header_tokens(headers.get("upgrade"))
+            or "upgrade" not in header_tokens(headers.get("connection"))):
+        raise HandshakeError(426, "WebSocket upgrade required",
+                             {"Upgrade": "websocket", "Sec-WebSocket-Version": VERSION})
+    if req.version != "HTTP/1.1":
+        raise HandshakeError(400, "WebSocket upgrade requires HTTP/1.1")
+    if headers.get("sec-websocket-version") != VERSION:
+        raise HandshakeError(426, "Unsupported WebSocket version",
+                             {"Sec-WebSocket-Version": VERSION})
+    key = (headers.get("sec-websocket-key") or "").strip()
+    try:
+        valid = len(base64.b64decode(key, validate=True)) == 16
+    except ValueError:
+        valid = False
+    if not valid:
+        raise HandshakeError(400, "Invalid Sec-WebSocket-Key")
+    origin = headers.get("origin")
+    if origin is not None and not origin_allowed(origin, headers.get("host"), origins):
+        raise HandshakeError(403, "Origin not allowed")
+    return build_header(101, None, {
+        "Upgrade": "websocket",
+        "Connection": "Upgrade",
+        "Sec-WebSocket-Accept": accept_key(key),
+    })
+
+
+def frame_header(opcode, length):
+    """
+    Header of a final, unmasked frame, as servers send them.
+
+    :param opcode (int): Frame opcode.
+    :param length (int): Payload length.
+
+    :rtype bytes
+    """
+    if length < 126:
+        return bytes((0x80 | opcode, length))
+    if length < 0x10000:
+        return struct.pack("!BBH", 0x80 | opcode, 126, length)
+    return struct.pack("!BBQ", 0x80 | opcode, 127, length)
+
+
+def unmask(payload, key):
+    """
+    Apply the masking key of a client frame, four bytes at a time with one
+    integer XOR instead of byte by byte.
+
+    :param payload (bytes-like): The masked payload.
+    :param key (bytes): The 4-byte masking key.
+
+    :rtype bytes
+    """
+    n = len(payload)
+    if not n:
+        return b""
+    mask = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, "little") ^ int.from_bytes(mask, "little")).to_bytes(n, "little")
+
+
+def parse_close(payload):
+    """
+    :param payload (bytes): Payload of a close frame.
+
+    :rtype tuple: (code, reason).
+    :raise ProtocolError: If the code is invalid or the reason not UTF-8.
+    """
+    if not payload:
+        return CLOSE_NO_STATUS, ""
+    if len(payload) < 2:
+        raise ProtocolError(CLOSE_PROTOCOL_ERROR, "truncated close code")
+    code = struct.unpack_from("!H", payload)[0]
+    if not (1000 <= code <= 1014 and code not in (1004, 1005, 1006) or 3000 <= code <= 4999):
+        raise ProtocolError(CLOSE_PROTOCOL_ERROR, "invalid close code {}".format(code))
+    try:
+        return code, payload[2:].decode("utf-8")
+    except UnicodeDecodeError:
+        raise ProtocolError(CLOSE_INVALID_DATA, "close reason is not UTF-8")
+
+
+class FrameParser:
+    """
+    Incremental parser of the frames sent by a client.
+
+    Attributes:
+        max_message_size (int): Largest message accepted, fragments included.
+    """
+
+    __attrs__ = [
+        "max_message_size",
+    ]
+
+    __slots__ = ("max_message_size", "_buf", "_opcode", "_fragments", "_size")
+
+    def __init__(self, max_message_size=MAX_MESSAGE_SIZE):
+        """
+        :param max_message_size (int): Largest message accepted.
+        """
+        self.max_message_size = max_message_size
+        self._buf = bytearray()
+        #: Opcode of the fragmented message in progress, or None.
+        self._opcode = None
+        self._fragments = []
+        self._size = 0
+
+    def feed(self, data):
+        """
+        Add received bytes and cut out the complete frames.
+
+        :param data (bytes-like): The bytes received.
+
+        :rtype list: ``(opcode, payload)`` of the complete messages and the
+                     control frames, in order: str for text, bytes for
+                     binary messages, pings and pongs, ``(code, reason)``
+                     for a close frame.
+        :raise ProtocolError: If a frame breaks the protocol.
+        """
+        buf = self._buf
+        buf += data
+        pos, end = 0, len(buf)
+        events = []
+        try:
+            while end - pos >= 2:
+                b0, b1 = buf[pos], buf[pos + 1]
+                fin, opcode, length = b0 & 0x80, b0 & 0x0F, b1 & 0x7F
+                if b0 & 0x70:
+                    raise ProtocolError(CLOSE_PROTOCOL_ERROR, "reserved bits set")
+                if not b1 & 0x80:
+                    raise ProtocolError(CLOSE_PROTOCOL_ERROR, "client frame not masked")
+                head = 6 if length < 126 else 8 if length == 126 else 14
+                if end - pos < head:
+                    break
+                if length == 126:
+                    length = struct.unpack_from("!H", buf, pos + 2)[0]
+                elif length == 127:
+                    length = struct.unpack_from("!Q", buf, pos + 2)[0]
+                if opcode & 0x8:
+                    if not fin or length > 125:
+                        raise ProtocolError(CLOSE_PROTOCOL_ERROR, "invalid control frame")
+                elif self._size + length > self.max_message_size:
+                    # Refused from its header, before its payload is received.
+                    raise ProtocolError(CLOSE_MESSAGE_TOO_BIG, "message too big")
+                if end - pos < head + length:
+                    break
+                key = bytes(buf[pos + head - 4:pos + head])
+                payload = unmask(buf[pos + head:pos + head + length], key)
+                pos += head + length
+                event = self.frame(fin, opcode, payload)
+                if event is not None:
+                    events.append(event)
+        finally:
+            del buf[:pos]
+        return events
+
+    def frame(self, fin, opcode, payload):
+        """
+        Handle one unmasked frame.
+
+        :rtype tuple: ``(opcode, payload)`` of a complete message or a control
+                      frame, None for a fragment of an unfinished message.
+        """
+        if opcode == OP_CLOSE:
+            return OP_CLOSE, parse_close(payload)
+        if opcode in (OP_PING, OP_PONG):
+            return opcode, payload
+        if opcode == OP_CONTINUATION:
+            if self._opcode is None:
+                raise ProtocolError(CLOSE_PROTOCOL_ERROR, "continuation of no message")
+        elif opcode in (OP_TEXT, OP_BINARY):
+            if self._opcode is not None:
+                raise ProtocolError(CLOSE_PROTOCOL_ERROR, "message interrupted")
+            self._opcode = opcode
+        else:
+            raise ProtocolError(CLOSE_PROTOCOL_ERROR, "unknown opcode {}".format(opcode))
+        self._fragments.append(payload)
+        self._size += len(payload)
+        if not fin:
+            return None
+        opcode, fragments = self._opcode, self._fragments
+        message = fragments[0] if len(fragments) == 1 else b"".join(fragments)
+        self._opcode, self._fragments, self._size = None, [], 0
+        if opcode == OP_TEXT:
+            try:
+                message = message.decode("utf-8")
+            except UnicodeDecodeError:
+                raise ProtocolError(CLOSE_INVALID_DATA, "text message is not UTF-8")
+        return opcode, message
+
+
+class WebSocketStats:
+    """
+    Process-wide counters of the WebSocket connections and their messages.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.open = 0
+        self.received = 0
+        self.sent = 0
+        self.dropped = 0
+
+    def opened(self):
+        """
+        Count a connection that completed its handshake.
+        """
+        with self._lock:
+            self.connections += 1
+            self.open += 1
+
+    def record(self, ws):
+        """
+        :param ws (WebSocket): A connection being closed.
+        """
+        with self._lock:
+            self.open -= 1
+            self.received += ws.received
+            self.sent += ws.sent
+            self.dropped += ws.close_code == CLOSE_ABNORMAL
+
+    def snapshot(self):
+        """
+        :rtype dict: connection counts, messages of the closed connections
+                     and connections lost without closing handshake.
+        """
+        with self._lock:
+            return {
+                "connections": self.connections,
+                "open": self.open,
+                "received": self.received,
+                "sent": self.sent,
+                "dropped": self.dropped,
+            }
+
+
+WS_STATS = WebSocketStats()
+
+
+class WebSocket:
+    """
+    A WebSocket connection, as its handler sees it.
+
+    Only the thread running the handler receives; it also writes the frames
+    queued by :meth:`send`, from any thread, while it waits in
+    :meth:`receive` or :meth:`close`.
+
+    Attributes:
+        ctx (RequestContext): The upgrade request (headers, cookies, query).
+        closed (bool): The connection is closed.
+        close_code (int): Code of the closing handshake, :data:`CLOSE_ABNORMAL`
+                          for a connection lost without one.
+        close_reason (str): Reason of the closing handshake.
+        received (int): Messages received.
+        sent (int): Messages queued.
+    """
+
+    __attrs__ = [
+        "ctx",
+        "closed",
+        "close_code",
+        "close_reason",
+        "received",
+        "sent",
+    ]
+
+    #: Largest message accepted, class-wide (see :data:`MAX_MESSAGE_SIZE`).
+    max_message_size = MAX_MESSAGE_SIZE
+    #: Seconds of silence before a ping, 0 for none (see :data:`PING_INTERVAL`).
+    ping_interval = PING_INTERVAL
+
+    def __init__(self, sock, ctx=None, buffered=b""):
+        """
+        Initialize a new WebSocket over an upgraded connection.
+
+        :param sock (socket.socket): The client socket, its ``101`` sent.
+        :param ctx (RequestContext): The upgrade request.
+        :param buffered (bytes): Bytes received after the upgrade request.
+        """
+        self.sock = sock
+        self.ctx = ctx
+        self.closed = False
+        self.close_code = None
+        self.close_reason = ""
+        self.received = 0
+        self.sent = 0
+        self._owner = threading.get_ident()
+        self._parser = FrameParser(self.max_message_size)
+        self._inbox = collections.deque()
+        self._lock = threading.Lock()
+        # Guarded by _lock: frames to write, their size, a close frame is queued.
+        self._outbuf = []
+        self._queued = 0
+        self._closing = False
+        #: Nothing more is read: the peer closed, or broke the protocol.
+        self._eof = False
+        self._close_deadline = None
+        self._last_seen = time.monotonic()
+        self._ping_sent = None
+        self._writing = False
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        for s in (sock, self._wakeup_r, self._wakeup_w):
+            s.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        self._selector.register(sock, selectors.EVENT_READ)
+        WS_STATS.opened()
+        if buffered:
+            self._on_data(buffered)
+
+    def receive(self, timeout=None):
+        """
+        Wait for the next message.
+
+        :param timeout (float): Seconds to wait, forever when None.
+
+        :rtype str|bytes: a text or a binary message; None once the
+                          connection is closed.
+        :raise TimeoutError: If no message arrived in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._inbox:
+            if self.closed:
+                return None
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("no message within {} s".format(timeout))
+            self._pump(remaining)
+        return self._inbox.popleft()
+
+    def __iter__(self):
+        while True:
+            message = self.receive()
+            if message is None:
+                return
+            yield message
+
+    def send(self, data):
+        """
+        Queue a message, without waiting for the peer.
+
+        :param data (str|bytes): A text or a binary message.
+
+        :rtype bool: False if the connection is closing, or has just been
+                     dropped because the peer does not read fast enough.
+        """
+        if isinstance(data, str):
+            return self.send_frame(OP_TEXT, data.encode("utf-8"))
+        return self.send_frame(OP_BINARY, bytes(data))
+
+    def send_frame(self, opcode, payload, header=None):
+        """
+        Queue a frame and have the thread of the connection write it.
+
+        :param opcode (int): Frame opcode.
+        :param payload (bytes): Frame payload.
+        :param header (bytes): Its :func:`frame_header`, when already built.
+
+        :rtype bool: see :meth:`send`.
+        """
+        if header is None:
+            header = frame_header(opcode, len(payload))
+        with self._lock:
+            if self._closing:
+                return False
+            if opcode == OP_CLOSE:
+                self._closing = True
+                self._close_deadline = time.monotonic() + CLOSE_TIMEOUT
+            elif self._queued + len(payload) > MAX_QUEUED_BYTES:
+                log.warning("dropping WebSocket peer {}: reading too slowly", self._peer())
+                # Nothing more is written; the connection is closed next time
+                # its thread looks.
+                self._closing = self._eof = True
+                self._outbuf.clear()
+                self.close_code = CLOSE_ABNORMAL
+                self._close_deadline = time.monotonic()
+                header = None
+            if header is not None:
+                self._outbuf.append(header)
+                if payload:
+                    self._outbuf.append(payload)
+                self._queued += len(header) + len(payload)
+                self.sent += opcode in (OP_TEXT, OP_BINARY)
+        if threading.get_ident() == self._owner:
+            try:
+                self._flush()
+            except OSError:
+                # Seen by the next _pump.
+                pass
+        else:
+            try:
+                self._wakeup_w.send(b"\0")
+            except OSError:
+                # Wake-up already pending, or the connection is gone.
+                pass
+        return header is not None
+
+    def close(self, code=CLOSE_NORMAL, reason=""):
+        """
+        Start the closing handshake. On the thread of the connection, wait
+        for the close frame of the peer, at most :data:`CLOSE_TIMEOUT`
+        seconds, and close the socket; from another thread only queue the
+        close frame: :meth:`receive` then returns None.
+
+        :param code (int): Close code.
+        :param reason (str): Reason, cut to fit a control frame.
+        """
+        if self.closed:
+            return
+        reason = reason.encode("utf-8")[:123].decode("utf-8", "ignore")
+        if self.send_frame(OP_CLOSE, struct.pack("!H", code) + reason.encode("utf-8")):
+            if self.close_code is None:
+                self.close_code, self.close_reason = code, reason
+        if threading.get_ident() == self._owner:
+            while not self.closed:
+                self._pump(None)
+
+    def _pump(self, timeout):
+        """
+        Write the queued frames, wait up to ``timeout`` seconds for the socket
+        and process what it received. Runs on the thread of the connection.
+        """
+        try:
+            pending = not self._flush()
+            if pending != self._writing:
+                self._writing = pending
+                self._selector.modify(self.sock, selectors.EVENT_READ | (
+                    selectors.EVENT_WRITE if pending else 0))
+            for key, mask in self._selector.select(self._wait(timeout)):
+                if key.fileobj is self._wakeup_r:
+                    self._drain_wakeup()
+                elif mask & selectors.EVENT_READ:
+                    self._receive_some()
+                if self.closed:
+                    return
+            self._flush()
+            self._keepalive()
+        except OSError as e:
+            log.debug("WebSocket peer {} lost: {}", self._peer(), e)
+            self._terminate()
+
+    def _wait(self, timeout):
+        """
+        :rtype float: seconds until the next timer, at most ``timeout``.
+        """
+        if self._close_deadline is not None:
+            due = self._close_deadline
+        elif self.ping_interval:
+            due = (self._ping_sent or self._last_seen) + self.ping_interval
+        else:
+            return timeout
+        wait = max(due - time.monotonic(), 0.0)
+        return wait if timeout is None else min(wait, timeout)
+
+    def _flush(self):
+        """
+        Write queued frames until the socket is full.
+
+        :rtype bool: True once nothing is left to write.
+        """
+        with self._lock:
+            outbuf = self._outbuf
+            if not outbuf:
+                return True
+            try:
+                while outbuf:
+                    send_some(self.sock, outbuf)
+            except (BlockingIOError, InterruptedError):
+                pass
+            self._queued = buffers_size(outbuf)
+            return not outbuf
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def _receive_some(self):
+        try:
+            data = self.sock.recv(RECV_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        if not data:
+            if not self._eof:
+                log.debug("WebSocket peer {} closed without handshake", self._peer())
+            self._terminate()
+            return
+        self._last_seen = time.monotonic()
+        self._ping_sent = None
+        if not self._eof:
+            self._on_data(data)
+
+    def _on_data(self, data):
+        try:
+            events = self._parser.feed(data)
+        except ProtocolError as e:
+            log.debug("WebSocket peer {}: {}", self._peer(), e)
+            self._eof = True
+            self.close_code, self.close_reason = e.code, str(e)
+            self.send_frame(OP_CLOSE, struct.pack("!H", e.code))
+            return
+        for opcode, payload in events:
+            if opcode == OP_PING:
+                self.send_frame(OP_PONG, payload)
+            elif opcode == OP_PONG:
+                continue
+            elif opcode == OP_CLOSE:
+                self._eof = True
+                code, reason = payload
+                if self.close_code is None:
+                    self.close_code, self.close_reason = code, reason
+                # Echo the code; queues nothing if we started the handshake.
+                self.send_frame(OP_CLOSE, b"" if code == CLOSE_NO_STATUS else struct.pack("!H", code))
+                return
+            elif not self._closing:
+                self.received += 1
+                self._inbox.append(payload)
+
+    def _keepalive(self):
+        """
+        Close once the handshake is over or timed out; ping a silent peer
+        and drop it if the pong does not come.
+        """
+        if self.closed:
+            return
+        if self._eof and self._closing and not self._outbuf:
+            self._terminate()
+            return
+        now = time.monotonic()
+        if self._close_deadline is not None:
+            if now >= self._close_deadline:
+                log.debug("WebSocket peer {} did not complete the close", self._peer())
+                self._terminate()
+            return
+        if not self.ping_interval:
+            return
+        if self._ping_sent is not None:
+            if now - self._ping_sent >= self.ping_interval:
+                log.debug("WebSocket peer {} did not answer ping", self._peer())
+                self.close_code = CLOSE_ABNORMAL
+                self._terminate()
+        elif now - self._last_seen >= self.ping_interval:
+            self._ping_sent = now
+            self.send_frame(OP_PING, b"")
+
+    def _terminate(self):
+        """
+        Close the socket, with or without closing handshake.
+        """
+        if self.closed:
+            return
+        with self._lock:
+            self.closed = True
+            self._closing = True
+            self._outbuf.clear()
+        if self.close_code is None:
+            self.close_code = CLOSE_ABNORMAL
+        WS_STATS.record(self)
+        self._selector.close()
+        for s in (self._wakeup_r, self._wakeup_w):
+            s.close()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _peer(self):
+        try:
+            return self.sock.getpeername()
+        except OSError:
+            return None
+
+    def __repr__(self):
+        return "<WebSocket {}{}>".format(
+            self._peer(), " closed {}".format(self.close_code) if self.closed else "")
+
+
+def broadcast(sockets, data):
+    """
+    Send one message to several connections, framed once.
+
+    :param sockets (iterable): The :class:`WebSocket` connections.
+    :param data (str|bytes): A text or a binary message.
+
+    :rtype int: connections the message was queued for.
+    """
+    if isinstance(data, str):
+        opcode, payload = OP_TEXT, data.encode("utf-8")
+    else:
+        opcode, payload = OP_BINARY, bytes(data)
+    header = frame_header(opcode, len(payload))
+    return sum(ws.send_frame(opcode, payload, header) for ws in sockets)
+
+
+class WebSocketRoute:
+    """
+    The handler of a route registered with :meth:`WeApRous.websocket
+    <WeApRous.websocket>`; the route table maps ``GET`` of its path to this
+    object, which the engines answer with a handshake instead of a call.
+
+    Attributes:
+        handler (callable): ``handler(ws, **params)``.
+        origins: Allowed ``Origin`` values, see :func:`origin_allowed`.
+    """
+
+    __attrs__ = [
+        "handler",
+        "origins",
+    ]
+
+    def __init__(self, handler, origins=None):
+        """
+        :param handler (callable): Called with the :class:`WebSocket` and the
+                                   parameters captured by the route path.
+        :param origins: None, ``"*"`` or a list of origins.
+        """
+        self.handler = handler
+        if origins is not None and origins != "*":
+            origins = frozenset(normalize_origin(origin) for origin in origins)
+        self.origins = origins
+        self.__name__ = getattr(handler, "__name__", "websocket")
+
+    def __call__(self, ws, **params):
+        return self.handler(ws, **params)
+
+    def __repr__(self):
+        return "<WebSocketRoute {}>".format(self.__name__)
+
+
+def serve_websocket(sock, route, request, buffered=b""):
+    """
+    Run the handler of a WebSocket route over an upgraded connection, until
+    it returns and the connection is closed. Blocks the calling thread.
+
+    :param sock (socket.socket): The client socket, its ``101`` sent.
+    :param route (WebSocketRoute): The route.
+    :param request (Request): The upgrade request.
+    :param buffered (bytes): Bytes received after the upgrade request.
+    """
+    ws = WebSocket(sock, RequestContext(request), buffered)
+    try:
+        route(ws, **(request.params or {}))
+    except Exception as e:
+        log.error("Exception in WebSocket handler: {}", e)
+        ws.close(CLOSE_INTERNAL_ERROR, "Internal Server Error")
+    ws.close()
@@ -0,0 +1,223 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.workerpool
+~~~~~~~~~~~~~~~~~
+
+This module provides a bounded worker pool used by the backend to serve
+client connections with a fixed number of threads instead of spawning a
+new thread for every accepted socket.
+
+Accepted work is placed on a bounded queue. When the queue is full the
+pool applies an explicit overflow policy:
+
+- ``block``: the submitter waits until a slot frees up (backpressure
+  propagates to the listen backlog).
+- ``reject``: the task is refused and the ``on_reject`` callback is invoked
+  (the backend uses it to answer ``503 Service Unavailable``).
+- ``drop``: the task is refused silently.
+
+Usage Example:
+--------------
+>>> pool = WorkerPool(workers=8, queue_size=64, overflow="reject")
+>>> pool.start()
+>>> pool.submit(print, "hello")
+True
+>>> pool.stats()["queue_depth"]
+0
+"""
+
+import queue
+import threading
+import time
+
+from .log import get_logger
+
+log = get_logger("WorkerPool")
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_REJECT = "reject"
+OVERFLOW_DROP = "drop"
+
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_REJECT, OVERFLOW_DROP)
+
+
+class WorkerPool:
+    """
+    A fixed-size pool of daemon threads consuming tasks from a bounded queue.
+
+    Attributes:
+        workers (int): Number of worker threads.
+        queue_size (int): Maximum number of queued (not yet running) tasks.
+        overflow (str): Overflow policy, one of ``block``, ``reject``, ``drop``.
+        on_reject (callable): Called with the task arguments when a task is refused.
+    """
+
+    __attrs__ = [
+        "workers",
+        "queue_size",
+        "overflow",
+        "on_reject",
+        "name",
+    ]
+
+    def __init__(self, workers=8, queue_size=64, overflow=OVERFLOW_REJECT,
+                 on_reject=None, name="worker"):
+        """
+        Initialize a new WorkerPool instance.
+
+        :param workers (int): Number of worker threads to run.
+        :param queue_size (int): Capacity of the pending task queue.
+        :param overflow (str): Policy applied when the queue is full.
+        :param on_reject (callable): Callback receiving the refused task arguments.
+        :param name (str): Prefix used for worker thread names.
+
+        :raise ValueError: If the sizing or the overflow policy is invalid.
+        """
+        if workers < 1:
+            raise ValueError("WorkerPool needs at least one worker")
+        if queue_size < 1:
+            raise ValueError("WorkerPool queue_size must be positive")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("Unknown overflow policy {!r}, expected one of {}".format(
+                overflow, ", ".join(OVERFLOW_POLICIES)))
+
+        self.workers = workers
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.on_reject = on_reject
+        self.name = name
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._stats_lock = threading.Lock()
+
+        # Counters, guarded by _stats_lock.
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._failed = 0
+        self._busy = 0
+        self._max_depth = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def start(self):
+        """
+        Spawn the worker threads. Calling start twice is a no-op.
+        """
+        if self._threads:
+            return
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run,
+                                 name="{}-{}".format(self.name, i),
+                                 daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, fn, *args):
+        """
+        Queue ``fn(*args)`` for execution by a worker.
+
+        :param fn (callable): The task to run.
+        :param args: Positional arguments for the task.
+
+        :rtype bool: True if the task was queued, False if it was refused.
+        """
+        item = (time.monotonic(), fn, args)
+        try:
+            if self.overflow == OVERFLOW_BLOCK:
+                self._queue.put(item)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            with self._stats_lock:
+                self._rejected += 1
+            if self.overflow == OVERFLOW_REJECT and self.on_reject:
+                try:
+                    self.on_reject(*args)
+                except Exception as e:
+                    log.error("on_reject error: {}", e)
+            return False
+
+        with self._stats_lock:
+            self._submitted += 1
+            depth = self._queue.qsize()
+            if depth > self._max_depth:
+                self._max_depth = depth
+        return True
+
+    def _run(self):
+        """
+        Worker loop: take a task, record its queue wait time, run it.
+        """
+        while True:
+            enqueued, fn, args = self._queue.get()
+            if fn is None:
+                self._queue.task_done()
+                return
+
+            waited = time.monotonic() - enqueued
+            with self._stats_lock:
+                self._busy += 1
+                self._wait_total += waited
+                if waited > self._wait_max:
+                    self._wait_max = waited
+
+            try:
+                fn(*args)
+            except Exception as e:
+                log.error("task error: {}", e)
+                with self._stats_lock:
+                    self._failed += 1
+            finally:
+                with self._stats_lock:
+                    self._busy -= 1
+                    self._completed += 1
+                self._queue.task_done()
+
+    def stats(self):
+        """
+        Snapshot of the pool counters, for sizing workers and queue capacity.
+
+        :rtype dict: queue depth, wait times (ms) and task counters.
+        """
+        with self._stats_lock:
+            started = self._completed + self._busy
+            avg_wait = (self._wait_total / started) if started else 0.0
+            return {
+                "workers": self.workers,
+                "busy": self._busy,
+                "queue_size": self.queue_size,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_depth,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "failed": self._failed,
+                "avg_wait_ms": round(avg_wait * 1000.0, 3),
+                "max_wait_ms": round(self._wait_max * 1000.0, 3),
+            }
+
+    def shutdown(self, wait=True):
+        """
+        Stop the workers once the already queued tasks have been processed.
+
+        :param wait (bool): Join the worker threads before returning.
+        """
+        for _ in self._threads:
+            self._queue.put((time.monotonic(), None, ()))
+        if wait:
+            for t in self._threads:
+                t.join()
+        self._threads = []
@@ -0,0 +1,507 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+daemon.writer
+~~~~~~~~~~~~~~~~~
+
+This module provides the vectored (scatter/gather) socket writes shared by
+the serving engines.
+
+A response is kept as a list of buffers, the serialized header followed by
+the body exactly as the handler or the file read produced it, and pipelined
+responses are simply appended to the same list. The list is handed to
+``socket.sendmsg`` in one system call, so a body is never copied to glue it
+to its header or to the previous response. A partial write only drops the
+sent buffers from the front of the list and replaces the first unsent one by
+a :class:`memoryview` slice, which does not copy either.
+
+Platforms without ``sendmsg`` (Windows) fall back to one joined ``send``.
+
+A body may also be a :class:`FileBody`: a byte range of a file that is only
+opened when its turn comes and is copied to the socket by the kernel with
+``sendfile``, so serving a file allocates no per-request buffer. Where
+``sendfile`` is missing the range is read and sent in ``FILE_CHUNK_SIZE``
+chunks. The header in front of a file is sent with ``MSG_MORE`` so both still
+leave in the same packet.
+
+A body may finally be a :class:`ChunkedBody`: the pieces yielded by a
+handler generator, each framed as one chunk of a ``Transfer-Encoding:
+chunked`` body. A piece is only pulled from the generator once everything in
+front of it is written, so a slow client holds the generator back instead of
+letting unsent chunks pile up in memory. The blocking writer pulls the
+pieces itself; :func:`send_some` stops in front of the body and leaves it to
+the caller, which must not advance a generator that may block from its event
+loop.
+
+Usage Example:
+--------------
+>>> send_buffers(sock, [b"HTTP/1.1 200 OK\\r\\nContent-Length: 2\\r\\n\\r\\n", b"hi"])
+>>> send_buffers(sock, [header, FileBody("static/js/chat.js")])
+>>> send_buffers(sock, [header, ChunkedBody(iter([b"hello ", b"world"]))])
+"""
+
+import os
+import socket
+import threading
+import time
+
+#: Whether the platform supports vectored socket writes.
+HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+
+try:
+    #: Largest number of buffers accepted by one ``sendmsg`` call.
+    IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+if IOV_MAX <= 0:
+    IOV_MAX = 1024
+
+#: Whether the kernel can copy a file to a socket (``sendfile``).
+HAS_SENDFILE = hasattr(os, "sendfile")
+#: Flag telling the kernel more data follows (Linux), 0 elsewhere.
+MSG_MORE = getattr(socket, "MSG_MORE", 0)
+#: Read size of the file fallback, without ``sendfile``.
+FILE_CHUNK_SIZE = 64 * 1024
+#: Zero-length chunk ending a chunked body (no trailers).
+LAST_CHUNK = b"0\r\n\r\n"
+
+
+class FileBody:
+    """
+    A response body read from a file, sent with ``sendfile``.
+
+    The file is opened lazily, when the body is about to be written, so a
+    response that is dropped before being sent holds no descriptor.
+
+    Attributes:
+        path (str): Path of the file.
+        offset (int): First byte to send.
+        count (int): Number of bytes left to send.
+        whole (bool): The body is the whole file.
+    """
+
+    __slots__ = ("path", "offset", "count", "whole", "file")
+
+    def __init__(self, path, offset=0, count=None):
+        """
+        :param path (str): Path of the file.
+        :param offset (int): First byte to send.
+        :param count (int): Bytes to send, up to the end of the file by default.
+
+        :raise OSError: If the file cannot be found.
+        """
+        self.path = path
+        self.offset = offset
+        self.count = os.path.getsize(path) - offset if count is None else count
+        self.whole = offset == 0 and count is None
+        self.file = None
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return "<FileBody {} [{}:+{}]>".format(self.path, self.offset, self.count)
+
+    def open(self):
+        """
+        Open the file, once.
+
+        :rtype file: the file opened for binary reading.
+        """
+        if self.file is None:
+            self.file = open(self.path, "rb")
+        return self.file
+
+    def close(self):
+        """
+        Close the file if it was opened.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def read(self):
+        """
+        Read the whole range, for callers that need the bytes.
+
+        :rtype bytes
+        """
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            return f.read(self.count)
+
+
+class StreamAborted(OSError):
+    """
+    The generator of a :class:`ChunkedBody` raised. Its status is already
+    sent, so the connection is closed without the last chunk and the client
+    sees a truncated body; the handler exception is the ``__cause__``.
+    """
+
+
+class StreamStats:
+    """
+    Process-wide counters of the streamed responses, with their time to
+    first byte: from the handler call to its first non-empty piece, ready to
+    be written behind the header.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.streams = 0
+        self.aborted = 0
+        self.bytes = 0
+        self.ttfb_total = 0.0
+        self.ttfb_max = 0.0
+
+    def record(self, body):
+        """
+        :param body (ChunkedBody): A body being closed.
+        """
+        ttfb = body.first_byte - body.created if body.first_byte else 0.0
+        with self._lock:
+            self.streams += 1
+            self.aborted += not body.done
+            self.bytes += body.size
+            self.ttfb_total += ttfb
+            if ttfb > self.ttfb_max:
+                self.ttfb_max = ttfb
+
+    def snapshot(self):
+        """
+        :rtype dict: stream count, unfinished streams, body bytes and the
+                     average and worst time to first byte.
+        """
+        with self._lock:
+            return {
+                "streams": self.streams,
+                "aborted": self.aborted,
+                "bytes": self.bytes,
+                "ttfb_avg_ms": round(self.ttfb_total * 1000 / self.streams, 2)
+                               if self.streams else 0.0,
+                "ttfb_max_ms": round(self.ttfb_max * 1000, 2),
+            }
+
+
+#: Counters shared by every engine of the process.
+STREAM_STATS = StreamStats()
+
+
+class ChunkedBody:
+    """
+    A response body produced piece by piece by an iterator, typically the
+    generator returned by a handler, and sent as it is produced.
+
+    Each non-empty piece (bytes-like, or str encoded as UTF-8) becomes one
+    chunk, and :data:`LAST_CHUNK` ends the body. For HTTP/1.0 clients, which
+    do not know the chunked coding, the pieces are sent as they are and the
+    end of the body is the end of the connection.
+
+    Attributes:
+        chunks (iterator): The pieces of the body.
+        framed (bool): Pieces are framed as chunks.
+        head (bytes): Frame produced ahead by :meth:`prime`, not sent yet.
+        size (int): Body bytes produced so far.
+        done (bool): The iterator is exhausted and the last frame produced.
+        owner: Object whose ``release()`` is called when the body is closed,
+               e.g. the adapter holding the request the generator reads.
+        created (float): ``time.monotonic()`` when the body was created.
+        first_byte (float): ``time.monotonic()`` of the first non-empty piece.
+    """
+
+    __slots__ = ("chunks", "framed", "head", "size", "done", "owner",
+                 "created", "first_byte")
+
+    def __init__(self, chunks, framed=True):
+        """
+        :param chunks (iterator): The pieces of the body.
+        :param framed (bool): Frame the pieces as chunks.
+        """
+        self.chunks = chunks
+        self.framed = framed
+        self.head = b""
+        self.size = 0
+        self.done = False
+        self.owner = None
+        self.created = time.monotonic()
+        self.first_byte = 0.0
+
+    def __repr__(self):
+        return "<ChunkedBody {} bytes{}>".format(self.size, ", done" if self.done else "")
+
+    def prime(self):
+        """
+        Produce the first frame now, in the thread that called the handler,
+        so that it leaves together with the header and a generator failing
+        before its first piece can still be answered with a ``500``.
+
+        :raise StreamAborted: If the generator raises.
+        """
+        self.head = self.next_frame()
+
+    def when_ready(self, callback):
+        """
+        Arrange for ``callback()`` once :meth:`next_frame` can return without
+        waiting, for iterators that can tell (an event
+        :class:`Subscription <Subscription>` has ``when_ready`` too); others
+        are taken as always ready.
+
+        :param callback (callable): Called once, possibly from another thread.
+
+        :rtype bool: True when ready now; the callback is then not called.
+        """
+        if self.head or self.done:
+            return True
+        when_ready = getattr(self.chunks, "when_ready", None)
+        return when_ready is None or when_ready(callback)
+
+    def waits_for_events(self):
+        """
+        :rtype bool: whether the pieces come as events are published (the
+                     iterator has ``when_ready``), for as long as the client
+                     stays rather than until a document is produced.
+        """
+        return hasattr(self.chunks, "when_ready")
+
+    def next_frame(self):
+        """
+        Pull the next non-empty piece and frame it. May block for as long as
+        the generator does.
+
+        :rtype bytes: the frame; once the iterator is exhausted the last
+                      chunk (b"" when unframed), then b"".
+        :raise StreamAborted: If the generator raises.
+        """
+        if self.head:
+            frame, self.head = self.head, b""
+            return frame
+        if self.done or self.chunks is None:
+            return b""
+        try:
+            for piece in self.chunks:
+                if isinstance(piece, str):
+                    piece = piece.encode("utf-8")
+                if not piece:
+                    continue
+                if not self.first_byte:
+                    self.first_byte = time.monotonic()
+                size = len(piece)
+                self.size += size
+                if not self.framed:
+                    return bytes(piece)
+                return b"%x\r\n%s\r\n" % (size, piece)
+        except Exception as e:
+            raise StreamAborted("streamed response failed: {!r}".format(e)) from e
+        self.done = True
+        return LAST_CHUNK if self.framed else b""
+
+    def close(self):
+        """
+        Close the generator (running its ``finally`` blocks), record the
+        stream in :data:`STREAM_STATS` and release the :attr:`owner`. Safe to
+        call more than once.
+        """
+        chunks, self.chunks = self.chunks, None
+        if chunks is None:
+            return
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                # e.g. a generator still running in an executor thread
+                pass
+        STREAM_STATS.record(self)
+        owner, self.owner = self.owner, None
+        if owner is not None:
+            owner.release()
+
+
+def buffers_size(buffers):
+    """
+    Total length of a list of buffers; a :class:`ChunkedBody`, whose length
+    is not known, counts for nothing.
+
+    :param buffers (list): bytes-like objects and bodies.
+
+    :rtype int
+    """
+    return sum(len(b) for b in buffers if not isinstance(b, ChunkedBody))
+
+
+def release(buffers):
+    """
+    Close the files and generators of the bodies left unsent in a list of
+    buffers.
+
+    :param buffers (list): bytes-like objects, :class:`FileBody` and
+                           :class:`ChunkedBody` bodies.
+    """
+    for buf in buffers:
+        if isinstance(buf, (FileBody, ChunkedBody)):
+            buf.close()
+
+
+def leading_bytes(buffers):
+    """
+    Number of buffers in front of the first :class:`FileBody` or
+    :class:`ChunkedBody`.
+
+    :rtype int
+    """
+    for i, buf in enumerate(buffers):
+        if isinstance(buf, (FileBody, ChunkedBody)):
+            return i
+    return len(buffers)
+
+
+def more_flag(buffers, n):
+    """
+    ``MSG_MORE`` for a run of ``n`` buffers followed by a file body, which is
+    ready to be sent right after; 0 otherwise, so that the frames of a
+    streamed body are not held back by the kernel while the next one is
+    produced.
+
+    :rtype int
+    """
+    return MSG_MORE if n < len(buffers) and isinstance(buffers[n], FileBody) else 0
+
+
+def advance(buffers, sent):
+    """
+    Drop ``sent`` bytes from the front of a list of buffers, in place.
+
+    Fully sent buffers are removed; a partially sent one is replaced by a
+    :class:`memoryview` of its unsent tail.
+
+    :param buffers (list): bytes-like objects still to send.
+    :param sent (int): Bytes written by the last send.
+    """
+    done = 0
+    while (done < len(buffers) and not isinstance(buffers[done], ChunkedBody)
+           and sent >= len(buffers[done])):
+        sent -= len(buffers[done])
+        done += 1
+    del buffers[:done]
+    if sent:
+        buffers[0] = memoryview(buffers[0])[sent:]
+
+
+def send_some(sock, buffers):
+    """
+    Write as much of a list of buffers as one system call accepts.
+
+    Meant for non-blocking sockets; ``BlockingIOError`` is left to the caller.
+    Writing stops in front of a :class:`ChunkedBody`: the caller produces its
+    next frame (see :meth:`ChunkedBody.next_frame`) and puts it in front.
+
+    :param sock (socket.socket): The client socket.
+    :param buffers (list): bytes-like objects and bodies, advanced in place.
+
+    :rtype bool: True once every buffer is sent.
+    """
+    if not buffers or isinstance(buffers[0], ChunkedBody):
+        return not buffers
+    if isinstance(buffers[0], FileBody):
+        body = buffers[0]
+        if body.count:
+            sent = send_file_some(sock, body)
+            body.offset += sent
+            body.count -= sent
+        if not body.count:
+            body.close()
+            del buffers[0]
+        return not buffers
+
+    n = min(leading_bytes(buffers), IOV_MAX)
+    flags = more_flag(buffers, n)
+    if HAS_SENDMSG:
+        sent = sock.sendmsg(buffers[:n], (), flags)
+    else:
+        sent = sock.send(buffers[0])
+    advance(buffers, sent)
+    return not buffers
+
+
+def send_file_some(sock, body):
+    """
+    Send part of a file body on a non-blocking socket.
+
+    :param sock (socket.socket): The client socket.
+    :param body (FileBody): The body, not advanced.
+
+    :rtype int: bytes sent.
+    :raise OSError: If the file ends before the announced length.
+    """
+    f = body.open()
+    if HAS_SENDFILE:
+        sent = os.sendfile(sock.fileno(), f.fileno(), body.offset, body.count)
+    else:
+        f.seek(body.offset)
+        chunk = f.read(min(body.count, FILE_CHUNK_SIZE))
+        sent = sock.send(chunk) if chunk else 0
+    if not sent:
+        raise OSError("{} is shorter than announced".format(body.path))
+    return sent
+
+
+def send_buffers(sock, buffers):
+    """
+    Write a list of buffers to a blocking socket, in order.
+
+    Runs of bytes-like buffers go out with ``sendmsg``, file bodies with
+    ``socket.sendfile`` (which reads and sends chunks where the kernel cannot
+    copy the file itself). A streamed body is sent one frame at a time, the
+    next piece being pulled once the previous frame is written; it is closed
+    once its last chunk is out.
+
+    :param sock (socket.socket): The client socket.
+    :param buffers (list): bytes-like objects and bodies; the list itself is
+                           not modified.
+
+    :raise OSError: If the peer goes away, the socket times out, a file ends
+                    before the announced length or a generator fails
+                    (:class:`StreamAborted`).
+    """
+    buffers = [b for b in buffers if isinstance(b, ChunkedBody) or len(b)]
+    while buffers:
+        if isinstance(buffers[0], ChunkedBody):
+            body = buffers[0]
+            frame = body.next_frame()
+            if body.done:
+                body.close()
+                del buffers[0]
+            if frame:
+                buffers.insert(0, frame)
+            continue
+
+        if isinstance(buffers[0], FileBody):
+            body = buffers.pop(0)
+            with open(body.path, "rb") as f:
+                sent = sock.sendfile(f, body.offset, body.count)
+            if sent < body.count:
+                raise OSError("{} is shorter than announced".format(body.path))
+            continue
+
+        n = leading_bytes(buffers)
+        if not HAS_SENDMSG:
+            head = buffers[:n]
+            sock.sendall(head[0] if n == 1 else b"".join(head))
+            del buffers[:n]
+            continue
+        flags = more_flag(buffers, n)
+        while n:
+            sent = sock.sendmsg(buffers[:min(n, IOV_MAX)], (), flags)
+            before = len(buffers)
+            advance(buffers, sent)
+            n -= before - len(buffers)
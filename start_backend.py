@@ -93,19 +93,42 @@ import socket
 import argparse
 
 from daemon import create_backend
+from daemon.backend import add_backend_arguments, backend_options
 
 import start_sampleapp  # <<< ensures decorators run
 
+# Default port number used if none is specified via command-line arguments.
+PORT = 9000
+
 def main():
-    ip = '0.0.0.0'
-    port = 9000
+    parser = argparse.ArgumentParser(
+        prog='Backend',
+        description='Start the backend process',
+        epilog='Backend daemon for http_deamon application'
+    )
+    parser.add_argument('--server-ip',
+        type=str,
+        default='0.0.0.0',
+        help='IP address to bind the server. Default is 0.0.0.0'
+    )
+    parser.add_argument(
+        '--server-port',
+        type=int,
+        default=PORT,
+        help='Port number to bind the server. Default is {}.'.format(PORT)
+    )
+    add_backend_arguments(parser)
+
+    args = parser.parse_args()
+    ip = args.server_ip
+    port = args.server_port
 
     # pull routes registered by app.route(...)
     routes = start_sampleapp.app.routes
 
     # print("[start_backend] Loaded routes:", list(routes.keys()))
 
-    create_backend(ip, port, routes=routes)
+    create_backend(ip, port, routes=routes, **backend_options(args))
 
 if __name__ == "__main__":
     """
@@ -115,9 +138,10 @@ if __name__ == "__main__":
     and port. It then calls `create_backend(ip, port)` to start the RESTful
     application server.
 
-    :arg --server-ip (str): IP address to bind the server (default: 127.0.0.1).
+    :arg --server-ip (str): IP address to bind the server (default: 0.0.0.0).
     :arg --server-port (int): Port number to bind the server (default: 9000).
+    :arg --engine (str): Serving engine (thread, pool, asyncio, reactor).
+    :arg --workers (int): Number of pre-forked worker processes (default: 1).
     """
 
     main()
-
@@ -27,16 +27,24 @@ Features:
 """
 
 import json
+import os
 import socket
 import argparse
 import time
 import threading
-from urllib.parse import parse_qs
+from collections.abc import Mapping
 
 from daemon.weaprous import WeApRous
+from daemon.backend import add_backend_arguments, backend_options
+from daemon.events import EventHub, format_event
+from daemon.websocket import broadcast, CLOSE_POLICY_VIOLATION
+from daemon.log import get_logger
+from daemon.writer import FileBody
 
 PORT = 8000  # Default port
 PEER_TTL = 300.0  # Peer time-to-live in seconds
+SSE_RETRY_MS = 3000  # EventSource reconnection delay
+STATIC_DIR = os.path.abspath("static")  # Root of the /static/ files
 
 # Global data structures
 PEERS = {}       # {peer_id: {ip, port, username, last_seen}}
@@ -46,26 +54,30 @@ MESSAGES = {     # {channel: [{sender, text, timestamp}, ...]}
     'tech': []
 }
 CHANNELS = ['general', 'random', 'tech']
+EVENTS = EventHub()  # New messages pushed to /events, one topic per channel
+SOCKETS = {}         # {channel: set of /ws connections that joined it}
 lock = threading.Lock()
 
 app = WeApRous()
+log = get_logger("SampleApp")
 
 def check_cookie(headers):
     """Check if the auth cookie is present and valid"""
-    if not isinstance(headers, dict):
+    # Headers are a lazily parsed mapping: only the Cookie field is looked up.
+    if not isinstance(headers, Mapping):
         return False
-    cookie = headers.get('cookie', '') or headers.get('Cookie', '')
+    cookie = headers.get('cookie', '')
     return 'auth=true' in cookie
 
 def serve_static_file(file_path, mime_type):
     """Helper to serve static files with proper mime type"""
     try:
-        with open(file_path, "rb") as f:
-            return {
-                "_status": 200,
-                "_content": f.read(),
-                "_mime": mime_type
-            }
+        # Sent with sendfile by the backend, never read into memory here.
+        return {
+            "_status": 200,
+            "_content": FileBody(file_path),
+            "_mime": mime_type
+        }
     except FileNotFoundError:
         return {
             "_status": 404,
@@ -73,19 +85,36 @@ def serve_static_file(file_path, mime_type):
             "_mime": "text/plain"
         }
 
-def parse_form_data(body):
-    """Parse URL-encoded form data"""
-    try:
-        if isinstance(body, bytes):
-            body = body.decode('utf-8')
-        params = {}
-        for pair in body.split('&'):
-            if '=' in pair:
-                key, value = pair.split('=', 1)
-                params[key] = value
-        return params
-    except:
-        return {}
+def json_body(ctx):
+    """The JSON object sent by the client, decoded once by the request"""
+    data = ctx.json
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object body")
+    return data
+
+def new_message(data):
+    """The channel and the message described by a client's JSON object"""
+    channel = data.get('channel', 'general')
+    msg = {
+        'sender': data.get('sender', 'anonymous'),
+        'text': data.get('text', ''),
+        'timestamp': data.get('timestamp', time.time())
+    }
+    return channel, msg
+
+def message_event(channel, msg_id, msg):
+    """A message as pushed to the /ws clients"""
+    return json.dumps({"type": "message", "channel": channel, "id": msg_id, "message": msg})
+
+def post_message(channel, msg):
+    """Store a message and push it to the /events and /ws clients; lock held"""
+    if channel not in MESSAGES:
+        MESSAGES[channel] = []
+    MESSAGES[channel].append(msg)
+    # Pushed under the lock, so every client sees the messages in order.
+    msg_id = len(MESSAGES[channel])
+    EVENTS.publish(channel, msg, event='message', id=msg_id)
+    broadcast(SOCKETS.get(channel, ()), message_event(channel, msg_id, msg))
 
 # Authentication Routes
 # @app.route('/login', methods=['POST'])
@@ -117,24 +146,16 @@ def parse_form_data(body):
 #         }
 
 @app.route('/login', methods=['POST'])
-def login(headers="", body=""):
+def login(ctx):
     """Handle user login"""
-    print("[LOGIN] POST /login")
-    print(f"Body: {body}")
+    log.debug("POST /login")
     
-    # Parse form data
-    params = {}
-    if body:
-        for pair in body.split('&'):
-            if '=' in pair:
-                k, v = pair.split('=', 1)
-                params[k] = v.replace('%40', '@').replace('+', ' ')
+    # Form fields are decoded (percent-escapes and '+') by the request
+    username = ctx.field('username', '')
+    password = ctx.field('password', '')
+    peer_id = ctx.field('peerId', '')
     
-    username = params.get('username', '')
-    password = params.get('password', '')
-    peer_id = params.get('peerId', '')
-    
-    print(f"Username: {username}, Password: {password}, PeerID: {peer_id}")
+    log.debug("Username: {}, PeerID: {}", username, peer_id)
     
     # Valid credentials
     valid_users = {
@@ -144,7 +165,7 @@ def login(headers="", body=""):
     }
     
     if username in valid_users and valid_users[username] == password:
-        print("✓ Valid credentials")
+        log.info("Valid credentials for {}", username)
         
         # Store peer info if provided
         if peer_id:
@@ -156,9 +177,8 @@ def login(headers="", body=""):
             }
         
         # Return HTML with Set-Cookie (works with uncommented login.js)
-        with open('www/index.html', 'rb') as f:
-            content = f.read()
-        
+        content = FileBody('www/index.html')
+
         return {
             "_status": 200,
             "_content": content,
@@ -166,11 +186,10 @@ def login(headers="", body=""):
             "Set-Cookie": "auth=true; Path=/; HttpOnly"
         }
     else:
-        print("✗ Invalid credentials")
+        log.info("Invalid credentials for {}", username)
         # Return 401 for invalid credentials
-        with open('www/401.html', 'rb') as f:
-            content = f.read()
-        
+        content = FileBody('www/401.html')
+
         return {
             "_status": 401,
             "_content": content,
@@ -202,13 +221,11 @@ def login_page(headers, body):
 @app.route('/index.html', methods=['GET'])
 def index(headers="", body=""):
     """Serve chat page - Task 1B: Check cookie"""
-    print("\n[INDEX] GET /")
-    
     if check_cookie(headers):
-        print("✓ Cookie valid - Serving chat")
+        log.debug("Cookie valid - Serving chat")
         return serve_static_file("www/index.html", "text/html")
     else:
-        print("✗ No cookie - 401")
+        log.debug("No cookie - 401")
         return {
             "_status": 401,
             "_content": b"<html><body><h1>401 Unauthorized</h1><p>Please login</p><a href='/login.html'>Login</a></body></html>",
@@ -235,64 +252,159 @@ def get_channels(headers, body):
         return {"channels": CHANNELS}
 
 @app.route('/messages', methods=['GET'])
-def get_messages(headers, body):
-    """Get messages for a channel"""
-    if not check_cookie(headers):
+def get_messages(ctx):
+    """Get messages for a channel (legacy ?channel= query form)"""
+    if not check_cookie(ctx.headers):
         return {"error": "Unauthorized"}
     
-    # Extract channel from query params
-    path = headers.get('path', '')
-    channel = 'general'
-    if '?' in path:
-        query = path.split('?', 1)[1]
-        params = parse_qs(query)
-        if 'channel' in params:
-            channel = params['channel'][0]
+    channel = ctx.arg('channel', 'general')
     
     with lock:
         msgs = MESSAGES.get(channel, [])
         return {"messages": msgs}
 
+@app.route('/channels/<name>/messages', methods=['GET'])
+def get_channel_messages(headers, body, name):
+    """Get messages of the channel named in the path"""
+    if not check_cookie(headers):
+        return {"error": "Unauthorized"}
+
+    with lock:
+        if name not in MESSAGES:
+            return {
+                "_status": 404,
+                "_content": json.dumps({"error": "Unknown channel"}).encode(),
+                "_mime": "application/json"
+            }
+        return {"messages": MESSAGES[name]}
+
+@app.route('/channels/<name>/export', methods=['GET'])
+def export_channel(ctx, name):
+    """Stream the full history of a channel, one JSON message per line"""
+    if not check_cookie(ctx.headers):
+        return {"error": "Unauthorized"}
+
+    with lock:
+        if name not in MESSAGES:
+            return {
+                "_status": 404,
+                "_content": json.dumps({"error": "Unknown channel"}).encode(),
+                "_mime": "application/json"
+            }
+        # Copy the list, not the messages: the lock is not held while streaming.
+        msgs = list(MESSAGES[name])
+
+    def lines():
+        for msg in msgs:
+            yield json.dumps(msg) + "\n"
+
+    return {"_content": lines(), "_mime": "application/x-ndjson"}
+
+@app.route('/events', methods=['GET'])
+def channel_events(ctx):
+    """Push the new messages of a channel as Server-Sent Events"""
+    if not check_cookie(ctx.headers):
+        return {"error": "Unauthorized"}
+
+    channel = ctx.arg('channel', 'general')
+    # Event ids are message counts: resume after the last one the client has.
+    since = ctx.headers.get('last-event-id') or ctx.arg('since')
+
+    with lock:
+        msgs = MESSAGES.get(channel)
+        if msgs is None:
+            return {
+                "_status": 404,
+                "_content": json.dumps({"error": "Unknown channel"}).encode(),
+                "_mime": "application/json"
+            }
+        try:
+            start = min(max(int(since), 0), len(msgs))
+        except (TypeError, ValueError):
+            start = len(msgs)
+        prelude = [format_event(retry=SSE_RETRY_MS)]
+        prelude.extend(format_event(msg, event='message', id=i)
+                       for i, msg in enumerate(msgs[start:], start + 1))
+        stream = EVENTS.subscribe(channel, prelude)
+
+    return {"_content": stream, "_mime": "text/event-stream"}
+
 @app.route('/send', methods=['POST'])
-def send_message(headers, body):
+def send_message(ctx):
     """Send a message to a channel"""
-    if not check_cookie(headers):
+    if not check_cookie(ctx.headers):
         return {"error": "Unauthorized"}
     
     try:
-        if isinstance(body, bytes):
-            body = body.decode('utf-8')
-        data = json.loads(body)
-        
-        channel = data.get('channel', 'general')
-        sender = data.get('sender', 'anonymous')
-        text = data.get('text', '')
-        timestamp = data.get('timestamp', time.time())
+        data = json_body(ctx)
         
+        channel, msg = new_message(data)
         with lock:
-            if channel not in MESSAGES:
-                MESSAGES[channel] = []
-            MESSAGES[channel].append({
-                'sender': sender,
-                'text': text,
-                'timestamp': timestamp
-            })
-        
+            post_message(channel, msg)
+
         return {"status": "sent"}
     except Exception as e:
-        print("[SampleApp] Error in send_message: {}".format(e))
+        log.error("Error in send_message: {}", e)
         return {"error": str(e)}
 
+@app.websocket('/ws')
+def chat_socket(ws):
+    """Send and receive the messages of a channel over one WebSocket
+
+    Client messages are JSON objects: {"type": "join", "channel", "since"}
+    switches channel, pushing the messages after the first `since` ones;
+    {"type": "send", "channel", "sender", "text"} posts a message.
+    """
+    if not check_cookie(ws.ctx.headers):
+        ws.close(CLOSE_POLICY_VIOLATION, "Unauthorized")
+        return
+
+    joined = None
+    try:
+        for text in ws:
+            try:
+                data = json.loads(text)
+                if not isinstance(data, dict):
+                    raise ValueError("Expected a JSON object")
+                kind = data.get('type')
+                if kind == 'join':
+                    channel = data.get('channel', 'general')
+                    with lock:
+                        msgs = MESSAGES.get(channel)
+                        if msgs is None:
+                            raise ValueError("Unknown channel")
+                        if joined is not None:
+                            SOCKETS[joined].discard(ws)
+                        joined = channel
+                        SOCKETS.setdefault(channel, set()).add(ws)
+                        # Missed messages and the new ones, without gap.
+                        try:
+                            start = min(max(int(data.get('since')), 0), len(msgs))
+                        except (TypeError, ValueError):
+                            start = len(msgs)
+                        for i, msg in enumerate(msgs[start:], start + 1):
+                            ws.send(message_event(channel, i, msg))
+                elif kind == 'send':
+                    channel, msg = new_message(data)
+                    with lock:
+                        post_message(channel, msg)
+                else:
+                    raise ValueError("Unknown message type")
+            except ValueError as e:
+                ws.send(json.dumps({"type": "error", "error": str(e)}))
+    finally:
+        if joined is not None:
+            with lock:
+                SOCKETS[joined].discard(ws)
+
 @app.route('/create-channel', methods=['POST'])
-def create_channel(headers, body):
+def create_channel(ctx):
     """Create a new channel"""
-    if not check_cookie(headers):
+    if not check_cookie(ctx.headers):
         return {"error": "Unauthorized"}
     
     try:
-        if isinstance(body, bytes):
-            body = body.decode('utf-8')
-        data = json.loads(body)
+        data = json_body(ctx)
         channel = data.get('channel', '')
         
         with lock:
@@ -307,12 +419,10 @@ def create_channel(headers, body):
 
 # Peer Tracker Routes
 @app.route('/submit-info', methods=['POST'])
-def submit_info(headers, body):
+def submit_info(ctx):
     """Register peer information"""
     try:
-        if isinstance(body, bytes):
-            body = body.decode('utf-8')
-        data = json.loads(body)
+        data = json_body(ctx)
         
         peer_id = data.get('id', '')
         ip = data.get('ip', '')
@@ -328,10 +438,10 @@ def submit_info(headers, body):
                 'last_seen': time.time()
             }
         
-        print("[SampleApp] Peer registered: {}".format(peer_id))
+        log.info("Peer registered: {}", peer_id)
         return {"status": "ok", "id": peer_id, "peers": len(PEERS)}
     except Exception as e:
-        print("[SampleApp] Error in submit_info: {}".format(e))
+        log.error("Error in submit_info: {}", e)
         return {"error": str(e)}
 
 @app.route('/get-list', methods=['GET'])
@@ -350,12 +460,10 @@ def get_list(headers, body):
         return {"peers": peer_list}
 
 @app.route('/connect-peer', methods=['POST'])
-def connect_peer(headers, body):
+def connect_peer(ctx):
     """Test peer connectivity"""
     try:
-        if isinstance(body, bytes):
-            body = body.decode('utf-8')
-        data = json.loads(body)
+        data = json_body(ctx)
         
         peer_id = data.get('id', '')
         with lock:
@@ -377,12 +485,10 @@ def connect_peer(headers, body):
         return {"error": str(e)}
 
 @app.route('/broadcast-peer', methods=['POST'])
-def broadcast_peer(headers, body):
+def broadcast_peer(ctx):
     """Broadcast message to all peers via direct TCP"""
     try:
-        if isinstance(body, bytes):
-            body = body.decode('utf-8')
-        data = json.loads(body)
+        data = json_body(ctx)
         message = data.get('message', '')
         sender = data.get('sender', 'unknown')
         
@@ -410,7 +516,7 @@ def broadcast_peer(headers, body):
                 sock.close()
                 success_count += 1
             except Exception as e:
-                print(f"[Broadcast] Failed to reach peer {peer['id']}: {e}")
+                log.warning("Broadcast failed to reach peer {}: {}", peer['id'], e)
                 failed_peers.append(peer['id'])
         
         return {
@@ -423,30 +529,17 @@ def broadcast_peer(headers, body):
         return {"error": str(e)}
 
 # Static file routes
-@app.route('/static/css/login.css', methods=['GET'])
-def login_css(headers, body):
-    """Serve login CSS"""
-    return "static/css/login.css"
-
-@app.route('/static/css/chat.css', methods=['GET'])
-def chat_css(headers, body):
-    """Serve chat CSS"""
-    return "static/css/chat.css"
-
-@app.route('/static/css/styles.css', methods=['GET'])
-def styles_css(headers, body):
-    """Serve styles CSS"""
-    return "static/css/styles.css"
-
-@app.route('/static/js/login.js', methods=['GET'])
-def login_js(headers, body):
-    """Serve login JavaScript"""
-    return "static/js/login.js"
-
-@app.route('/static/js/chat.js', methods=['GET'])
-def chat_js(headers, body):
-    """Serve chat JavaScript"""
-    return "static/js/chat.js"
+@app.route('/static/<path:filename>', methods=['GET'])
+def static_file(headers, body, filename):
+    """Serve any file below static/"""
+    file_path = os.path.abspath(os.path.join(STATIC_DIR, filename))
+    if not file_path.startswith(STATIC_DIR + os.sep) or not os.path.isfile(file_path):
+        return {
+            "_status": 404,
+            "_content": b"File not found",
+            "_mime": "text/plain"
+        }
+    return file_path
 
 @app.route('/favicon.ico', methods=['GET'])
 def favicon(headers, body):
@@ -462,6 +555,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(prog='Backend', description='', epilog='Beckend daemon')
     parser.add_argument('--server-ip', default='0.0.0.0')
     parser.add_argument('--server-port', type=int, default=PORT)
+    add_backend_arguments(parser)
  
     args = parser.parse_args()
     ip = args.server_ip
@@ -469,7 +563,7 @@ if __name__ == "__main__":
 
     # Prepare and launch the RESTful application
     app.prepare_address(ip, port)
-    app.run()
+    app.run(**backend_options(args))
 
 
 
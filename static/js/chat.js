@@ -276,6 +276,10 @@
     let lastMessageCount = 0;
     let channels = [];
     let refreshInterval = null;
+    let socket = null;               // /ws connection: sends and receives messages
+    let socketFailed = false;        // set once /ws cannot be used: stream instead
+    let eventSource = null;          // live /events stream of the current channel
+    let eventStreamFailed = false;   // set once the server refuses it: poll instead
     
     // Helper function
     function $(id) {
@@ -336,10 +340,13 @@
         loadChannels();
         loadMessages();
         
-        // Start polling for updates
+        // Poll channels and users; new messages are pushed over /events,
+        // and only polled when the stream is not available.
         refreshInterval = setInterval(function() {
             loadChannels();
-            loadMessages();
+            if (!socket && !eventSource) {
+                loadMessages();
+            }
         }, 5000);
         
         console.log('[INIT] Initialization complete');
@@ -445,8 +452,13 @@
     // Select channel
     function selectChannel(channel) {
         console.log('[CHANNEL] Switching to channel:', channel);
+        closeEventStream();
         currentChannel = channel;
         lastMessageCount = 0;
+        // Stop receiving the previous channel now; loadMessages catches up
+        if (socket) {
+            joinChannel();
+        }
         $('messagesHeader').textContent = '#' + channel;
         
         // Clear messages immediately when switching channels
@@ -468,8 +480,9 @@
     // Load messages for current channel
     function loadMessages() {
         console.log('[MESSAGES] Loading messages for channel:', currentChannel);
+        const channel = currentChannel;
         
-        fetch('/messages?channel=' + encodeURIComponent(currentChannel), {
+        fetch('/channels/' + encodeURIComponent(channel) + '/messages', {
             credentials: 'same-origin'
         })
         .then(response => {
@@ -477,6 +490,10 @@
             return response.json();
         })
         .then(data => {
+            if (channel !== currentChannel) {
+                return;  // the user switched channels meanwhile
+            }
+            
             // Handle both formats: {messages: [...]} OR [...]
             let messages;
             if (Array.isArray(data)) {
@@ -490,12 +507,132 @@
             // Always render messages to ensure correct channel content is shown
             lastMessageCount = messages.length;
             renderMessages(messages);
+            
+            // Then receive only the messages that follow
+            if (!socketFailed) {
+                joinChannel(lastMessageCount);
+            } else if (!eventSource && !eventStreamFailed) {
+                openEventStream();
+            }
         })
         .catch(error => {
             console.error('Error loading messages:', error);
         });
     }
     
+    // Send and receive the messages of the current channel over /ws
+    function openSocket() {
+        if (!window.WebSocket) {
+            socketFailed = true;
+            openEventStream();
+            return;
+        }
+        const scheme = window.location.protocol === 'https:' ? 'wss://' : 'ws://';
+        const ws = new WebSocket(scheme + window.location.host + '/ws');
+        let opened = false;
+        
+        ws.onopen = function() {
+            opened = true;
+            console.log('[SOCKET] Connected');
+            joinChannel(lastMessageCount);
+        };
+        
+        ws.onmessage = function(e) {
+            const data = JSON.parse(e.data);
+            if (data.type === 'message') {
+                // Skip what the history already showed, or another channel's
+                if (data.channel !== currentChannel || data.id <= lastMessageCount) {
+                    return;
+                }
+                lastMessageCount = data.id;
+                appendMessage(data.message);
+            } else if (data.type === 'error') {
+                console.error('[SOCKET] Server error:', data.error);
+            }
+        };
+        
+        ws.onclose = function(e) {
+            if (socket !== ws) {
+                return;
+            }
+            socket = null;
+            // Never opened (e.g. behind the proxy) or refused: use /events.
+            // Otherwise the 5-second timer reloads the history and reconnects.
+            if (!opened || e.code === 1008) {
+                console.log('[SOCKET] Unavailable, streaming events instead');
+                socketFailed = true;
+                if (!eventSource && !eventStreamFailed) {
+                    openEventStream();
+                }
+            }
+        };
+        
+        socket = ws;
+    }
+    
+    // Follow the current channel on the socket, replaying the messages after
+    // the first `since` ones (only the new ones when omitted)
+    function joinChannel(since) {
+        if (!socket) {
+            openSocket();  // joins once connected
+        } else if (socket.readyState === WebSocket.OPEN) {
+            socket.send(JSON.stringify({
+                type: 'join',
+                channel: currentChannel,
+                since: since
+            }));
+            console.log('[SOCKET] Joined channel:', currentChannel);
+        }
+    }
+    
+    function closeSocket() {
+        if (socket) {
+            const ws = socket;
+            socket = null;
+            ws.close();
+        }
+    }
+    
+    function openEventStream() {
+        if (!window.EventSource) {
+            eventStreamFailed = true;
+            return;
+        }
+        const channel = currentChannel;
+        const source = new EventSource('/events?channel=' + encodeURIComponent(channel) +
+                                       '&since=' + lastMessageCount);
+        
+        source.addEventListener('message', function(e) {
+            // Event ids are message counts; skip what a poll already showed
+            const id = parseInt(e.lastEventId, 10);
+            if (channel !== currentChannel || id <= lastMessageCount) {
+                return;
+            }
+            lastMessageCount = id;
+            appendMessage(JSON.parse(e.data));
+        });
+        
+        source.onerror = function() {
+            // EventSource reconnects by itself, resuming after Last-Event-ID;
+            // once it gives up (e.g. not an event stream), fall back to polling.
+            if (source.readyState === EventSource.CLOSED && eventSource === source) {
+                console.log('[EVENTS] Stream closed, polling messages instead');
+                eventSource = null;
+                eventStreamFailed = true;
+            }
+        };
+        
+        eventSource = source;
+        console.log('[EVENTS] Listening to channel:', channel);
+    }
+    
+    function closeEventStream() {
+        if (eventSource) {
+            eventSource.close();
+            eventSource = null;
+        }
+    }
+    
     // Render messages
     function renderMessages(messages) {
         console.log('[RENDER] Rendering', messages.length, 'messages');
@@ -513,26 +650,7 @@
         }
         
         messages.forEach(function(msg) {
-            const div = document.createElement('div');
-            div.className = 'message';
-            
-            const sender = document.createElement('div');
-            sender.className = 'message-sender';
-            sender.textContent = msg.sender;
-            
-            const text = document.createElement('div');
-            text.className = 'message-text';
-            text.textContent = msg.text;
-            
-            const time = document.createElement('div');
-            time.className = 'message-time';
-            const date = new Date(msg.timestamp * 1000);
-            time.textContent = date.toLocaleTimeString();
-            
-            div.appendChild(sender);
-            div.appendChild(text);
-            div.appendChild(time);
-            container.appendChild(div);
+            container.appendChild(messageElement(msg));
         });
         
         // Scroll to bottom
@@ -540,6 +658,40 @@
         console.log('[RENDER] Messages rendered successfully');
     }
     
+    // Append one pushed message
+    function appendMessage(msg) {
+        const container = $('messagesContainer');
+        if (!container.querySelector('.message')) {
+            // Drop the "No messages yet" placeholder
+            container.innerHTML = '';
+        }
+        container.appendChild(messageElement(msg));
+        container.scrollTop = container.scrollHeight;
+    }
+    
+    function messageElement(msg) {
+        const div = document.createElement('div');
+        div.className = 'message';
+        
+        const sender = document.createElement('div');
+        sender.className = 'message-sender';
+        sender.textContent = msg.sender;
+        
+        const text = document.createElement('div');
+        text.className = 'message-text';
+        text.textContent = msg.text;
+        
+        const time = document.createElement('div');
+        time.className = 'message-time';
+        const date = new Date(msg.timestamp * 1000);
+        time.textContent = date.toLocaleTimeString();
+        
+        div.appendChild(sender);
+        div.appendChild(text);
+        div.appendChild(time);
+        return div;
+    }
+    
     // Send message
     function sendMessage() {
         const input = $('messageInput');
@@ -562,6 +714,13 @@
         
         console.log('[SEND] Sending message to channel:', currentChannel);
         
+        // Over the socket the message comes back like anyone else's
+        if (socket && socket.readyState === WebSocket.OPEN) {
+            socket.send(JSON.stringify(Object.assign({ type: 'send' }, message)));
+            input.value = '';
+            return;
+        }
+        
         fetch('/send', {
             method: 'POST',
             headers: {
@@ -578,8 +737,11 @@
             console.log('[SEND] Response:', data);
             if (data.status === 'sent') {
                 input.value = '';
-                console.log('[SEND] Message sent successfully, reloading messages...');
-                loadMessages();
+                // With a live stream the message comes back over /events
+                if (!socket && !eventSource) {
+                    console.log('[SEND] Message sent successfully, reloading messages...');
+                    loadMessages();
+                }
             }
         })
         .catch(error => {
@@ -622,6 +784,8 @@
         if (refreshInterval) {
             clearInterval(refreshInterval);
         }
+        closeSocket();
+        closeEventStream();
         sessionStorage.clear();
         document.cookie = 'auth=; expires=Thu, 01 Jan 1970 00:00:00 UTC; path=/;';
         window.location.href = '/login.html';
@@ -0,0 +1,79 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+tests.test_context
+~~~~~~~~~~~~~~~~~
+
+Calling conventions of the route handlers.
+"""
+
+import functools
+import types
+import unittest
+
+from daemon.context import RequestContext, call_handler, takes_context
+
+
+def logged(handler):
+    """A decorator forwarding whatever it is called with."""
+    def wrapper(*args, **kwargs):
+        return handler(*args, **kwargs)
+    return wrapper
+
+
+def request(**params):
+    return types.SimpleNamespace(headers={"cookie": "auth=true"}, body="text=hi",
+                                 params=params)
+
+
+class CallingConventionTest(unittest.TestCase):
+
+    def test_context_handler(self):
+        def handler(ctx, **params):
+            return ctx, params
+        self.assertTrue(takes_context(handler))
+        ctx, params = call_handler(handler, request(name="general"))
+        self.assertIsInstance(ctx, RequestContext)
+        self.assertEqual(params, {"name": "general"})
+
+    def test_legacy_handler(self):
+        def handler(headers, body):
+            return headers, body
+        self.assertFalse(takes_context(handler))
+        self.assertEqual(call_handler(handler, request()),
+                         ({"cookie": "auth=true"}, "text=hi"))
+
+    def test_decorated_legacy_handler(self):
+        @logged
+        def handler(headers, body, name):
+            return headers, body, name
+        self.assertFalse(takes_context(handler))
+        self.assertEqual(call_handler(handler, request(name="general")),
+                         ({"cookie": "auth=true"}, "text=hi", "general"))
+
+    def test_wrapped_context_handler(self):
+        def wrap(handler):
+            @functools.wraps(handler)
+            def wrapper(*args, **kwargs):
+                return handler(*args, **kwargs)
+            return wrapper
+
+        @wrap
+        def handler(ctx):
+            return ctx
+        self.assertTrue(takes_context(handler))
+        self.assertIsInstance(call_handler(handler, request()), RequestContext)
+
+
+if __name__ == "__main__":
+    unittest.main()
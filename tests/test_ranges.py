@@ -0,0 +1,48 @@
+#
+# Copyright (C) 2025 pdnguyen of HCMC University of Technology VNU-HCM.
+# All rights reserved.
+# This file is part of the CO3093/CO3094 course.
+#
+# WeApRous release
+#
+# The authors hereby grant to Licensee personal permission to use
+# and modify the Licensed Source Code for the sole purpose of studying
+# while attending the course
+#
+
+"""
+tests.test_ranges
+~~~~~~~~~~~~~~~~~
+
+Parsing of the ``Range`` request header.
+"""
+
+import unittest
+
+from daemon.ranges import parse_range, RangeNotSatisfiable
+
+
+class ParseRangeTest(unittest.TestCase):
+
+    def test_ranges(self):
+        self.assertEqual(parse_range("bytes=0-9,20-", 100), [(0, 9), (20, 99)])
+        self.assertEqual(parse_range("bytes=-10", 100), [(90, 99)])
+        self.assertEqual(parse_range("bytes=90-200", 100), [(90, 99)])
+
+    def test_malformed_range_is_ignored(self):
+        for header in ("bytes=abc-5", "bytes=5-abc", "bytes=-", "bytes=5",
+                       "bytes=9-5", "items=0-5"):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 100))
+
+    def test_unsatisfiable(self):
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range("bytes=100-", 100)
+
+    def test_suffix_of_empty_body(self):
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range("bytes=-5", 0)
+
+
+if __name__ == "__main__":
+    unittest.main()